@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from connection_pool import ConnectionPool, connect_sqlite
+
+'''
+16 threads run queries against a SQLite file, first through one shared connection behind
+a lock (what a singleton holding a single handle gives you), then through a
+ConnectionPool of max_size connections. SQLite releases the GIL while a query runs,
+so pooled queries can overlap on a multi-core machine. Also times a bare checkout.
+Usage : python benchmark_connection_pool.py [queries per thread] [max_size]
+'''
+
+QUERY = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 20000) SELECT SUM(i) FROM n"
+
+
+def run(threads: int, queries: int, query) -> float:
+    def loop(_):
+        for _ in range(queries): query()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers = threads) as ex:
+        list(ex.map(loop, range(threads)))
+    return threads * queries / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    maxSize = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    threads = 16
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = "sqlite:///" + os.path.join(directory, "bench.db")
+
+        shared = connect_sqlite(url)
+        lock = threading.Lock()
+        def sharedQuery():
+            with lock:
+                return shared.execute(QUERY).fetchone()
+
+        pool = ConnectionPool(url, max_size = maxSize)
+        def pooledQuery():
+            with pool.connection() as conn:
+                return conn.execute(QUERY).fetchone()
+
+        print(f"{threads} threads x {queries} queries, {os.cpu_count()} cpus")
+        single = run(threads, queries, sharedQuery)
+        pooled = run(threads, queries, pooledQuery)
+        print(f"shared connection : {single:>9.0f} queries/sec")
+        print(f"pool of {maxSize:<9} : {pooled:>9.0f} queries/sec  ({pooled / single:.1f}x)  {pool.stats()}")
+
+        checkouts = 100_000
+        start = time.perf_counter()
+        for _ in range(checkouts): pool.release(pool.acquire())
+        print(f"checkout + release : {(time.perf_counter() - start) / checkouts * 1e6:.2f} us")
+        pool.close()
+        shared.close()
@@ -0,0 +1,60 @@
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ring_logger import BLOCK, DROP
+from singleton_meta import Logger
+
+'''
+32 threads log records to a file through the stdlib logging module (FileHandler) and
+through the ring-buffer Logger, timed until every record is on disk. Then the cost of a
+call at a disabled level for both.
+Usage : python benchmark_logger.py [records per thread]
+'''
+
+THREADS = 32
+
+
+def recordsPerSecond(log, records: int, done) -> float:
+    def loop(i):
+        for j in range(records): log("worker %d record %d", i, j)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers = THREADS) as ex:
+        list(ex.map(loop, range(THREADS)))
+    done()
+    return THREADS * records / (time.perf_counter() - start)
+
+
+def disabledCost(log, calls: int = 1_000_000) -> float:
+    start = time.perf_counter()
+    for i in range(calls): log("hidden %d", i)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+if __name__ == "__main__":
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        handler = logging.FileHandler(os.path.join(directory, "stdlib.log"))
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(threadName)s] %(message)s"))
+        stdlib = logging.getLogger("benchmark")
+        stdlib.addHandler(handler)
+        stdlib.setLevel(logging.INFO)
+        stdlib.propagate = False
+        stdlibRate = recordsPerSecond(stdlib.info, records, handler.flush)
+
+        rates = {}
+        for policy in (BLOCK, DROP):
+            Logger._instances.pop(Logger, None)
+            ring = Logger(path = os.path.join(directory, f"ring-{policy}.log"), policy = policy)
+            rates[policy] = (recordsPerSecond(ring.info, records, ring.close), ring.dropped)
+
+        print(f"{THREADS} threads x {records} records")
+        print(f"stdlib logging      : {stdlibRate:>10.0f} records/sec")
+        for policy, (rate, dropped) in rates.items():
+            print(f"ring, {policy:<5} policy  : {rate:>10.0f} records/sec  ({rate / stdlibRate:.1f}x, {dropped} dropped)")
+        print(f"disabled debug call : stdlib {disabledCost(stdlib.debug):.0f} ns, ring {disabledCost(ring.debug):.0f} ns")
+        handler.close()
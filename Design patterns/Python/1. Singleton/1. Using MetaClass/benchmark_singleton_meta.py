@@ -0,0 +1,67 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from singleton_meta import SingletonMeta
+
+'''
+test_thread_safety as a benchmark : 32 threads call the singleton in a loop. Compares
+the lock-free fast path with the previous version, which took one global lock on every
+call, then times how long a Logger() waits while a slow Database is being built.
+Usage : python benchmark_singleton_meta.py [calls per thread]
+'''
+
+class GlobalLockSingletonMeta(type):
+    # the previous SingletonMeta
+    _instances = {}
+    _lock = threading.Lock()
+
+    def __call__(cls, *args, **kwargs):
+        with cls._lock:
+            if cls not in cls._instances:
+                instance = super().__call__(*args, **kwargs)
+                cls._instances[cls] = instance
+        return cls._instances[cls]
+
+
+def callsPerSecond(cls, calls: int, threads: int = 32) -> float:
+    def loop(_):
+        for _ in range(calls): cls()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers = threads) as ex:
+        list(ex.map(loop, range(threads)))
+    return calls * threads / (time.perf_counter() - start)
+
+
+def blockedWhileBuilding(meta) -> float:
+    class Database(metaclass = meta):
+        def __init__(self):
+            time.sleep(0.2)
+
+    class Logger(metaclass = meta):
+        pass
+
+    builder = threading.Thread(target = Database)
+    builder.start()
+    time.sleep(0.01)
+    start = time.perf_counter()
+    Logger()
+    waited = time.perf_counter() - start
+    builder.join()
+    return waited
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    class FastLogger(metaclass = SingletonMeta): pass
+    class LockedLogger(metaclass = GlobalLockSingletonMeta): pass
+
+    locked = callsPerSecond(LockedLogger, calls)
+    fast = callsPerSecond(FastLogger, calls)
+    print(f"32 threads x {calls} calls")
+    print(f"global lock : {locked:>12.0f} calls/sec")
+    print(f"fast path   : {fast:>12.0f} calls/sec  ({fast / locked:.1f}x)")
+    print(f"Logger() during a 200ms Database build : global lock waits {blockedWhileBuilding(GlobalLockSingletonMeta) * 1000:.0f}ms, "
+          f"per-class locks wait {blockedWhileBuilding(SingletonMeta) * 1000:.2f}ms")
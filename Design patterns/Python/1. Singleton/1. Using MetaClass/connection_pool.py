@@ -0,0 +1,182 @@
+# source of truth : "2. Using new/connection_pool.py" is a copy of this file, change this one and copy
+# it over (each folder runs on its own, so they do not share a module)
+from collections import deque
+from contextlib import contextmanager
+import os
+import sqlite3
+import threading
+import time
+import weakref
+
+class PoolTimeout(TimeoutError):
+    pass
+
+
+def connect_sqlite(url):
+    # SQLite stand-in for a real driver : "sqlite:///path/to.db" or a plain path
+    if url.startswith("sqlite://"):
+        url = url[len("sqlite://"):]
+    elif "://" in url:
+        raise ValueError(f"unsupported database url {url!r}, only sqlite:// is available")
+    # connections move between threads, one thread at a time
+    return sqlite3.connect(url, check_same_thread = False)
+
+
+def ping(conn):
+    conn.execute("SELECT 1")
+
+
+class ConnectionPool:
+    '''
+    Thread-safe pool of connections to one url :
+    - connections are created lazily, up to max_size; at most min_size idle ones are kept
+      forever, the rest are closed once idle for idle_timeout seconds
+    - acquire() waits up to timeout seconds for a free connection, then raises PoolTimeout
+    - a connection idle for more than check_after seconds is health checked before it is
+      handed out, and replaced if the check fails
+    '''
+    def __init__(self, url, min_size = 0, max_size = 8, timeout = 5.0, idle_timeout = 60.0,
+                 check_after = 1.0, connect = connect_sqlite, health_check = ping):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError("need 0 <= min_size <= max_size and max_size >= 1")
+        self.url = url
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.check_after = check_after
+        self.connect = connect
+        self.health_check = health_check
+        self._reset()
+        _pools.add(self)
+
+    def _reset(self):
+        # (connection, time it was released); the right end is the most recently used
+        self.idle = deque()
+        self.size = 0
+        self.closed = False
+        self.available = threading.Condition(threading.Lock())
+        self.created = 0
+        self.evicted = 0
+        self.failed_checks = 0
+        self.timeouts = 0
+
+    def acquire(self, timeout = None):
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            conn, released = self._take(deadline)
+            if conn is None:
+                return self._create()
+            if time.monotonic() - released <= self.check_after:
+                return conn
+            try:
+                self.health_check(conn)
+                return conn
+            except Exception:
+                self._discard(conn)
+                with self.available: self.failed_checks += 1
+
+    def _take(self, deadline):
+        # an idle connection, or (None, None) after reserving a slot for a new one
+        with self.available:
+            while True:
+                if self.closed:
+                    raise RuntimeError("pool is closed")
+                self._evict_idle()
+                if self.idle:
+                    return self.idle.pop()
+                if self.size < self.max_size:
+                    self.size += 1
+                    return None, None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.available.wait(remaining):
+                    if not self.idle and self.size >= self.max_size:
+                        self.timeouts += 1
+                        raise PoolTimeout(f"no connection to {self.url} free within the timeout")
+
+    def _create(self):
+        # outside the lock : connecting can be slow
+        try:
+            conn = self.connect(self.url)
+        except BaseException:
+            with self.available:
+                self.size -= 1
+                self.available.notify()
+            raise
+        with self.available: self.created += 1
+        return conn
+
+    def _evict_idle(self):
+        # caller holds the lock; the oldest idle connections sit on the left
+        now = time.monotonic()
+        while len(self.idle) > 0 and self.size > self.min_size and now - self.idle[0][1] > self.idle_timeout:
+            conn, _ = self.idle.popleft()
+            self.size -= 1
+            self.evicted += 1
+            conn.close()
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self.available:
+            self.size -= 1
+            self.available.notify()
+
+    def release(self, conn, broken = False):
+        if broken:
+            self._discard(conn)
+            return
+        with self.available:
+            if self.closed:
+                self.size -= 1
+                conn.close()
+                return
+            self.idle.append((conn, time.monotonic()))
+            self._evict_idle()
+            self.available.notify()
+
+    @contextmanager
+    def connection(self, timeout = None):
+        # commits on success, rolls back on error, always returns the connection
+        conn = self.acquire(timeout)
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                broken = True
+            raise
+        finally:
+            self.release(conn, broken)
+
+    def stats(self):
+        with self.available:
+            return {"size": self.size, "idle": len(self.idle), "created": self.created, "evicted": self.evicted,
+                    "failed_checks": self.failed_checks, "timeouts": self.timeouts}
+
+    def close(self):
+        with self.available:
+            self.closed = True
+            while self.idle:
+                conn, _ = self.idle.popleft()
+                self.size -= 1
+                conn.close()
+            self.available.notify_all()
+
+
+_pools = weakref.WeakSet()
+
+def _reset_pools():
+    # connections opened by the parent must not be shared with a forked child :
+    # the child forgets them and connects again on demand
+    for pool in list(_pools):
+        pool._reset()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child = _reset_pools)
@@ -0,0 +1,193 @@
+# source of truth : "2. Using new/ring_logger.py" is a copy of this file, change this one and copy
+# it over (each folder runs on its own, so they do not share a module)
+import atexit
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+DROP, BLOCK = "drop", "block"
+
+
+def _disabled(msg, *args):
+    pass
+
+
+class RingLogger:
+    '''
+    Logger for hot paths : a call stores (time, level, thread, msg, args) in a preallocated
+    ring buffer and returns; a background writer formats everything buffered and writes it
+    in one call every flush_interval seconds, or sooner once the buffer is half full.
+    - a disabled level's method is a no-op function, so filtered calls cost one call
+    - when the buffer is full, policy = "drop" discards the record (counted in dropped)
+      and policy = "block" makes the caller wait for the writer
+    - a record that fails to format, or a write that fails, is reported on stderr and
+      the writer carries on with the next records
+    '''
+    def __init__(self, path = None, level = INFO, capacity = 65536, policy = DROP, flush_interval = 0.05):
+        if capacity < 2 or capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        if policy not in (DROP, BLOCK):
+            raise ValueError(f"policy must be {DROP!r} or {BLOCK!r}")
+        self.path = path
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.policy = policy
+        self.flush_interval = flush_interval
+        self.slots = [None] * capacity
+        # where records go; a file the logger opened itself is closed by close()
+        self.stream = None
+        self.opened = None
+        self.set_level(level)
+        self._reset()
+        _live.add(self)
+
+    def _reset(self):
+        # head / tail / written count records ever appended / taken by the writer / written out
+        self.head = 0
+        self.tail = 0
+        self.written = 0
+        self.dropped = 0
+        self.closed = False
+        self.lock = threading.Lock()
+        self.not_full = threading.Condition(self.lock)
+        self.not_empty = threading.Condition(self.lock)
+        # started by the first record, so a logger that never logs costs no thread
+        self.writer = None
+
+    def set_level(self, level):
+        self.level = level
+        for value, name in LEVEL_NAMES.items():
+            if value < level: setattr(self, name.lower(), _disabled)
+            else: self.__dict__.pop(name.lower(), None)
+
+    def enabled_for(self, level):
+        # guard for messages whose arguments are expensive to build
+        return level >= self.level
+
+    def debug(self, msg, *args):
+        self._append(DEBUG, msg, args)
+
+    def info(self, msg, *args):
+        self._append(INFO, msg, args)
+
+    def warning(self, msg, *args):
+        self._append(WARNING, msg, args)
+
+    def error(self, msg, *args):
+        self._append(ERROR, msg, args)
+
+    def _append(self, level, msg, args):
+        record = (time.time(), level, threading.current_thread().name, msg, args)
+        with self.lock:
+            if self.closed:
+                return False
+            if self.head - self.tail > self.mask:
+                if self.policy == DROP:
+                    self.dropped += 1
+                    return False
+                while self.head - self.tail > self.mask and not self.closed:
+                    self.not_full.wait()
+                if self.closed:
+                    return False
+            self.slots[self.head & self.mask] = record
+            self.head += 1
+            if self.writer is None:
+                self.writer = threading.Thread(target = self._write_loop, daemon = True, name = "RingLogger")
+                self.writer.start()
+            elif self.head - self.tail == self.capacity >> 1:
+                self.not_empty.notify()
+        return True
+
+    def _write_loop(self):
+        while True:
+            with self.lock:
+                if self.head == self.tail and not self.closed:
+                    self.not_empty.wait(self.flush_interval)
+                tail, head = self.tail, self.head
+                if tail == head:
+                    if self.closed: return
+                    continue
+                start, end = tail & self.mask, head & self.mask
+                if start < end:
+                    batch = self.slots[start:end]
+                else:
+                    batch = self.slots[start:] + self.slots[:end]
+                self.tail = head
+                self.not_full.notify_all()
+            try:
+                self._write(batch)
+            except Exception:
+                # the stream failed : report it and carry on, the writer must outlive a bad write
+                self.handle_error()
+            self.written = head
+
+    def _write(self, batch):
+        if self.stream is None:
+            if self.path:
+                self.stream = self.opened = open(self.path, "a", encoding = "utf-8")
+            else:
+                self.stream = sys.stderr
+        lines = []
+        stamp, stampSecond = "", None
+        for created, level, thread, msg, args in batch:
+            second = int(created)
+            if second != stampSecond:
+                stamp, stampSecond = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second)), second
+            try:
+                text = msg % args if args else msg
+            except Exception:
+                # a bad format string loses its own record, not the rest of the batch
+                self.handle_error(msg, args)
+                continue
+            lines.append(f"{stamp}.{int(created * 1000) % 1000:03d} {LEVEL_NAMES[level]} [{thread}] {text}\n")
+        self.stream.write("".join(lines))
+        self.stream.flush()
+
+    def handle_error(self, msg = None, args = None):
+        # called from the writer with the exception being handled, as logging.Handler.handleError does
+        try:
+            sys.stderr.write("--- Logging error ---\n")
+            traceback.print_exc(file = sys.stderr)
+            if msg is not None:
+                sys.stderr.write(f"Message: {msg!r}\nArguments: {args!r}\n")
+        except Exception:
+            pass # stderr is gone too : nothing left to report to
+
+    def flush(self):
+        # wait until everything logged so far has been written
+        with self.lock:
+            target = self.head
+            writer = self.writer
+            if writer is not None: self.not_empty.notify()
+        while writer is not None and writer.is_alive() and self.written < target:
+            time.sleep(self.flush_interval / 10)
+
+    def close(self):
+        with self.lock:
+            if self.closed: return
+            self.closed = True
+            self.not_empty.notify()
+            self.not_full.notify_all()
+            writer = self.writer
+        if writer is not None: writer.join()
+        if self.opened is not None: self.opened.close()
+
+
+# loggers to close at exit and to reset in a forked child; hooks are registered once
+# here, not per logger, so a discarded logger is neither kept alive nor called
+_live = weakref.WeakSet()
+
+def _close_all():
+    for logger in list(_live): logger.close()
+
+def _reset_all():
+    for logger in list(_live): logger._reset()
+
+atexit.register(_close_all)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child = _reset_all)
@@ -1,23 +1,73 @@
+import os
 import threading
+from connection_pool import ConnectionPool
+from ring_logger import RingLogger, INFO, DROP
 
 class SingletonMeta(type):
     _instances = {}
-    _lock = threading.Lock()
+    # one lock per singleton class, so a slow constructor only blocks its own class
+    _locks = {}
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        SingletonMeta._locks[cls] = threading.Lock()
 
     def __call__(cls, *args, **kwargs):
-        with cls._lock:
-            if cls not in cls._instances:
-                instance = super().__call__(*args, **kwargs)
-                cls._instances[cls] = instance
-        return cls._instances[cls]
+        # fast path : once the instance exists this is a dict lookup, no lock
+        instance = cls._instances.get(cls)
+        if instance is None:
+            with SingletonMeta._locks[cls]:
+                instance = cls._instances.get(cls)
+                if instance is None:
+                    instance = super().__call__(*args, **kwargs)
+                    cls._instances[cls] = instance
+        return instance
+
+    @staticmethod
+    def _reset_locks():
+        # a lock held by another thread at fork time would stay locked forever in the
+        # child, so the child gets fresh locks; instances are inherited as they are
+        for cls in SingletonMeta._locks:
+            SingletonMeta._locks[cls] = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child = SingletonMeta._reset_locks)
 
 
-class Logger(metaclass = SingletonMeta):
-    def __init__(self):
+class Logger(RingLogger, metaclass = SingletonMeta):
+    # the first Logger(...) call configures it : log file (stderr if None), level,
+    # ring buffer capacity and full-buffer policy ("drop" or "block")
+    def __init__(self, path = None, level = INFO, capacity = 65536, policy = DROP):
+        super().__init__(path, level, capacity, policy)
         print("Logger class initialized")
 
 
 class Database(metaclass = SingletonMeta):
-    def __init__(self, url):
+    # one process-wide object handing out pooled connections, one pool per url;
+    # pool_options (min_size, max_size, timeout ...) apply to every pool it creates
+    def __init__(self, url, **pool_options):
         self.url = url
-        print("Database connected")
\ No newline at end of file
+        self.pool_options = pool_options
+        self.pools = {}
+        self.lock = threading.Lock()
+        print("Database connected")
+
+    def pool(self, url = None):
+        url = url or self.url
+        pool = self.pools.get(url)
+        if pool is None:
+            with self.lock:
+                pool = self.pools.get(url)
+                if pool is None:
+                    pool = self.pools[url] = ConnectionPool(url, **self.pool_options)
+        return pool
+
+    def connection(self, url = None, timeout = None):
+        # with Database(url).connection() as conn : ... ; commits, or rolls back on error
+        return self.pool(url).connection(timeout)
+
+    def close(self):
+        with self.lock:
+            for pool in self.pools.values(): pool.close()
+            self.pools.clear()
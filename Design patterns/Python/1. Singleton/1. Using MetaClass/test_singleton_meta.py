@@ -1,5 +1,15 @@
+import contextlib
+import gc
+import io
+import os
+import tempfile
+import threading
+import time
 import unittest
 from concurrent.futures import ThreadPoolExecutor
+from connection_pool import ConnectionPool, PoolTimeout
+import ring_logger
+from ring_logger import RingLogger, DEBUG, WARNING, BLOCK
 from singleton_meta import SingletonMeta, Logger, Database
 
 class TestSingletonMeta(unittest.TestCase):
@@ -32,7 +42,7 @@ class TestSingletonMeta(unittest.TestCase):
             _ = Logger()
             self.assertEqual(calls["count"],1)
         finally:
-            Logger.__init = original_init
+            Logger.__init__ = original_init
 
     def test_thread_safety(self):
         def make_logger():
@@ -45,5 +55,237 @@ class TestSingletonMeta(unittest.TestCase):
         for inst in instances:
             self.assertIs(first_instance, inst)
 
+    def test_slow_construction_does_not_block_other_class(self):
+        release = threading.Event()
+        original_init = Database.__init__
+
+        def slow_init(self, url):
+            release.wait(5)
+            original_init(self, url)
+
+        try:
+            Database.__init__ = slow_init
+            builder = threading.Thread(target = Database, args = ("slow://",))
+            builder.start()
+            done = threading.Event()
+            threading.Thread(target = lambda: (Logger(), done.set())).start()
+            self.assertTrue(done.wait(2)) # Logger is built while Database is still constructing
+            release.set()
+            builder.join()
+        finally:
+            release.set()
+            Database.__init__ = original_init
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_fork_resets_locks(self):
+        Logger._instances.pop(Logger, None)
+        lock = SingletonMeta._locks[Logger]
+        lock.acquire() # held at fork time, as if another thread was constructing
+        try:
+            pid = os.fork()
+            if pid == 0:
+                import signal
+                signal.alarm(5) # a deadlocked child dies instead of hanging the test
+                Logger()
+                os._exit(0)
+            _, status = os.waitpid(pid, 0)
+            self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        finally:
+            lock.release()
+
+    def sqlite_url(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return "sqlite:///" + os.path.join(directory.name, "test.db")
+
+    def test_database_hands_out_pooled_connections(self):
+        db = Database(self.sqlite_url(), max_size = 4)
+        self.addCleanup(db.close)
+        with db.connection() as a, db.connection() as b:
+            self.assertIsNot(a, b) # concurrent checkouts get their own connection
+        with db.connection() as c:
+            self.assertIn(c, (a, b)) # released connections are reused
+        self.assertEqual(db.pool().stats()["created"], 2)
+
+    def test_queries_from_many_threads(self):
+        db = Database(self.sqlite_url(), max_size = 4)
+        self.addCleanup(db.close)
+        with db.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+        def insert(i):
+            with db.connection(timeout = 5) as conn:
+                conn.execute("INSERT INTO t VALUES (?)", (i,))
+
+        with ThreadPoolExecutor(max_workers=16) as ex:
+            list(ex.map(insert, range(200)))
+        with db.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 200)
+        self.assertLessEqual(db.pool().stats()["size"], 4)
+
+    def test_pool_checkout_timeout(self):
+        pool = ConnectionPool(self.sqlite_url(), max_size = 1)
+        self.addCleanup(pool.close)
+        conn = pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(timeout = 0.05)
+        pool.release(conn)
+        self.assertIs(pool.acquire(timeout = 0.05), conn)
+
+    def test_pool_evicts_idle_connections_above_min_size(self):
+        pool = ConnectionPool(self.sqlite_url(), min_size = 1, max_size = 3, idle_timeout = 0.01)
+        self.addCleanup(pool.close)
+        conns = [pool.acquire() for _ in range(3)]
+        for conn in conns: pool.release(conn)
+        time.sleep(0.03)
+        pool.release(pool.acquire())
+        self.assertEqual(pool.stats()["size"], 1)
+        self.assertEqual(pool.stats()["evicted"], 2)
+
+    def test_pool_replaces_connection_failing_health_check(self):
+        pool = ConnectionPool(self.sqlite_url(), check_after = 0)
+        self.addCleanup(pool.close)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.close() # went bad while idle
+        fresh = pool.acquire()
+        self.assertIsNot(fresh, conn)
+        fresh.execute("SELECT 1")
+        self.assertEqual(pool.stats()["failed_checks"], 1)
+
+    def gated_logger(self, **options):
+        # a logger whose writer stalls inside its first write until the gate opens
+        class GatedStream:
+            def __init__(self):
+                self.entered = threading.Event()
+                self.gate = threading.Event()
+                self.text = ""
+            def write(self, text):
+                self.entered.set()
+                self.gate.wait(5)
+                self.text += text
+            def flush(self):
+                pass
+
+        stream = GatedStream()
+        logger = Logger(**options)
+        logger.stream = stream
+        self.addCleanup(logger.close)
+        self.addCleanup(stream.gate.set)
+        logger.error("first")
+        self.assertTrue(stream.entered.wait(2))
+        return logger, stream
+
+    def test_logger_writes_records_from_many_threads(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "app.log")
+        logger = Logger(path = path, policy = BLOCK, capacity = 64)
+
+        def log(i):
+            for j in range(50): logger.info("worker %d record %d", i, j)
+
+        with ThreadPoolExecutor(max_workers=32) as ex:
+            list(ex.map(log, range(32)))
+        logger.close()
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 32 * 50)
+        self.assertEqual(sum(line.endswith("worker 3 record 7") for line in lines), 1)
+
+    def test_logger_level_filtering(self):
+        logger, stream = self.gated_logger(level = WARNING)
+        self.assertFalse(logger.enabled_for(DEBUG))
+        logger.debug("hidden %s", "debug")
+        logger.warning("shown")
+        logger.set_level(DEBUG)
+        logger.debug("now shown")
+        stream.gate.set()
+        logger.close()
+        self.assertNotIn("hidden", stream.text)
+        self.assertIn("WARNING", stream.text)
+        self.assertIn("now shown", stream.text)
+
+    def test_logger_drop_policy_when_full(self):
+        logger, stream = self.gated_logger(capacity = 4)
+        for i in range(6): logger.info("record %d", i)
+        self.assertEqual(logger.dropped, 2) # 4 fit while the writer is stuck, 2 are dropped
+        stream.gate.set()
+        logger.close()
+        self.assertIn("record 3", stream.text)
+        self.assertNotIn("record 4", stream.text)
+
+    def test_logger_block_policy_waits_for_writer(self):
+        logger, stream = self.gated_logger(capacity = 4, policy = BLOCK)
+        for i in range(4): logger.info("record %d", i)
+        producer = threading.Thread(target = logger.info, args = ("record 4",))
+        producer.start()
+        producer.join(0.1)
+        self.assertTrue(producer.is_alive()) # buffer full : the caller waits
+        stream.gate.set()
+        producer.join(2)
+        self.assertFalse(producer.is_alive())
+        logger.close()
+        self.assertIn("record 4", stream.text)
+        self.assertEqual(logger.dropped, 0)
+
+    def test_bad_record_is_reported_and_the_writer_carries_on(self):
+        logger = RingLogger(capacity = 4, policy = BLOCK)
+        logger.stream = io.StringIO()
+        self.addCleanup(logger.close)
+        with contextlib.redirect_stderr(io.StringIO()) as errors:
+            logger.info("bad %d", "not a number")
+            for i in range(8): logger.info("record %d", i) # blocks until the writer frees room
+            logger.flush()
+        self.assertIn("record 7", logger.stream.getvalue())
+        self.assertNotIn("bad", logger.stream.getvalue())
+        self.assertIn("--- Logging error ---", errors.getvalue())
+        self.assertIn("'bad %d'", errors.getvalue())
+
+    def test_failing_write_is_reported_and_the_writer_carries_on(self):
+        class FailOnceStream(io.StringIO):
+            failed = False
+            def write(self, text):
+                if not self.failed:
+                    self.failed = True
+                    raise OSError("disk full")
+                return super().write(text)
+
+        logger = RingLogger(capacity = 4, policy = BLOCK)
+        logger.stream = FailOnceStream()
+        self.addCleanup(logger.close)
+        with contextlib.redirect_stderr(io.StringIO()) as errors:
+            logger.info("lost")
+            logger.flush()
+            for i in range(8): logger.info("record %d", i)
+            logger.flush()
+        self.assertTrue(logger.writer.is_alive())
+        self.assertEqual(logger.written, logger.head)
+        self.assertIn("record 7", logger.stream.getvalue())
+        self.assertIn("OSError: disk full", errors.getvalue())
+
+    def test_discarded_logger_is_not_kept_alive(self):
+        # exit and fork hooks are module level : a logger nobody holds can be collected
+        logger = RingLogger()
+        self.assertIn(logger, ring_logger._live)
+        count = len(ring_logger._live)
+        del logger
+        gc.collect()
+        self.assertEqual(len(ring_logger._live), count - 1)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_logger_usable_in_forked_child(self):
+        logger, stream = self.gated_logger()
+        pid = os.fork()
+        if pid == 0:
+            import signal
+            signal.alarm(5)
+            # the parent's writer thread and its lock state did not survive the fork
+            os._exit(0 if logger.writer is None and logger.head == 0 and logger.lock.acquire(timeout = 1) else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        stream.gate.set()
+        logger.close()
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
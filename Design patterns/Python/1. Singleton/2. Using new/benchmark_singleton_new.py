@@ -0,0 +1,74 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from singleton_new import SingletonNew
+
+'''
+test_thread_safety as a benchmark : 32 threads call the singleton in a loop. Compares
+per-class instance slots and locks with the previous version, where every subclass
+shared SingletonNew's lock, then times how long a Logger() waits while a slow
+Database.__new__ holds its lock.
+Usage : python benchmark_singleton_new.py [calls per thread]
+'''
+
+class SharedLockSingletonNew():
+    # the previous SingletonNew
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
+
+def callsPerSecond(cls, calls: int, threads: int = 32) -> float:
+    def loop(_):
+        for _ in range(calls): cls()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers = threads) as ex:
+        list(ex.map(loop, range(threads)))
+    return calls * threads / (time.perf_counter() - start)
+
+
+def blockedWhileBuilding(base) -> float:
+    class Database(base):
+        def __new__(cls):
+            # slow allocation, e.g. opening the connection, done under the class lock
+            if cls._instance is None:
+                with cls._lock:
+                    if cls._instance is None:
+                        time.sleep(0.2)
+                        cls._instance = object.__new__(cls)
+            return cls._instance
+
+    class Logger(base):
+        pass
+
+    builder = threading.Thread(target = Database)
+    builder.start()
+    time.sleep(0.01)
+    start = time.perf_counter()
+    Logger()
+    waited = time.perf_counter() - start
+    builder.join()
+    return waited
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    class FastLogger(SingletonNew): pass
+    class SharedLogger(SharedLockSingletonNew): pass
+
+    shared = callsPerSecond(SharedLogger, calls)
+    fast = callsPerSecond(FastLogger, calls)
+    print(f"32 threads x {calls} calls")
+    print(f"shared lock     : {shared:>12.0f} calls/sec")
+    print(f"per-class locks : {fast:>12.0f} calls/sec  ({fast / shared:.1f}x)")
+    print(f"Logger() during a 200ms Database build : shared lock waits {blockedWhileBuilding(SharedLockSingletonNew) * 1000:.0f}ms, "
+          f"per-class locks wait {blockedWhileBuilding(SingletonNew) * 1000:.2f}ms")
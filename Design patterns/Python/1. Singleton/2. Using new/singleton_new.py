@@ -1,25 +1,82 @@
+import os
 import threading
+from connection_pool import ConnectionPool
+from ring_logger import RingLogger, INFO, DROP
 
 class SingletonNew():
     _instance = None
     _lock = threading.Lock()
 
+    def __init_subclass__(cls, **kwargs):
+        # each subclass gets its own instance slot and lock : a subclass does not inherit
+        # its parent's instance, and a slow constructor only blocks its own class
+        super().__init_subclass__(**kwargs)
+        cls._instance = None
+        cls._lock = threading.Lock()
+        _classes.append(cls)
+
     def __new__(cls, *args, **kwargs):
+        # fast path : once the instance exists no lock is taken
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
                     cls._instance = super().__new__(cls)
         return cls._instance
 
-class Logger(SingletonNew):
-    def __init__(self):
-        if not hasattr(self, '_initialized') or not self._initialized:
-            print("Logger class initialized")
-            self._initialized = True
+
+_classes = [SingletonNew]
+
+def _reset_locks():
+    # a lock held by another thread at fork time would stay locked forever in the
+    # child, so the child gets fresh locks; instances are inherited as they are
+    for cls in _classes:
+        cls._lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child = _reset_locks)
+
+class Logger(SingletonNew, RingLogger):
+    # the first Logger(...) call configures it : log file (stderr if None), level,
+    # ring buffer capacity and full-buffer policy ("drop" or "block")
+    def __init__(self, path = None, level = INFO, capacity = 65536, policy = DROP):
+        # fast path as in __new__; otherwise check again under the lock, since __new__ has
+        # released it by now and two first callers could both get past an unlocked check
+        if getattr(self, '_initialized', False): return
+        with self._lock:
+            if not getattr(self, '_initialized', False):
+                RingLogger.__init__(self, path, level, capacity, policy)
+                print("Logger class initialized")
+                self._initialized = True
 
 class Database(SingletonNew):
-    def __init__(self, url):
-        if not hasattr(self, '_initialized') or not self._initialized:
-            self.url = url
-            print("Database connected")
-            self._initialized = True
\ No newline at end of file
+    # one process-wide object handing out pooled connections, one pool per url;
+    # pool_options (min_size, max_size, timeout ...) apply to every pool it creates
+    def __init__(self, url, **pool_options):
+        if getattr(self, '_initialized', False): return
+        with self._lock: # see Logger.__init__
+            if not getattr(self, '_initialized', False):
+                self.url = url
+                self.pool_options = pool_options
+                self.pools = {}
+                self.lock = threading.Lock()
+                print("Database connected")
+                self._initialized = True
+
+    def pool(self, url = None):
+        url = url or self.url
+        pool = self.pools.get(url)
+        if pool is None:
+            with self.lock:
+                pool = self.pools.get(url)
+                if pool is None:
+                    pool = self.pools[url] = ConnectionPool(url, **self.pool_options)
+        return pool
+
+    def connection(self, url = None, timeout = None):
+        # with Database(url).connection() as conn : ... ; commits, or rolls back on error
+        return self.pool(url).connection(timeout)
+
+    def close(self):
+        with self.lock:
+            for pool in self.pools.values(): pool.close()
+            self.pools.clear()
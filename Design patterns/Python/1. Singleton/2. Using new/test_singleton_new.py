@@ -1,4 +1,9 @@
+import os
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 from concurrent.futures import ThreadPoolExecutor
 from singleton_new import SingletonNew, Logger, Database
 
@@ -47,5 +52,83 @@ class TestSingletonMeta(unittest.TestCase):
         for inst in instances:
             self.assertIs(first_instance, inst)
 
+    def test_first_callers_racing_initialize_once(self):
+        for cls, args in ((Logger, ()), (Database, ("a://",))):
+            with self.subTest(cls = cls.__name__):
+                prints = []
+                def slow_print(*text):
+                    prints.append(text)
+                    time.sleep(0.05) # the other first caller reaches __init__ meanwhile
+
+                threads = [threading.Thread(target = cls, args = args) for _ in range(2)]
+                with mock.patch("builtins.print", slow_print):
+                    for t in threads: t.start()
+                    for t in threads: t.join()
+                self.assertEqual(len(prints), 1)
+
+    def test_slow_construction_does_not_block_other_class(self):
+        # __init__ runs after __new__ has released the lock, so hold Database's lock
+        # itself, as if Database.__new__ was still constructing on another thread
+        Database._lock.acquire()
+        try:
+            builder = threading.Thread(target = Database, args = ("slow://",))
+            builder.start()
+            done = threading.Event()
+            threading.Thread(target = lambda: (Logger(), done.set())).start()
+            self.assertTrue(done.wait(2)) # Logger is built while Database is still constructing
+            self.assertTrue(builder.is_alive())
+            self.assertIsNone(Database._instance)
+        finally:
+            Database._lock.release()
+        builder.join(2)
+        self.assertEqual(Database("other://").url, "slow://")
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_fork_resets_locks(self):
+        Logger._instance = None
+        lock = Logger._lock
+        lock.acquire() # held at fork time, as if another thread was constructing
+        try:
+            pid = os.fork()
+            if pid == 0:
+                import signal
+                signal.alarm(5) # a deadlocked child dies instead of hanging the test
+                Logger()
+                os._exit(0)
+            _, status = os.waitpid(pid, 0)
+            self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        finally:
+            lock.release()
+
+    def sqlite_url(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return "sqlite:///" + os.path.join(directory.name, "test.db")
+
+    def test_database_hands_out_pooled_connections(self):
+        db = Database(self.sqlite_url(), max_size = 4)
+        self.addCleanup(db.close)
+        with db.connection() as a, db.connection() as b:
+            self.assertIsNot(a, b) # concurrent checkouts get their own connection
+        with db.connection() as c:
+            self.assertIn(c, (a, b)) # released connections are reused
+        self.assertEqual(db.pool().stats()["created"], 2)
+
+    def test_queries_from_many_threads(self):
+        db = Database(self.sqlite_url(), max_size = 4)
+        self.addCleanup(db.close)
+        with db.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+        def insert(i):
+            with db.connection(timeout = 5) as conn:
+                conn.execute("INSERT INTO t VALUES (?)", (i,))
+
+        with ThreadPoolExecutor(max_workers=16) as ex:
+            list(ex.map(insert, range(200)))
+        with db.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 200)
+        self.assertLessEqual(db.pool().stats()["size"], 4)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,63 @@
+import gc
+import sys
+import time
+import tracemalloc
+from car import Car
+from registry import PrototypeRegistry
+
+'''
+A fleet of n family_suv variants with per-car colors and engines : registry.get in a
+loop against get_many as a list and as a columnar batch, on a copy-on-write registry so
+the features list is shared rather than copied for each car. Time is measured first, then
+the memory held by the result with tracemalloc in a second run.
+Usage : python benchmark_get_many.py [n]
+'''
+
+COLORS = ["Black", "Blue", "Red", "White", "Silver", "Green", "Grey", "Orange"]
+ENGINES = ["Hybrid", "Petrol", "Diesel", "Electric"]
+
+
+def overrides(n: int):
+    # built with str.join so equal colors are distinct string objects, as if parsed from input
+    return {"color": ["".join(COLORS[i % len(COLORS)]) for i in range(n)],
+            "engine": ["".join(ENGINES[i % len(ENGINES)]) for i in range(n)]}
+
+
+def loop(registry, n, values):
+    colors, engines = values["color"], values["engine"]
+    return [registry.get("family_suv", color = colors[i], engine = engines[i]) for i in range(n)]
+
+
+def measure(build):
+    gc.collect()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, held
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    registry = PrototypeRegistry(copy_on_write = True)
+    registry.register("family_suv", Car(type="SUV", color="Black", engine="Hybrid", transmission="Automatic",
+                                        features=["Sunroof", "ADAS"]))
+    values = overrides(n)
+
+    cases = (("get() loop", lambda: loop(registry, n, values)),
+             ("get_many list", lambda: registry.get_many("family_suv", n, values)),
+             ("get_many columnar", lambda: registry.get_many("family_suv", n, values, columnar = True)))
+    print(f"{n} family_suv variants")
+    print(f"{'':>18} {'seconds':>9} {'MB held':>9}")
+    baseline = None
+    for name, build in cases:
+        elapsed, held = measure(build)
+        baseline = baseline or (elapsed, held)
+        print(f"{name:>18} {elapsed:>9.2f} {held / 2**20:>9.1f}   "
+              f"({baseline[0] / elapsed:.1f}x faster, {baseline[1] / held:.1f}x less memory)")
@@ -0,0 +1,57 @@
+import sys
+import time
+from dataclasses import is_dataclass, replace
+from car import Car
+from registry import PrototypeRegistry
+
+'''
+Clones per second of the family_suv prototype : the previous get() (deepcopy, then
+dataclasses.replace) against the compiled clone functions, plain and copy-on-write,
+with no override, a color override and a features override, then for a prototype
+with 200 features, where sharing the list instead of copying it starts to matter.
+Usage : python benchmark_registry.py [clones]
+'''
+
+def deepcopy_get(proto, **overrides):
+    # the previous PrototypeRegistry.get
+    obj = proto.clone()
+    if is_dataclass(obj):
+        try:
+            return replace(obj, **overrides)
+        except TypeError:
+            for k, v in overrides.items():
+                setattr(obj, k, v)
+            return obj
+    for k, v in overrides.items():
+        setattr(obj, k, v)
+    return obj
+
+
+def rate(make, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n): make()
+    return n / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    family_suv = Car(type="SUV", color="Black", engine="Hybrid", transmission="Automatic",
+                     features=["Sunroof", "ADAS"])
+    loaded_suv = Car(type="SUV", color="Black", engine="Hybrid", transmission="Automatic",
+                     features=[f"Option {i}" for i in range(200)])
+    compiled = PrototypeRegistry()
+    cow = PrototypeRegistry(copy_on_write = True)
+    for registry in (compiled, cow):
+        registry.register("family_suv", family_suv)
+        registry.register("loaded_suv", loaded_suv)
+
+    cases = (("no override", "family_suv", {}), ("color", "family_suv", {"color": "Blue"}),
+             ("features", "family_suv", {"features": ["360 Camera"]}), ("200 features", "loaded_suv", {"color": "Blue"}))
+    print(f"{'overrides':>12} {'deepcopy':>12} {'compiled':>12} {'cow':>12}   clones/sec")
+    for name, key, overrides in cases:
+        proto = family_suv if key == "family_suv" else loaded_suv
+        old = rate(lambda: deepcopy_get(proto, **overrides), n)
+        new = rate(lambda: compiled.get(key, **overrides), n)
+        shared = rate(lambda: cow.get(key, **overrides), n)
+        print(f"{name:>12} {old:>12.0f} {new:>12.0f} {shared:>12.0f}   ({new / old:.0f}x, {shared / old:.0f}x)")
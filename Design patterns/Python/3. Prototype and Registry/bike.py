@@ -9,6 +9,9 @@ class Bike:
     gears: int
     accessories: List[str]
 
+    # clone() is a plain deepcopy, so PrototypeRegistry may use its compiled equivalent
+    clone_is_deepcopy = True
+
     def clone(self) -> "Bike":
         return copy.deepcopy(self)
 
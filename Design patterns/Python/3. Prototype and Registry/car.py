@@ -10,6 +10,9 @@ class Car:
     transmission: str
     features: List[str]
 
+    # clone() is a plain deepcopy, so PrototypeRegistry may use its compiled equivalent
+    clone_is_deepcopy = True
+
     def clone(self) -> "Car":
         return copy.deepcopy(self)
 
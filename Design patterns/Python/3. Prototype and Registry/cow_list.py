@@ -0,0 +1,106 @@
+from __future__ import annotations
+from collections.abc import MutableSequence
+from typing import Any, Iterable
+
+
+class CowList(MutableSequence):
+    """
+    Copy-on-write list : reads go to a shared tuple, the first mutation copies it into a
+    private list. Clones of one prototype can share a field until one of them changes it.
+    Compares equal to a list with the same items and prints like one, but is not a list
+    subclass : isinstance(x, list) is False and json.dumps needs default = list.
+    """
+    __slots__ = ("_data", "_owned")
+
+    def __init__(self, shared: Iterable[Any] = ()) -> None:
+        self._data = shared if type(shared) is tuple else tuple(shared)
+        self._owned = False
+
+    def _own(self) -> list:
+        if not self._owned:
+            self._data = list(self._data)
+            self._owned = True
+        return self._data
+
+    @property
+    def shared(self) -> bool:
+        return not self._owned
+
+    # reads
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._data[index])
+        return self._data[index]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __contains__(self, value) -> bool:
+        return value in self._data
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CowList):
+            other = other._data
+        if isinstance(other, (list, tuple)):
+            return len(self._data) == len(other) and all(a == b for a, b in zip(self._data, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self._data))
+
+    def copy(self) -> "CowList":
+        return CowList(tuple(self._data))
+
+    # like list, these build a new plain list
+    def __add__(self, other) -> list:
+        if isinstance(other, (list, tuple, CowList)):
+            return [*self._data, *other]
+        return NotImplemented
+
+    def __radd__(self, other) -> list:
+        if isinstance(other, (list, tuple)):
+            return [*other, *self._data]
+        return NotImplemented
+
+    def __mul__(self, times: int) -> list:
+        return list(self._data) * times
+
+    __rmul__ = __mul__
+
+    # writes
+    def __setitem__(self, index, value) -> None:
+        self._own()[index] = value
+
+    def __delitem__(self, index) -> None:
+        del self._own()[index]
+
+    def insert(self, index: int, value: Any) -> None:
+        self._own().insert(index, value)
+
+    def append(self, value: Any) -> None:
+        self._own().append(value)
+
+    def extend(self, values: Iterable[Any]) -> None:
+        self._own().extend(values)
+
+    def __iadd__(self, values: Iterable[Any]) -> "CowList":
+        self._own().extend(values)
+        return self
+
+    def pop(self, index: int = -1) -> Any:
+        return self._own().pop(index)
+
+    def clear(self) -> None:
+        self._data = []
+        self._owned = True
+
+    def sort(self, *args, **kwargs) -> None:
+        self._own().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        self._own().reverse()
@@ -52,6 +52,16 @@ def main():
     print(city_bike_red)
     print(mtb_1x12)
 
+    # many variants in one call : a list of objects, or a columnar batch built on demand
+    colors = ["Blue", "Red", "White", "Blue"]
+    fleet = registry.get_many("family_suv", len(colors), {"color": colors})
+    fleet_batch = registry.get_many("family_suv", len(colors), {"color": colors}, columnar=True)
+
+    print("\nFleet:")
+    for car in fleet:
+        print(car)
+    print(f"batch of {len(fleet_batch)}, colors={fleet_batch.column('color')}, last={fleet_batch[-1]}")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
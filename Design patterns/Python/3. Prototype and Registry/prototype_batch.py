@@ -0,0 +1,103 @@
+from __future__ import annotations
+from array import array
+from typing import Any, Dict, Iterator, List, Sequence
+import copy
+import sys
+
+from cow_list import CowList
+
+# values of these types are immutable and can be shared between clones
+SHARED = (str, int, float, bool, bytes, complex, type(None), tuple)
+
+
+def encode(values: Sequence[Any], freeze_lists: bool = True):
+    """
+    Column for n override values : strings are interned, lists become shared tuples (one per
+    distinct list) when freeze_lists is set, and a column with few distinct values is
+    dictionary encoded as (categories, codes) with the smallest array type that fits.
+    Values are told apart by type as well, so 1, 1.0 and True stay three categories.
+    Returns (categories, codes) or (None, plain list).
+    """
+    categories: List[Any] = []
+    index: Dict[Any, int] = {}
+    codes = []
+    try:
+        for value in values:
+            if type(value) is str:
+                value = sys.intern(value)
+            elif type(value) is list and freeze_lists:
+                value = tuple(value)
+            # 1 == 1.0 == True, so the key carries the type; strings only ever equal strings
+            if type(value) is str: key = value
+            elif type(value) is tuple: key = (tuple, tuple(map(type, value)), value)
+            else: key = (type(value), value)
+            code = index.get(key)
+            if code is None:
+                code = index[key] = len(categories)
+                categories.append(value)
+            codes.append(code)
+    except TypeError:
+        # unhashable values : kept as given
+        return None, list(values)
+    if len(categories) > 65536 or len(categories) * 2 > len(codes):
+        return None, [categories[code] for code in codes]
+    typecode = "B" if len(categories) <= 256 else "H"
+    return categories, array(typecode, codes)
+
+
+class PrototypeBatch:
+    """
+    Struct-of-arrays form of n clones of one prototype : fields that were not overridden
+    are stored once, overridden ones as one encoded column each. batch[i] builds the i-th
+    object on demand; column(name) returns one field for all n objects.
+    List fields come back as CowList views of a shared tuple.
+    """
+    def __init__(self, cls: type, n: int, names: List[str], constants: Dict[str, Any],
+                 columns: Dict[str, Any], lists: set) -> None:
+        self.cls = cls
+        self.n = n
+        self.names = names
+        # field -> value shared by every object
+        self.constants = constants
+        # field -> (categories, codes) or (None, values)
+        self.columns = columns
+        # fields held as tuples that are handed out as CowList
+        self.lists = lists
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _value(self, name: str, i: int) -> Any:
+        if name in self.columns:
+            categories, codes = self.columns[name]
+            value = codes[i] if categories is None else categories[codes[i]]
+        else:
+            value = self.constants[name]
+            if name not in self.lists and type(value) not in SHARED:
+                # a mutable field nobody overrode : each object gets its own copy
+                return copy.deepcopy(value)
+        return CowList(value) if name in self.lists and type(value) is tuple else value
+
+    def __getitem__(self, i: int) -> Any:
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError("batch index out of range")
+        obj = object.__new__(self.cls)
+        obj.__dict__ = {name: self._value(name, i) for name in self.names}
+        return obj
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(self.n):
+            yield self[i]
+
+    def column(self, name: str) -> List[Any]:
+        if name in self.columns:
+            categories, codes = self.columns[name]
+            return list(codes) if categories is None else [categories[code] for code in codes]
+        return [self.constants[name]] * self.n
+
+    def nbytes(self) -> int:
+        # memory held by the columns themselves (categories and shared values not counted)
+        return sum(sys.getsizeof(codes) for _, codes in self.columns.values())
+
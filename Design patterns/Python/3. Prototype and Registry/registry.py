@@ -1,6 +1,14 @@
 from __future__ import annotations
-from typing import Dict, Any, Protocol, runtime_checkable
-from dataclasses import is_dataclass, replace
+from typing import Callable, Dict, Any, List, Mapping, Optional, Protocol, Sequence, Tuple, Union
+from typing import get_args, get_origin, get_type_hints, runtime_checkable
+from dataclasses import fields, is_dataclass, replace
+import copy
+
+from cow_list import CowList
+from prototype_batch import SHARED, PrototypeBatch, encode
+
+# values of these types are immutable and can be shared between clones
+ATOMIC = (str, int, float, bool, bytes, complex, type(None))
 
 @runtime_checkable
 class Clonable(Protocol):
@@ -8,32 +16,261 @@ class Clonable(Protocol):
 
 
 class PrototypeRegistry:
-    def __init__(self) -> None:
+    """
+    Catalog of prototypes handed out as clones with overrides.
+
+    For plain dataclasses (no __post_init__, __slots__ or frozen) whose clone() is a plain
+    deepcopy (marked with clone_is_deepcopy = True) the registry compiles a clone function
+    per (key, overridden fields) : atomic fields are shared, containers of atomic values are
+    copied one level deep, anything else, including attributes that are not fields, is deep
+    copied, and overridden fields are not copied at all. An annotation is only trusted when
+    register() finds a value that matches it (a List[str] field holding lists is deep copied),
+    so register a prototype again after putting other kinds of values in it. copy_on_write = True
+    clones from a snapshot of the whole prototype taken at register() and hands out its list
+    fields as CowList views instead of copying them : a change made to the prototype afterwards
+    is not seen by get() or get_many() until it is registered again.
+    Other prototypes go through their own clone() and dataclasses.replace / setattr.
+
+    get_many() builds n clones in one call, either as a list or as a columnar PrototypeBatch.
+    """
+    def __init__(self, copy_on_write: bool = False) -> None:
         self._prototypes: Dict[str, Clonable] = {}
+        self._cloners: Dict[Tuple[str, Tuple[str, ...]], Callable[[Any, Dict[str, Any]], Any]] = {}
+        # key -> fields whose values matched an atomic annotation at register() : name -> origin
+        self._shallow: Dict[str, Dict[str, Any]] = {}
+        # key -> copy-on-write prototype state as it was at register(), lists frozen as tuples
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self.copy_on_write = copy_on_write
     
     def register(self, key: str, prototype: Clonable) -> None:
         self._prototypes[key] = prototype
+        self._forget(key)
+        if _compilable(prototype):
+            self._shallow[key] = _shallow_fields(prototype)
+            if self.copy_on_write:
+                self._snapshot(key, prototype)
+
+    def _snapshot(self, key: str, proto: Any) -> None:
+        # every attribute as it is now : clones built later must not see later changes
+        shallow = self._shallow[key]
+        snapshot = {}
+        for name, value in proto.__dict__.items():
+            origin = shallow.get(name)
+            if origin is list: snapshot[name] = tuple(value)
+            elif origin in ATOMIC: snapshot[name] = value
+            elif origin is not None: snapshot[name] = value.copy()
+            else: snapshot[name] = copy.deepcopy(value)
+        self._snapshots[key] = snapshot
     
     def unregister(self, key):
         self._prototypes.pop(key, None)
+        self._forget(key)
+
+    def _forget(self, key: str) -> None:
+        self._snapshots.pop(key, None)
+        self._shallow.pop(key, None)
+        for cached in [cached for cached in self._cloners if cached[0] == key]:
+            del self._cloners[cached]
     
     def get(self, key: str, **overrides: Any) -> Any:
         proto = self._prototypes[key]
         if proto is None:
             raise KeyError(f"No prototype registered for key: {key}")
-        
-        obj = proto.clone()
-
-        # if obj is a dataclass, use replace to override attributes.
-        if is_dataclass(obj):
-            try:
-                return replace(obj, **overrides)
-            except TypeError as e:
-                for k, v in overrides.items():
-                    setattr(obj, k, v)
-                return obj
-        
-        # if generic obj: go with setattr
-        for k, v in overrides.items():
-            setattr(obj, k, v)
-        return obj
\ No newline at end of file
+
+        cloner = self._cloners.get((key, tuple(overrides)))
+        if cloner is None:
+            cloner = self._cloners[(key, tuple(overrides))] = self._compile(key, proto, overrides)
+        return cloner(proto, overrides)
+
+    def get_many(self, key: str, n: int, overrides_per_field: Optional[Mapping[str, Sequence[Any]]] = None,
+                 columnar: bool = False) -> Union[List[Any], PrototypeBatch]:
+        """
+        n clones of one prototype; overrides_per_field maps a field to n values, one per clone.
+        Override strings are interned and equal override lists of atomic values are stored once.
+        Lists of atomic values come back as plain lists, or with copy_on_write as CowList views
+        of one shared tuple; lists of anything else are deep copied for each clone.
+        columnar = True returns a PrototypeBatch instead of n objects.
+        """
+        proto = self._prototypes[key]
+        overrides_per_field = dict(overrides_per_field or {})
+        for name, values in overrides_per_field.items():
+            if len(values) != n:
+                raise ValueError(f"{name} has {len(values)} override values, expected {n}")
+
+        if not _compilable(proto):
+            if columnar:
+                raise TypeError("columnar batches need a plain dataclass prototype with a deepcopy clone()")
+            return [self.get(key, **{name: values[i] for name, values in overrides_per_field.items()})
+                    for i in range(n)]
+
+        cls = type(proto)
+        hints = get_type_hints(cls)
+        shallow = self._shallow[key]
+        # the same state get() clones from : the snapshot with copy_on_write, else the prototype
+        state = self._snapshots[key] if self.copy_on_write else proto.__dict__
+        names = [f.name for f in fields(cls)]
+        names += [name for name in state if name not in names]
+        names += [name for name in overrides_per_field if name not in names]
+        # only lists of atomic values can be shared as a tuple, like _copy_expr decides for get();
+        # an overridden field's annotation is all there is to go by for its override values
+        lists = {name for name in names if shallow.get(name) is list
+                 or name in overrides_per_field and _atomic_hint(hints.get(name)) is list}
+        constants = {}
+        for name in names:
+            if name in overrides_per_field: continue
+            value = state[name]
+            constants[name] = tuple(value) if name in lists else value
+        columns = {name: encode(values, freeze_lists = name in lists) for name, values in overrides_per_field.items()}
+        batch = PrototypeBatch(cls, n, names, constants, columns, lists)
+        if columnar:
+            return batch
+        return self._materialize(batch)
+
+    def _materialize(self, batch: PrototypeBatch) -> List[Any]:
+        # the batch's __getitem__ compiled into one loop : no per-object lookups or branches
+        namespace = {"new": object.__new__, "cls": batch.cls, "deepcopy": copy.deepcopy, "CowList": CowList,
+                     "wrap": _wrap if self.copy_on_write else _unwrap, "constants": batch.constants}
+        items, loop_vars, sources = [], [], []
+        for j, name in enumerate(batch.names):
+            if name in batch.columns:
+                namespace[f"column_{j}"] = batch.column(name)
+                loop_vars.append(f"v_{j}")
+                sources.append(f"column_{j}")
+                expr = f"wrap(v_{j})" if name in batch.lists else f"v_{j}"
+            else:
+                value = batch.constants[name]
+                namespace[f"c_{j}"] = value
+                if name in batch.lists: expr = f"CowList(c_{j})" if self.copy_on_write else f"list(c_{j})"
+                elif type(value) in SHARED: expr = f"c_{j}"
+                else: expr = f"deepcopy(c_{j})"
+            items.append(f"{name!r}: {expr}")
+        header = (f"for {', '.join(loop_vars)}, in zip({', '.join(sources)}):" if loop_vars
+                  else f"for _ in range({batch.n}):")
+        source = ("def build():\n"
+                  "    objects = []\n"
+                  "    append = objects.append\n"
+                  f"    {header}\n"
+                  "        obj = new(cls)\n"
+                  f"        obj.__dict__ = {{{', '.join(items)}}}\n"
+                  "        append(obj)\n"
+                  "    return objects\n")
+        exec(source, namespace)
+        return namespace["build"]()
+
+    def _compile(self, key: str, proto: Any, overrides: Dict[str, Any]):
+        cls = type(proto)
+        if not _compilable(proto):
+            return _generic_clone
+
+        shallow = self._shallow[key]
+        names = [f.name for f in fields(cls)]
+        namespace = {"new": object.__new__, "cls": cls, "deepcopy": copy.deepcopy, "CowList": CowList,
+                     "copy_extras": _copy_extras, "known": frozenset(names) | frozenset(overrides)}
+        items = []
+        for name in names:
+            if name in overrides:
+                expr = f"overrides[{name!r}]"
+            else:
+                expr = self._copy_expr(name, shallow.get(name))
+            items.append(f"{name!r}: {expr}")
+        # extra overrides that are not fields are set as attributes, like the setattr fallback
+        items += [f"{name!r}: overrides[{name!r}]" for name in overrides if name not in names]
+
+        if self.copy_on_write:
+            namespace["snapshot"] = self._snapshots[key]
+        # attributes the prototype carries besides its fields are deep copied, like clone() would
+        source = ("def clone(proto, overrides):\n"
+                  f"    src = {'snapshot' if self.copy_on_write else 'proto.__dict__'}\n"
+                  "    obj = new(cls)\n"
+                  f"    obj.__dict__ = {{{', '.join(items)}}}\n"
+                  f"    if len(src) != {len(names)}: copy_extras(src, obj.__dict__, known)\n"
+                  "    return obj\n")
+        exec(source, namespace)
+        return namespace["clone"]
+
+    def _copy_expr(self, name: str, origin: Any) -> str:
+        # origin : what _shallow_fields() found the field to hold, None when it must be deep copied
+        value = f"src[{name!r}]"
+        if origin in ATOMIC:
+            return value
+        if origin is list and self.copy_on_write:
+            # src is the snapshot, which holds the list as a tuple
+            return f"CowList({value})"
+        if origin is not None:
+            return f"{value}.copy()"
+        return f"deepcopy({value})"
+
+
+def _atomic_hint(hint: Any) -> Any:
+    # the annotation's atomic type, or list / dict / set when it holds atomic values only; else None
+    origin = get_origin(hint) or hint
+    if origin in ATOMIC:
+        return origin
+    if origin in (list, dict, set) and all(arg in ATOMIC for arg in get_args(hint)):
+        return origin
+    return None
+
+
+def _shallow_fields(proto: Any) -> Dict[str, Any]:
+    # fields that can be shared or copied one level deep : the annotation says so, and the
+    # value does not contradict it (a List[str] field may hold lists all the same)
+    hints = get_type_hints(type(proto))
+    shallow = {}
+    for f in fields(proto):
+        origin = _atomic_hint(hints.get(f.name))
+        value = getattr(proto, f.name)
+        if origin in ATOMIC:
+            matches = type(value) in ATOMIC
+        elif origin is dict:
+            matches = type(value) is dict and all(type(k) in ATOMIC and type(v) in ATOMIC for k, v in value.items())
+        else:
+            matches = origin is not None and type(value) is origin and all(type(item) in ATOMIC for item in value)
+        if matches:
+            shallow[f.name] = origin
+    return shallow
+
+
+def _wrap(value: Any) -> Any:
+    # override lists were stored as shared tuples by encode()
+    return CowList(value) if type(value) is tuple else value
+
+
+def _unwrap(value: Any) -> Any:
+    return list(value) if type(value) is tuple else value
+
+
+def _plain_dataclass(proto: Any) -> bool:
+    # instances whose __dict__ can be filled in directly, without running __init__
+    cls = type(proto)
+    return (is_dataclass(proto) and not hasattr(cls, "__post_init__") and not hasattr(cls, "__slots__")
+            and not cls.__dataclass_params__.frozen)
+
+
+def _compilable(proto: Any) -> bool:
+    # a custom clone() may do more than copy, so only a class that says its clone() is a
+    # plain deepcopy gets the compiled equivalent
+    return _plain_dataclass(proto) and getattr(type(proto), "clone_is_deepcopy", False)
+
+
+def _copy_extras(src: Dict[str, Any], dst: Dict[str, Any], known: frozenset) -> None:
+    for name, value in src.items():
+        if name not in known:
+            dst[name] = copy.deepcopy(value)
+
+
+def _generic_clone(proto: Any, overrides: Dict[str, Any]) -> Any:
+    obj = proto.clone()
+
+    # if obj is a dataclass, use replace to override attributes.
+    if is_dataclass(obj):
+        try:
+            return replace(obj, **overrides)
+        except TypeError as e:
+            for k, v in overrides.items():
+                setattr(obj, k, v)
+            return obj
+    
+    # if generic obj: go with setattr
+    for k, v in overrides.items():
+        setattr(obj, k, v)
+    return obj
@@ -0,0 +1,225 @@
+import copy
+import json
+import unittest
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List
+from bike import Bike
+from car import Car
+from cow_list import CowList
+from prototype_batch import PrototypeBatch, encode
+from registry import PrototypeRegistry
+
+@dataclass
+class Route:
+    name: str
+    stops: List[List[int]]
+    tags: Dict[str, int] = field(default_factory = dict)
+
+    clone_is_deepcopy = True
+
+    def clone(self) -> "Route":
+        return copy.deepcopy(self)
+
+
+@dataclass
+class Ticket:
+    # clone() hands out a new serial : it must never be skipped
+    serial: int
+    seats: List[str]
+
+    def clone(self) -> "Ticket":
+        return Ticket(self.serial + 1, list(self.seats))
+
+
+def family_suv() -> Car:
+    return Car(type = "SUV", color = "Black", engine = "Hybrid", transmission = "Automatic",
+               features = ["Sunroof", "ADAS"])
+
+
+class PrototypeRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = PrototypeRegistry()
+        self.cow_registry = PrototypeRegistry(copy_on_write = True)
+        for registry in (self.registry, self.cow_registry):
+            registry.register("suv", family_suv())
+            registry.register("bike", Bike(model = "City", color = "Blue", gears = 7, accessories = ["Bell"]))
+
+    def test_clone_is_a_distinct_equal_object(self):
+        for registry in (self.registry, self.cow_registry):
+            clone = registry.get("suv")
+            self.assertIsNot(clone, registry._prototypes["suv"])
+            self.assertEqual(clone, family_suv())
+            self.assertIsInstance(clone, Car)
+
+    def test_overrides_apply(self):
+        clone = self.registry.get("suv", color = "Blue", features = ["360 Camera"])
+        self.assertEqual((clone.color, clone.features), ("Blue", ["360 Camera"]))
+        self.assertEqual(self.registry.get("bike", gears = 8).gears, 8)
+
+    def test_clones_do_not_share_mutable_fields(self):
+        for registry in (self.registry, self.cow_registry):
+            first, second = registry.get("suv"), registry.get("suv")
+            first.features.append("Tow Hitch")
+            self.assertEqual(second.features, ["Sunroof", "ADAS"])
+            self.assertEqual(registry._prototypes["suv"].features, ["Sunroof", "ADAS"])
+
+    def test_copy_on_write_list_is_copied_on_first_mutation(self):
+        first, second = self.cow_registry.get("suv"), self.cow_registry.get("suv")
+        self.assertIsInstance(first.features, CowList)
+        self.assertTrue(first.features.shared)
+        first.features[0] = "Panorama"
+        self.assertFalse(first.features.shared)
+        self.assertTrue(second.features.shared)
+        self.assertEqual(second.features, ["Sunroof", "ADAS"])
+
+    def test_copy_on_write_snapshot_is_taken_at_register(self):
+        proto = family_suv()
+        proto.owner = {"name": "fleet"}
+        self.cow_registry.register("frozen", proto)
+        proto.features.append("changed after register")
+        proto.color = "Red"
+        proto.owner["name"] = "me"
+        # get() and get_many() both clone the prototype as it was at register()
+        for clone in (self.cow_registry.get("frozen"), self.cow_registry.get("frozen", engine = "V8"),
+                      self.cow_registry.get_many("frozen", 1)[0], self.cow_registry.get_many("frozen", 1, columnar = True)[0]):
+            self.assertEqual((clone.color, clone.features, clone.owner), ("Black", ["Sunroof", "ADAS"], {"name": "fleet"}))
+        self.cow_registry.register("frozen", proto)
+        clone, = self.cow_registry.get_many("frozen", 1)
+        self.assertEqual(self.cow_registry.get("frozen"), clone)
+        self.assertEqual((clone.color, clone.features), ("Red", ["Sunroof", "ADAS", "changed after register"]))
+
+    def test_copy_on_write_clone_serializes_with_default_list(self):
+        # CowList is not a list : json needs to be told how to write it
+        data = asdict(self.cow_registry.get("suv"))
+        self.assertRaises(TypeError, json.dumps, data)
+        self.assertEqual(json.loads(json.dumps(data, default = list))["features"], ["Sunroof", "ADAS"])
+
+    def test_nested_fields_are_deep_copied(self):
+        self.registry.register("route", Route("loop", [[1, 2], [3]], {"zone": 1}))
+        first, second = self.registry.get("route"), self.registry.get("route")
+        first.stops[0].append(9)
+        first.tags["zone"] = 2
+        self.assertEqual(second.stops, [[1, 2], [3]])
+        self.assertEqual(second.tags, {"zone": 1})
+        self.assertEqual(self.registry._prototypes["route"].stops, [[1, 2], [3]])
+
+    def test_values_that_break_the_annotation_are_deep_copied(self):
+        # features is declared List[str] : what it holds decides how it is copied
+        proto = family_suv()
+        proto.features = [["Sunroof"], ["ADAS"]]
+        for registry in (self.registry, self.cow_registry):
+            registry.register("nested", proto)
+            for clone in (registry.get("nested"), registry.get("nested", color = "Red"),
+                          registry.get_many("nested", 1)[0], registry.get_many("nested", 1, columnar = True)[0]):
+                clone.features[0].append("Tow Hitch")
+            self.assertEqual(proto.features, [["Sunroof"], ["ADAS"]])
+
+    def test_attributes_that_are_not_fields_are_copied(self):
+        proto = family_suv()
+        proto.owner = {"name": "fleet"}
+        self.registry.register("owned", proto)
+        clone = self.registry.get("owned", color = "Red")
+        self.assertEqual(clone.owner, {"name": "fleet"})
+        self.assertIsNot(clone.owner, proto.owner)
+        self.assertEqual(self.registry.get("owned", owner = "me").owner, "me")
+
+    def test_custom_clone_is_not_bypassed(self):
+        self.registry.register("ticket", Ticket(1, ["A1"]))
+        self.assertEqual(self.registry.get("ticket").serial, 2)
+        self.assertEqual(self.registry.get("ticket", seats = ["B2"]), Ticket(2, ["B2"]))
+
+    def test_unknown_and_unregistered_keys(self):
+        self.assertRaises(KeyError, self.registry.get, "missing")
+        self.registry.unregister("suv")
+        self.assertRaises(KeyError, self.registry.get, "suv")
+
+
+class GetManyTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = PrototypeRegistry()
+        self.cow_registry = PrototypeRegistry(copy_on_write = True)
+        for registry in (self.registry, self.cow_registry):
+            registry.register("suv", family_suv())
+            registry.register("route", Route("loop", [[1, 2], [3]]))
+
+    def test_list_mode_matches_get(self):
+        colors = ["Blue", "Red", "Blue"]
+        for registry in (self.registry, self.cow_registry):
+            fleet = registry.get_many("suv", 3, {"color": colors})
+            self.assertEqual(fleet, [registry.get("suv", color = color) for color in colors])
+
+    def test_plain_registry_hands_out_plain_lists(self):
+        fleet = self.registry.get_many("suv", 2, {"engine": ["V6", "V8"]})
+        features = fleet[0].features
+        self.assertIs(type(features), list)
+        self.assertEqual(features + ["Tow Hitch"], ["Sunroof", "ADAS", "Tow Hitch"])
+        self.assertEqual(json.loads(json.dumps(asdict(fleet[0])))["features"], ["Sunroof", "ADAS"])
+        features.append("Tow Hitch")
+        self.assertEqual(fleet[1].features, ["Sunroof", "ADAS"])
+        overridden = self.registry.get_many("suv", 2, {"features": [["A"], ["A"]]})
+        self.assertIs(type(overridden[0].features), list)
+
+    def test_copy_on_write_registry_shares_lists_until_written(self):
+        fleet = self.cow_registry.get_many("suv", 2, {"features": [["A"], ["A"]]})
+        self.assertIsInstance(fleet[0].features, CowList)
+        fleet[0].features.append("B")
+        self.assertEqual(fleet[1].features, ["A"])
+        self.assertEqual(fleet[1].features + ["C"], ["A", "C"])
+        self.assertEqual(["Z"] + fleet[1].features, ["Z", "A"])
+        self.assertEqual(fleet[1].features * 2, ["A", "A"])
+
+    def test_nested_lists_are_not_shared(self):
+        for registry in (self.registry, self.cow_registry):
+            routes = registry.get_many("route", 2, {"name": ["a", "b"]})
+            routes[0].stops[0].append(9)
+            self.assertEqual(routes[1].stops, [[1, 2], [3]])
+            self.assertEqual(registry._prototypes["route"].stops, [[1, 2], [3]])
+            batch = registry.get_many("route", 2, {"name": ["a", "b"]}, columnar = True)
+            batch[0].stops[0].append(9)
+            self.assertEqual(batch[1].stops, [[1, 2], [3]])
+
+    def test_attributes_that_are_not_fields_are_copied(self):
+        proto = family_suv()
+        proto.owner = {"name": "fleet"}
+        self.registry.register("owned", proto)
+        fleet = self.registry.get_many("owned", 2, {"color": ["Red", "Blue"]})
+        self.assertEqual(fleet[0].owner, {"name": "fleet"})
+        self.assertIsNot(fleet[0].owner, fleet[1].owner)
+
+    def test_columnar_indexing(self):
+        colors = ["Blue", "Red", "White", "Blue"]
+        batch = self.registry.get_many("suv", 4, {"color": colors}, columnar = True)
+        self.assertIsInstance(batch, PrototypeBatch)
+        self.assertEqual(len(batch), 4)
+        self.assertEqual(batch.column("color"), colors)
+        self.assertEqual(batch.column("engine"), ["Hybrid"] * 4)
+        self.assertEqual(batch[-1].color, "Blue")
+        self.assertEqual([car.color for car in batch], colors)
+        self.assertRaises(IndexError, batch.__getitem__, 4)
+
+    def test_override_values_keep_their_type(self):
+        values = [1, True, 1.0, (1,), (1.0,)] * 3
+        categories, codes = encode(values)
+        self.assertEqual(len(categories), 5)
+        self.assertEqual([type(categories[code]) for code in codes], [type(value) for value in values])
+        self.assertEqual([type(categories[code][0]) for code in codes[-2:]], [int, float])
+        self.registry.register("bike", Bike(model = "City", color = "Blue", gears = 7, accessories = []))
+        batch = self.registry.get_many("bike", 6, {"gears": [1, True, 1.0] * 2}, columnar = True)
+        self.assertEqual([type(bike.gears) for bike in batch], [int, bool, float] * 2)
+
+    def test_strings_are_interned_and_dictionary_encoded(self):
+        colors = ["".join("Blue") for _ in range(10)]
+        categories, codes = encode(colors)
+        self.assertEqual(categories, ["Blue"])
+        self.assertEqual(list(codes), [0] * 10)
+        self.assertEqual(encode([[1], [2]], freeze_lists = False), (None, [[1], [2]]))
+
+    def test_rejects_bad_calls(self):
+        self.assertRaises(ValueError, self.registry.get_many, "suv", 2, {"color": ["Red"]})
+        self.registry.register("ticket", Ticket(1, []))
+        self.assertRaises(TypeError, self.registry.get_many, "ticket", 2, columnar = True)
+        self.assertEqual([t.serial for t in self.registry.get_many("ticket", 2)], [2, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+from collections import OrderedDict
+from itertools import chain
+import time
+from bitboard import win_masks
+from player import Player
+from zobrist import ZobristHasher
+
+WIN = 1_000_000
+# heuristic scores stay below this, so a cut-off position is never mistaken for a forced win
+HEURISTIC_CAP = WIN // 4
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class TranspositionTable:
+    # bounded LRU map : canonical position key -> (depth, value, bound flag)
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last = False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class AlphaBetaPlayer(Player):
+    '''
+    Computer player : negamax with alpha-beta pruning over the board's make/undo API.
+    Positions are cached in a Zobrist keyed transposition table with symmetric
+    positions folded together.
+    The search deepens one ply at a time until time_limit seconds or node_limit nodes
+    are used up and plays the best move of the last finished depth; positions cut off
+    before the end of the game are scored by counting open lines. time_limit = None and
+    node_limit = None search to the end of the game (or to max_depth).
+    '''
+    def __init__(self, name, symbol, opponent_symbol = None, max_depth = None, time_limit = 0.05,
+                 node_limit = None, table_size = 1_000_000, seed = 0):
+        super().__init__(name, symbol)
+        self.opponent_symbol = opponent_symbol or ("o" if symbol == "x" else "x")
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.table = TranspositionTable(table_size)
+        self.seed = seed
+        self.hasher = None
+        self.shape = None
+        self.nodes = 0
+        self.depth_reached = 0
+        self.deadline = self.node_budget = None
+
+    def get_move(self, board):
+        # table entries are only valid for one (size, win_length)
+        shape = (board.size, getattr(board, "win_length", board.size))
+        if self.shape != shape:
+            self.shape = shape
+            self.hasher = ZobristHasher(board.size, self.seed)
+            self.lines = list(set(chain.from_iterable(win_masks(*shape))))
+            self.weights = [0] + [4 ** count for count in range(shape[1])]
+            self.table.clear()
+
+        self.symbols = (self.symbol, self.opponent_symbol)
+        grid = board.grid
+        hashes = self.hasher.hashes(grid, self.symbols)
+        self.bits = [0, 0]
+        for r, row in enumerate(grid):
+            for c, cell in enumerate(row):
+                if cell in self.symbols: self.bits[self.symbols.index(cell)] |= 1 << (r * board.size + c)
+
+        moves = self.order_moves(board.empty_cells(), board.size)
+        full_depth = len(moves) if self.max_depth is None else min(self.max_depth, len(moves))
+        limited = self.time_limit is not None or self.node_limit is not None
+        start = time.perf_counter()
+
+        best_move = moves[0] if moves else None
+        for depth in (range(1, full_depth + 1) if limited else [full_depth]):
+            # depth 1 always finishes, so an immediate win or block is never missed
+            self.deadline = start + self.time_limit if depth > 1 and self.time_limit is not None else None
+            self.node_budget = self.nodes + self.node_limit if depth > 1 and self.node_limit is not None else None
+            try:
+                best_move, score = self.search_root(board, hashes, moves, depth)
+            except SearchTimeout:
+                break
+            self.depth_reached = depth
+            # the best move is searched first at the next depth
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+            if abs(score) > WIN // 2: break
+        self.deadline = self.node_budget = None
+        return best_move
+
+    def search_root(self, board, hashes, moves, depth):
+        best_move, alpha, beta = None, -WIN - 1, WIN + 1
+        for i, (r, c) in enumerate(moves):
+            score = self.score_move(board, hashes, moves, i, 0, depth, alpha, beta, 0)
+            if best_move is None or score > alpha:
+                best_move, alpha = (r, c), score
+        return best_move, alpha
+
+    def evaluate(self, player):
+        # cut-off position, from `player`'s side : lines still open to only one side,
+        # weighted by how many of their cells that side already holds
+        mine, theirs, weights = self.bits[player], self.bits[1 - player], self.weights
+        score = 0
+        for line in self.lines:
+            if line & theirs:
+                if not line & mine: score -= weights[(line & theirs).bit_count()]
+            elif line & mine:
+                score += weights[(line & mine).bit_count()]
+        # 4 ** count outgrows WIN once win_length passes ~10
+        return max(-HEURISTIC_CAP, min(HEURISTIC_CAP, score))
+
+    def order_moves(self, moves, size):
+        # centre first : central cells sit on more lines, so cutoffs come earlier
+        mid = (size - 1) / 2
+        return sorted(moves, key = lambda m: abs(m[0] - mid) + abs(m[1] - mid))
+
+    def score_move(self, board, hashes, moves, i, player, depth, alpha, beta, ply):
+        # plays moves[i] for `player`, scores it from that player's side, then takes it back
+        r, c = moves[i]
+        symbol = self.symbols[player]
+        cell = r * board.size + c
+
+        self.nodes += 1
+        if not self.nodes & 1023 and ((self.deadline is not None and time.perf_counter() > self.deadline)
+                                      or (self.node_budget is not None and self.nodes > self.node_budget)):
+            raise SearchTimeout()
+
+        board.make_move(r, c, symbol)
+        self.hasher.toggle(hashes, player, cell)
+        self.bits[player] ^= 1 << cell
+        try:
+            if board.check_winner(r, c, symbol):
+                score = WIN - ply
+            else:
+                rest = moves[:i] + moves[i + 1:]
+                score = -self.negamax(board, hashes, rest, 1 - player, depth - 1, -beta, -alpha, ply + 1)
+        finally:
+            # also on SearchTimeout, so an aborted search leaves the board as it found it
+            board.undo_move(r, c)
+            self.hasher.toggle(hashes, player, cell)
+            self.bits[player] ^= 1 << cell
+        return score
+
+    def negamax(self, board, hashes, moves, player, depth, alpha, beta, ply):
+        # value of the position for `player`, who is about to move
+        if not moves: return 0
+        if depth == 0: return self.evaluate(player)
+
+        key = self.hasher.canonical(hashes, player)
+        entry = self.table.get(key)
+        if entry is not None and entry[0] >= depth:
+            value, flag = self.from_table(entry[1], ply), entry[2]
+            if flag == EXACT: return value
+            if flag == LOWER: alpha = max(alpha, value)
+            else: beta = min(beta, value)
+            if alpha >= beta: return value
+
+        alpha_orig = alpha
+        best = -WIN - 1
+        for i in range(len(moves)):
+            score = self.score_move(board, hashes, moves, i, player, depth, alpha, beta, ply)
+            if score > best: best = score
+            if best > alpha: alpha = best
+            if alpha >= beta: break
+
+        flag = UPPER if best <= alpha_orig else LOWER if best >= beta else EXACT
+        self.table.put(key, (depth, self.to_table(best, ply), flag))
+        return best
+
+    # win scores depend on the ply they were found at; the table stores them
+    # relative to the node instead so an entry is valid wherever it is reached
+    def to_table(self, value, ply):
+        if value > WIN // 2: return value + ply
+        if value < -WIN // 2: return value - ply
+        return value
+
+    def from_table(self, value, ply):
+        if value > WIN // 2: return value - ply
+        if value < -WIN // 2: return value + ply
+        return value
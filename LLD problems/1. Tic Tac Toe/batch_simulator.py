@@ -0,0 +1,98 @@
+import numpy as np
+from bitboard import win_masks
+
+'''
+Headless self-play : thousands of games are stored as rows of one int8 array
+(0 empty, 1 = x, -1 = o) and every step plays one move in all unfinished games.
+'''
+
+X, O = 1, -1
+
+def line_matrix(size, win_length):
+    # (cells, lines) incidence matrix : boards @ matrix gives every line's sum at once
+    masks = sorted({mask for cell_masks in win_masks(size, win_length) for mask in cell_masks})
+    matrix = np.zeros((size * size, len(masks)), dtype = np.float32)
+    for line, mask in enumerate(masks):
+        for cell in range(size * size):
+            if mask >> cell & 1: matrix[cell, line] = 1.0
+    return matrix
+
+
+def random_policy(boards, legal, player, rng):
+    # uniform over the legal cells of each board : legal cells score in [1, 2), the rest in [0, 1)
+    scores = rng.random(legal.shape, dtype = np.float32) + legal
+    return scores.argmax(axis = 1)
+
+
+class BatchStats:
+    def __init__(self, size):
+        cells = size * size
+        self.games = 0
+        self.x_wins = 0
+        self.o_wins = 0
+        self.draws = 0
+        self.length_histogram = np.zeros(cells + 1, dtype = np.int64)
+        # per first-move cell : games played and games won by x (who always moves first)
+        self.first_move_games = np.zeros(cells, dtype = np.int64)
+        self.first_move_x_wins = np.zeros(cells, dtype = np.int64)
+
+    def add(self, winners, lengths, first_moves):
+        self.games += len(winners)
+        self.x_wins += int((winners == X).sum())
+        self.o_wins += int((winners == O).sum())
+        self.draws += int((winners == 0).sum())
+        self.length_histogram += np.bincount(lengths, minlength = len(self.length_histogram))
+        cells = len(self.first_move_games)
+        self.first_move_games += np.bincount(first_moves, minlength = cells)
+        self.first_move_x_wins += np.bincount(first_moves[winners == X], minlength = cells)
+
+    def win_rates(self):
+        return {"x": self.x_wins / self.games, "o": self.o_wins / self.games, "draw": self.draws / self.games}
+
+    def first_move_advantage(self):
+        # x's win rate for each opening cell (nan where that opening never happened)
+        with np.errstate(invalid = "ignore", divide = "ignore"):
+            return self.first_move_x_wins / self.first_move_games
+
+
+class BatchSimulator:
+    # policy(boards, legal, player, rng) returns one cell index per row of `boards`
+    def __init__(self, size, win_length = None, policy = random_policy, seed = 0):
+        self.size = size
+        self.win_length = win_length or size
+        self.policy = policy
+        self.rng = np.random.default_rng(seed)
+        self.lines = line_matrix(size, self.win_length)
+
+    def simulate(self, games, batch_size = 10_000):
+        stats = BatchStats(self.size)
+        while stats.games < games:
+            stats.add(*self.play_batch(min(batch_size, games - stats.games)))
+        return stats
+
+    def play_batch(self, batch_size):
+        cells = self.size * self.size
+        boards = np.zeros((batch_size, cells), dtype = np.int8)
+        winners = np.zeros(batch_size, dtype = np.int8)
+        lengths = np.full(batch_size, cells, dtype = np.int64)
+        first_moves = np.zeros(batch_size, dtype = np.int64)
+        # finished games are dropped from `boards`; `active` maps its rows back to game ids
+        active = np.arange(batch_size)
+
+        player = X
+        for step in range(cells):
+            moves = self.policy(boards, boards == 0, player, self.rng)
+            boards[np.arange(len(boards)), moves] = player
+            if step == 0: first_moves[:] = moves
+
+            totals = boards.astype(np.float32) @ self.lines
+            won = (totals == player * self.win_length).any(axis = 1)
+            if won.any():
+                finished = active[won]
+                winners[finished] = player
+                lengths[finished] = step + 1
+                active, boards = active[~won], boards[~won]
+                if len(active) == 0: break
+            player = -player
+
+        return winners, lengths, first_moves
@@ -0,0 +1,49 @@
+import random
+import sys
+import time
+from board import Board
+from batch_simulator import BatchSimulator
+
+'''
+Random self-play throughput : the vectorized BatchSimulator against a plain
+loop over Board objects.
+Usage : python benchmark_batch.py [games] [board size]
+'''
+
+def loop_games(games, size, seed = 0):
+    rng = random.Random(seed)
+    results = {"x": 0, "o": 0, "draw": 0}
+    for _ in range(games):
+        board, symbol = Board(size), "x"
+        while True:
+            r, c = rng.choice(board.empty_cells())
+            board.make_move(r, c, symbol)
+            if board.check_winner(r, c, symbol):
+                results[symbol] += 1
+                break
+            if board.is_full():
+                results["draw"] += 1
+                break
+            symbol = "o" if symbol == "x" else "x"
+    return results
+
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    loop_sample = min(games, 20_000)
+
+    start = time.perf_counter()
+    loop_games(loop_sample, size)
+    loop_rate = loop_sample / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    stats = BatchSimulator(size).simulate(games, batch_size = 100_000)
+    batch_rate = games / (time.perf_counter() - start)
+
+    print(f"{size}x{size} random self-play")
+    print(f"Board loop      : {loop_rate:>12.0f} games/sec ({loop_sample} games)")
+    print(f"BatchSimulator  : {batch_rate:>12.0f} games/sec ({games} games)")
+    print(f"speedup         : {batch_rate / loop_rate:>12.1f}x")
+    print(f"win rates       : {stats.win_rates()}")
+    print(f"game lengths    : {stats.length_histogram.tolist()}")
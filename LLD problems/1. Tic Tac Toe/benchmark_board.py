@@ -0,0 +1,55 @@
+import sys
+import timeit
+from board import Board
+
+'''
+Compares the counter based Board against the original full-scan checks.
+Usage : python benchmark_board.py [size ...]
+'''
+
+class ScanBoard(Board):
+    # the original O(N) / O(N^2) implementation, kept here only for comparison
+    def check_winner(self, r, c, symbol):
+        if all(self.grid[i][c] == symbol for i in range(self.size)): return True
+        if all(self.grid[r][i] == symbol for i in range(self.size)): return True
+        if all(self.grid[i][i] == symbol for i in range(self.size)): return True
+        if all(self.grid[i][self.size - i - 1] == symbol for i in range(self.size)): return True
+        return False
+
+    def is_full(self):
+        for i in range(self.size):
+            for j in range(self.size):
+                if self.grid[i][j] == "_": return False
+        return True
+
+
+def fill_all_but_last(board):
+    # checkerboard-ish pattern, leaves the bottom right cell empty (worst case for the scan)
+    n = board.size
+    for r in range(n):
+        for c in range(n):
+            if r == n - 1 and c == n - 1: continue
+            board.make_move(r, c, "x" if (r + c) % 2 == 0 else "o")
+
+
+def time_per_call(fn, reps):
+    return timeit.timeit(fn, number = reps) / reps * 1e6
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in sys.argv[1:]] or [3, 10, 30, 100, 300, 1000]
+
+    print(f"{'N':>6} {'scan win (us)':>14} {'counter win (us)':>17} {'scan full (us)':>15} {'counter full (us)':>18}")
+    for n in sizes:
+        reps = max(1, 20000 // n)
+        scan, fast = ScanBoard(n), Board(n)
+        fill_all_but_last(scan)
+        fill_all_but_last(fast)
+
+        # last move of the game: (n-1, n-1) sits on the main diagonal, the expensive case for the scan
+        scan_win = time_per_call(lambda: scan.check_winner(n - 1, n - 1, "x"), reps)
+        fast_win = time_per_call(lambda: fast.check_winner(n - 1, n - 1, "x"), reps)
+        scan_full = time_per_call(scan.is_full, max(1, reps // n))
+        fast_full = time_per_call(fast.is_full, reps)
+
+        print(f"{n:>6} {scan_win:>14.3f} {fast_win:>17.3f} {scan_full:>15.3f} {fast_full:>18.3f}")
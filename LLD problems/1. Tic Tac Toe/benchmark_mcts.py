@@ -0,0 +1,35 @@
+import os
+import sys
+from bitboard import BitBoard
+from mcts_player import MCTSPlayer
+
+'''
+Rollouts per second of MCTSPlayer against the number of worker processes.
+Usage : python benchmark_mcts.py [seconds per move] [board size] [win length]
+'''
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 9
+    win_length = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    cores = os.cpu_count()
+    counts = [0] + [w for w in (1, 2, 4, 8, 16, 32, 64) if w <= cores]
+    if cores not in counts: counts.append(cores)
+
+    board = BitBoard(size, win_length)
+    board.make_move(size // 2, size // 2, "o")
+
+    print(f"{size}x{size}, {win_length} in a row, {seconds}s per move, {cores} cores")
+    print(f"{'workers':>8} {'rollouts':>10} {'rollouts/sec':>14} {'speedup':>8}")
+    baseline = None
+    for workers in counts:
+        player = MCTSPlayer("bench", "x", time_limit = seconds, workers = workers, reuse_tree = False)
+        player.get_move(board)      # warm up the pool and the win mask cache
+        player.get_move(board)
+        player.close()
+
+        rate = player.last_rollouts_per_sec
+        baseline = baseline or rate
+        label = "inline" if workers == 0 else workers
+        print(f"{label:>8} {player.last_rollouts:>10} {rate:>14.0f} {rate / baseline:>7.2f}x")
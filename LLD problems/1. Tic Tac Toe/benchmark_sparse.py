@@ -0,0 +1,41 @@
+import random
+import sys
+import time
+import tracemalloc
+from board import Board
+from sparse_board import SparseBoard
+
+'''
+Memory and per-move latency of the dense Board against SparseBoard.
+Each board gets the same random moves; memory is measured with tracemalloc.
+The dense Board only checks full-length lines, SparseBoard checks 5 in a row.
+Usage : python benchmark_sparse.py [moves] [size ...]
+'''
+
+def measure(make_board, moves):
+    tracemalloc.start()
+    board = make_board()
+    start = time.perf_counter()
+    symbol = "x"
+    for r, c in moves:
+        board.make_move(r, c, symbol)
+        board.check_winner(r, c, symbol)
+        symbol = "o" if symbol == "x" else "x"
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20, elapsed / len(moves) * 1e6
+
+
+if __name__ == "__main__":
+    move_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    sizes = [int(s) for s in sys.argv[2:]] or [100, 1000, 3000]
+    rng = random.Random(0)
+
+    print(f"{move_count} random moves per board")
+    print(f"{'N':>6} {'dense MB':>10} {'sparse MB':>10} {'dense us/move':>14} {'sparse us/move':>15}")
+    for n in sizes:
+        moves = [divmod(cell, n) for cell in rng.sample(range(n * n), min(move_count, n * n))]
+        dense_mb, dense_us = measure(lambda: Board(n), moves)
+        sparse_mb, sparse_us = measure(lambda: SparseBoard(n, win_length = 5), moves)
+        print(f"{n:>6} {dense_mb:>10.1f} {sparse_mb:>10.3f} {dense_us:>14.2f} {sparse_us:>15.2f}")
@@ -0,0 +1,40 @@
+import os
+import sys
+from player import RandomPlayer
+from alpha_beta_player import AlphaBetaPlayer
+from tournament import Entrant, Tournament
+
+'''
+Games/sec of a round-robin tournament against the number of worker processes.
+Usage : python benchmark_tournament.py [total games]
+'''
+
+def entrants():
+    return [
+        Entrant("random-a", RandomPlayer),
+        Entrant("random-b", RandomPlayer),
+        Entrant("random-c", RandomPlayer),
+        Entrant("alphabeta-d2", AlphaBetaPlayer, max_depth = 2),
+    ]
+
+
+if __name__ == "__main__":
+    total_games = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    pairs = len(entrants()) * (len(entrants()) - 1) // 2
+    games_per_pair = max(2, total_games // pairs)
+
+    cores = os.cpu_count()
+    counts = [0] + [w for w in (1, 2, 4, 8, 16, 32, 64) if w <= cores]
+    if cores not in counts: counts.append(cores)
+
+    print(f"{games_per_pair * pairs} games per run, {cores} cores")
+    print(f"{'workers':>8} {'seconds':>9} {'games/sec':>11}")
+    for workers in counts:
+        tournament = Tournament(entrants(), workers = workers, seed = 42)
+        tournament.round_robin(games_per_pair)
+        tournament.close()
+        label = "inline" if workers == 0 else workers
+        print(f"{label:>8} {tournament.elapsed:>9.2f} {tournament.games_per_sec():>11.0f}")
+
+    print()
+    tournament.elo.display()
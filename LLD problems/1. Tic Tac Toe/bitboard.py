@@ -0,0 +1,92 @@
+from functools import lru_cache
+
+@lru_cache(maxsize = None)
+def win_masks(size, win_length):
+    # for every cell index, the bitmasks of all K-in-a-row lines passing through it
+    lines_by_cell = [[] for _ in range(size * size)]
+    for r in range(size):
+        for c in range(size):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_r, end_c = r + dr * (win_length - 1), c + dc * (win_length - 1)
+                if not (0 <= end_r < size and 0 <= end_c < size): continue
+
+                cells = [(r + dr * i) * size + (c + dc * i) for i in range(win_length)]
+                mask = 0
+                for cell in cells: mask |= 1 << cell
+                for cell in cells: lines_by_cell[cell].append(mask)
+    return tuple(tuple(masks) for masks in lines_by_cell)
+
+
+class BitBoard:
+    '''
+    Same API as Board, but each symbol's cells are one integer bitmask and the
+    win lines are precomputed, so a win check is a handful of ANDs.
+    Meant for small and medium boards : the masks are cached per (size, win_length).
+    '''
+    def __init__(self, size, win_length = None):
+        self.size = size
+        self.win_length = win_length or size
+        if not 0 < self.win_length <= size:
+            raise ValueError("win_length must be between 1 and size")
+
+        self.masks = {}
+        self.occupied = 0
+        self.full_mask = (1 << (size * size)) - 1
+        self.moves_count = 0
+        self._lines = win_masks(size, self.win_length)
+
+    @property
+    def grid(self):
+        return [[self.cell(r, c) for c in range(self.size)] for r in range(self.size)]
+
+    def cell(self, x, y):
+        bit = 1 << (x * self.size + y)
+        if not self.occupied & bit: return "_"
+        for symbol, mask in self.masks.items():
+            if mask & bit: return symbol
+
+    def display(self):
+        for row in self.grid:
+            for cell in row:
+                print(cell, end=" ")
+            print()
+
+    def make_move(self, x, y, symbol):
+        if x < 0 or y < 0 or x >= self.size or y >= self.size:
+            raise ValueError("Invalid Cell / Operation")
+        bit = 1 << (x * self.size + y)
+        if self.occupied & bit:
+            raise ValueError("Invalid Cell / Operation")
+
+        self.masks[symbol] = self.masks.get(symbol, 0) | bit
+        self.occupied |= bit
+        self.moves_count += 1
+
+    def undo_move(self, x, y):
+        bit = 1 << (x * self.size + y)
+        if not self.occupied & bit:
+            raise ValueError("Invalid Cell / Operation")
+        for symbol, mask in self.masks.items():
+            if mask & bit:
+                self.masks[symbol] = mask ^ bit
+                break
+        self.occupied ^= bit
+        self.moves_count -= 1
+
+    def empty_cells(self):
+        free = self.full_mask & ~self.occupied
+        cells = []
+        while free:
+            low = free & -free
+            cells.append(divmod(low.bit_length() - 1, self.size))
+            free ^= low
+        return cells
+
+    def check_winner(self, r, c, symbol):
+        mask = self.masks.get(symbol, 0)
+        for line in self._lines[r * self.size + c]:
+            if mask & line == line: return True
+        return False
+
+    def is_full(self):
+        return self.occupied == self.full_mask
@@ -3,6 +3,13 @@ class Board:
         self.size = size
         self.grid = [['_' for _ in range(size)] for __ in range(size)]
 
+        # running counters per symbol so a win check never rescans the grid
+        self.rows = {}
+        self.cols = {}
+        self.diag = {}
+        self.anti_diag = {}
+        self.moves_count = 0
+
     def display(self):
         for r in range(self.size):
             for c in range(self.size):
@@ -12,25 +19,48 @@ class Board:
     def make_move(self, x, y, symbol):
         if x < 0 or y < 0 or x >= self.size or y >= self.size or self.grid[x][y] != "_":
             raise ValueError("Invalid Cell / Operation")
-        self.grid[x][y] = symbol    
+        self.grid[x][y] = symbol
+
+        if symbol not in self.rows:
+            self.rows[symbol] = [0] * self.size
+            self.cols[symbol] = [0] * self.size
+            self.diag[symbol] = 0
+            self.anti_diag[symbol] = 0
+
+        self.rows[symbol][x] += 1
+        self.cols[symbol][y] += 1
+        if x == y: self.diag[symbol] += 1
+        if x + y == self.size - 1: self.anti_diag[symbol] += 1
+        self.moves_count += 1
+
+    def undo_move(self, x, y):
+        # exact inverse of make_move, lets a search walk the tree without copying the grid
+        symbol = self.grid[x][y]
+        if symbol == "_":
+            raise ValueError("Invalid Cell / Operation")
+        self.grid[x][y] = "_"
+
+        self.rows[symbol][x] -= 1
+        self.cols[symbol][y] -= 1
+        if x == y: self.diag[symbol] -= 1
+        if x + y == self.size - 1: self.anti_diag[symbol] -= 1
+        self.moves_count -= 1
+
+    def empty_cells(self):
+        return [(r, c) for r in range(self.size) for c in range(self.size) if self.grid[r][c] == "_"]
 
     def check_winner(self, r, c, symbol):
-        # row
-        if all(self.grid[i][c] == symbol for i in range(self.size)): return True
-        
-        # column
-        if all(self.grid[r][i] == symbol for i in range(self.size)): return True 
+        if symbol not in self.rows: return False
 
-        # primary diagonal
-        if all(self.grid[i][i] == symbol for i in range(self.size)): return True
+        # row / column through the last move
+        if self.rows[symbol][r] == self.size: return True
+        if self.cols[symbol][c] == self.size: return True
 
-        # secondary diagonal
-        if all(self.grid[i][self.size - i - 1] == symbol for i in range(self.size)): return True
+        # diagonals only matter when the last move lies on them
+        if r == c and self.diag[symbol] == self.size: return True
+        if r + c == self.size - 1 and self.anti_diag[symbol] == self.size: return True
 
         return False
 
     def is_full(self):
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.grid[i][j] == "_": return False
-        return True
\ No newline at end of file
+        return self.moves_count == self.size * self.size
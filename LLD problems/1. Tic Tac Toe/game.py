@@ -1,16 +1,50 @@
 from player import Player
 from board import Board
 
+IN_PROGRESS, WIN, DRAW = "IN_PROGRESS", "WIN", "DRAW"
+
 class Game:
-    def __init__(self, player1_name, player2_name, size):
-        self.players = [Player(player1_name, 'x'), Player(player2_name, "o")]
+    def __init__(self, player1, player2, size, board_class = Board, recorder = None):
+        # players are names (human players) or Player instances, e.g. an AlphaBetaPlayer
+        # board_class picks the backend, e.g. BitBoard or partial(BitBoard, win_length = 4)
+        # recorder, e.g. a GameLogWriter, gets the finished game through write_game(game)
+        self.players = [self.as_player(player1, 'x'), self.as_player(player2, "o")]
         self.size = size
-        self.board = Board(size)
+        self.board = board_class(size)
         self.current_index = 0
+        self.status = IN_PROGRESS
+        self.winner = None
+        self.moves = []         # (row, col, player index) in the order they were played
+        self.recorder = recorder
+
+    @staticmethod
+    def as_player(player, symbol):
+        return player if isinstance(player, Player) else Player(player, symbol)
 
     def switch_players(self):
         self.current_index = (self.current_index + 1) % len(self.players)
 
+    def play_move(self, row, col):
+        # applies one move for the current player, raises ValueError if it is not allowed
+        if self.status != IN_PROGRESS:
+            raise ValueError("Game is already over")
+        current_player = self.players[self.current_index]
+        self.board.make_move(row, col, current_player.symbol)
+        self.moves.append((row, col, self.current_index))
+
+        if self.board.check_winner(row, col, current_player.symbol):
+            self.status = WIN
+            self.winner = current_player
+        elif self.board.is_full():
+            self.status = DRAW
+        else:
+            self.switch_players()
+
+        if self.status != IN_PROGRESS:
+            if self.recorder is not None: self.recorder.write_game(self)
+            for player in self.players: player.close()
+        return self.status
+
     def start(self):
         self.board.display()
         while True:
@@ -18,22 +52,19 @@ class Game:
             print(f"player {self.current_index}")
             current_player = self.players[self.current_index]
             print(f"{current_player.name}'s turn")
-            row = int(input(f"Enter the row (0 to {self.size - 1}): "))
-            col = int(input(f"Enter the col (0 to {self.size - 1}): "))
-            
+
             try:
-                self.board.make_move(row, col, current_player.symbol)
+                row, col = current_player.get_move(self.board)
+                status = self.play_move(row, col)
 
-                if self.board.check_winner(row, col, current_player.symbol):
+                if status == WIN:
                     print(f"{current_player.name} is the WINNER !!")
                     break
 
-                if self.board.is_full():
+                if status == DRAW:
                     print(f"Its a DRAW")
                     break
-
-                self.switch_players()
-            except:
+            except ValueError:
                 print(f"Invalid move. Try again")
             
             self.board.display()
@@ -41,5 +72,6 @@ class Game:
 
 
 
-game = Game("sahana", "sourav", 3)
-game.start()
+if __name__ == "__main__":
+    game = Game("sahana", "sourav", 3)
+    game.start()
@@ -0,0 +1,149 @@
+import mmap
+import struct
+import sys
+from array import array
+from board import Board
+
+'''
+Append-only binary log of finished games. Each record is :
+    b"T2" | size : uint16 | width : uint8 | len(name1) : uint8 | len(name2) : uint8 | name1 | name2
+    one move per `width` bytes : cell index << 1 | player bit
+    an end marker of `width` 0xFF bytes
+width is the smallest of 1, 2 or 4 bytes that holds every move of the board size, so
+boards up to 11x11 take one byte per move. All integers are little-endian.
+'''
+
+MAGIC = b"T2"
+HEADER = struct.Struct("<2sHBBB")
+TYPECODES = {1: "B", 2: "H", 4: "I"}
+MAX_SIZE = 46340    # keeps (cell << 1 | bit) below the 4 byte end marker
+
+
+def move_width(size):
+    # bytes per move : the largest move, (last cell << 1 | 1), must stay below the end marker
+    top = 2 * size * size - 1
+    return next(width for width in (1, 2, 4) if top < (1 << 8 * width) - 1)
+
+
+class GameLogWriter:
+    def __init__(self, path):
+        self.file = open(path, "ab")
+
+    def write_game(self, game):
+        if game.size > MAX_SIZE:
+            raise ValueError(f"board size above {MAX_SIZE} does not fit the record format")
+        # cut to 255 bytes on a character boundary, so the name still decodes
+        names = [player.name.encode()[:255].decode("utf-8", "ignore").encode() for player in game.players]
+
+        width = move_width(game.size)
+        moves = array(TYPECODES[width], ((row * game.size + col) << 1 | player for row, col, player in game.moves))
+        moves.append((1 << 8 * width) - 1)
+        if sys.byteorder != "little": moves.byteswap()
+
+        # one write per game so a record is never interleaved with another one
+        self.file.write(HEADER.pack(MAGIC, game.size, width, len(names[0]), len(names[1]))
+                        + names[0] + names[1] + moves.tobytes())
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GameRecord:
+    def __init__(self, size, names, moves):
+        self.size = size
+        self.names = names
+        self.moves = moves          # packed move values, a zero-copy view into the log
+
+    def __len__(self):
+        return len(self.moves)
+
+    def iter_moves(self):
+        for packed in self.moves:
+            cell, player = divmod(packed, 2)
+            row, col = divmod(cell, self.size)
+            yield row, col, player
+
+    def boards(self, board_class = Board, symbols = ("x", "o")):
+        # yields the same board after every move; copy it if a snapshot must be kept
+        board = board_class(self.size)
+        for row, col, player in self.iter_moves():
+            board.make_move(row, col, symbols[player])
+            yield board
+
+    def board_at(self, move_count, board_class = Board, symbols = ("x", "o")):
+        board = board_class(self.size)
+        for i, (row, col, player) in enumerate(self.iter_moves()):
+            if i == move_count: break
+            board.make_move(row, col, symbols[player])
+        return board
+
+
+class GameLog:
+    '''
+    Memory-maps a log written by GameLogWriter and streams its records without
+    parsing text or copying moves. Records hold views into the map, so release
+    them before calling close().
+    '''
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ) if self.file.seek(0, 2) else None
+        self.view = memoryview(self.map) if self.map is not None else memoryview(b"")
+
+    def __iter__(self):
+        pos, length = 0, len(self.view)
+        while pos < length:
+            if pos + HEADER.size > length:
+                raise ValueError(f"truncated game log header at byte {pos}")
+            magic, size, width, len1, len2 = HEADER.unpack_from(self.view, pos)
+            if magic != MAGIC or width not in TYPECODES:
+                raise ValueError(f"corrupt game log at byte {pos}")
+            pos += HEADER.size
+            if pos + len1 + len2 > length:
+                raise ValueError(f"truncated game log header at byte {pos - HEADER.size}")
+            names = (bytes(self.view[pos:pos + len1]).decode(), bytes(self.view[pos + len1:pos + len1 + len2]).decode())
+            pos += len1 + len2
+
+            end = self.find_end(pos, width)
+            yield GameRecord(size, names, self.packed_moves(pos, end, width))
+            pos = end + width
+
+    def find_end(self, start, width):
+        # the marker can only sit on a move boundary; a truncated last record ends at EOF
+        marker = b"\xff" * width
+        pos = start
+        while True:
+            pos = self.map.find(marker, pos)
+            if pos == -1: return len(self.view) - (len(self.view) - start) % width
+            if (pos - start) % width == 0: return pos
+            pos += 1
+
+    def packed_moves(self, start, end, width):
+        chunk = self.view[start:end]
+        if sys.byteorder == "little":
+            return chunk.cast(TYPECODES[width])
+        moves = array(TYPECODES[width], chunk)
+        moves.byteswap()
+        return moves
+
+    def count_moves(self):
+        return sum(len(record) for record in self)
+
+    def close(self):
+        self.view.release()
+        if self.map is not None: self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
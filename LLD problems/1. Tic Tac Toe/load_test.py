@@ -0,0 +1,64 @@
+import asyncio
+import random
+import sys
+import time
+
+'''
+Load test for server.py : opens N concurrent sessions, each plays random games
+on the server, and reports moves/sec plus move round-trip latency percentiles.
+Start the server first (python server.py), then :
+Usage : python load_test.py [sessions] [games per session] [board size] [port]
+'''
+
+async def play_session(host, port, games, size, latencies, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(games):
+            writer.write(f"NEW {size} alice bob\n".encode())
+            await writer.drain()
+            if not (await reader.readline()).startswith(b"STARTED"):
+                raise RuntimeError("server refused the game")
+
+            cells = [(r, c) for r in range(size) for c in range(size)]
+            rng.shuffle(cells)
+            for r, c in cells:
+                start = time.perf_counter()
+                writer.write(f"MOVE {r} {c}\n".encode())
+                await writer.drain()
+                reply = await reader.readline()
+                latencies.append(time.perf_counter() - start)
+                if not reply.startswith(b"NEXT"): break
+
+        writer.write(b"QUIT\n")
+        await writer.drain()
+        await reader.readline()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+async def main(sessions, games, size, host, port):
+    latencies = []
+    rng = random.Random(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(play_session(host, port, games, size, latencies, random.Random(rng.random()))
+                           for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{sessions} sessions x {games} games on {size}x{size} in {elapsed:.2f}s")
+    print(f"moves/sec   : {len(latencies) / elapsed:.0f}")
+    print(f"p50 latency : {percentile(latencies, 50) * 1e3:.2f} ms")
+    print(f"p99 latency : {percentile(latencies, 99) * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    size = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    port = int(sys.argv[4]) if len(sys.argv) > 4 else 8765
+    asyncio.run(main(sessions, games, size, "127.0.0.1", port))
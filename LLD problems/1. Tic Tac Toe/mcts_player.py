@@ -0,0 +1,187 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from bitboard import BitBoard
+from player import Player
+
+DRAW = 2
+
+def run_rollouts(size, win_length, masks, symbols, to_move, count, seed):
+    # plays `count` random games from the given position, returns [wins of symbols[0], wins of symbols[1], draws]
+    # module level so it can be shipped to worker processes
+    rng = random.Random(seed)
+    board = BitBoard(size, win_length)
+    for symbol, mask in zip(symbols, masks):
+        board.masks[symbol] = mask
+        board.occupied |= mask
+    empty = board.empty_cells()
+
+    results = [0, 0, 0]
+    for _ in range(count):
+        rng.shuffle(empty)
+        player, winner, played = to_move, DRAW, 0
+        for r, c in empty:
+            board.make_move(r, c, symbols[player])
+            played += 1
+            if board.check_winner(r, c, symbols[player]):
+                winner = player
+                break
+            player = 1 - player
+        for r, c in empty[:played]:
+            board.undo_move(r, c)
+        results[winner] += 1
+    return results
+
+
+class Node:
+    def __init__(self, move, player, untried):
+        self.move = move
+        self.player = player        # index of the player whose move led here
+        self.untried = untried
+        self.children = {}
+        self.visits = 0
+        self.wins = 0.0             # from `player`'s point of view, draws count half
+        self.terminal = None        # winner index or DRAW once the game is over here
+
+    def uct_child(self, exploration):
+        log_visits = math.log(self.visits)
+        return max(self.children.values(),
+                   key = lambda ch: ch.wins / ch.visits + exploration * math.sqrt(log_visits / ch.visits))
+
+
+class MCTSPlayer(Player):
+    '''
+    Monte Carlo Tree Search player. The tree lives in this process; batches of
+    random rollouts are farmed out to a process pool so they run on every core.
+    Give it either a rollout count or a time_limit in seconds per move; the last batch is
+    cut short so exactly `rollouts` games are played. A time limit always lets one batch run,
+    so there is a move to return however short it is.
+    workers = 0 runs the rollouts inline, which is handy for tests.
+    The process pool is started on the first move and shut down by close(), which Game
+    calls when the game ends.
+    '''
+    def __init__(self, name, symbol, opponent_symbol = None, rollouts = None, time_limit = None,
+                 workers = None, batch_size = 32, exploration = 1.4, reuse_tree = True, seed = 0):
+        super().__init__(name, symbol)
+        self.symbols = (symbol, opponent_symbol or ("o" if symbol == "x" else "x"))
+        self.rollouts = rollouts if rollouts or time_limit else 2000
+        self.time_limit = time_limit
+        self.workers = os.cpu_count() if workers is None else workers
+        self.batch_size = batch_size
+        self.exploration = exploration
+        self.reuse_tree = reuse_tree
+        self.rng = random.Random(seed)
+
+        self.executor = None
+        self.root = None
+        self.root_occupied = None
+        self.last_rollouts = 0
+        self.last_rollouts_per_sec = 0.0
+
+    def get_move(self, board):
+        search_board = BitBoard(board.size, getattr(board, "win_length", board.size))
+        for r, row in enumerate(board.grid):
+            for c, cell in enumerate(row):
+                if cell != "_": search_board.make_move(r, c, cell)
+
+        root = self.reused_root(search_board)
+        if root is None:
+            root = Node(None, 1, search_board.empty_cells())
+
+        self.search(root, search_board)
+
+        best = max(root.children.values(), key = lambda ch: ch.visits)
+        if self.reuse_tree:
+            search_board.make_move(best.move[0], best.move[1], self.symbols[0])
+            self.root, self.root_occupied = best, search_board.occupied
+        return best.move
+
+    def reused_root(self, board):
+        # keep the subtree under the opponent's reply to our last move, if we explored it
+        if not self.reuse_tree or self.root is None: return None
+        previous, self.root = self.root, None
+        added = board.occupied & ~self.root_occupied
+        if board.occupied & self.root_occupied != self.root_occupied or added & (added - 1) or not added:
+            return None
+        move = divmod(added.bit_length() - 1, board.size)
+        return previous.children.get(move)
+
+    def search(self, root, board):
+        if self.workers and self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers = self.workers)
+
+        start = time.perf_counter()
+        deadline = start + self.time_limit if self.time_limit else None
+        submitted, pending = 0, {}
+        while True:
+            while len(pending) < max(1, 2 * self.workers):
+                if deadline is not None and submitted and time.perf_counter() >= deadline: break
+                if deadline is None and submitted >= self.rollouts: break
+
+                path, masks, leaf = self.select(root, board)
+                count = self.batch_size if deadline is not None else min(self.batch_size, self.rollouts - submitted)
+                submitted += count
+                # count the visits now (virtual loss) so the next selections spread out
+                for node in path: node.visits += count
+
+                if leaf.terminal is not None:
+                    results = [0, 0, 0]
+                    results[leaf.terminal] = count
+                    self.backpropagate(path, results)
+                    continue
+
+                to_move = 1 - leaf.player
+                args = (board.size, board.win_length, masks, self.symbols, to_move, count, self.rng.getrandbits(32))
+                if self.workers:
+                    pending[self.executor.submit(run_rollouts, *args)] = path
+                else:
+                    self.backpropagate(path, run_rollouts(*args))
+
+            if not pending: break
+            done, _ = wait(pending, return_when = FIRST_COMPLETED)
+            for future in done:
+                self.backpropagate(pending.pop(future), future.result())
+
+        elapsed = time.perf_counter() - start
+        self.last_rollouts = submitted
+        self.last_rollouts_per_sec = submitted / elapsed if elapsed else 0.0
+
+    def select(self, root, board):
+        node, path, played = root, [root], []
+        while node.terminal is None:
+            if node.untried:
+                move = node.untried.pop(self.rng.randrange(len(node.untried)))
+                player = 1 - node.player
+                board.make_move(move[0], move[1], self.symbols[player])
+                played.append(move)
+
+                child = Node(move, player, [])
+                if board.check_winner(move[0], move[1], self.symbols[player]): child.terminal = player
+                elif board.is_full(): child.terminal = DRAW
+                else: child.untried = board.empty_cells()
+                node.children[move] = child
+                path.append(child)
+                node = child
+                break
+
+            node = node.uct_child(self.exploration)
+            board.make_move(node.move[0], node.move[1], self.symbols[node.player])
+            played.append(node.move)
+            path.append(node)
+
+        masks = tuple(board.masks.get(symbol, 0) for symbol in self.symbols)
+        for r, c in reversed(played):
+            board.undo_move(r, c)
+        return path, masks, node
+
+    def backpropagate(self, path, results):
+        draws = results[DRAW] * 0.5
+        for node in path:
+            node.wins += results[node.player] + draws
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait = True)
+            self.executor = None
@@ -1,4 +1,24 @@
+import random
+
 class Player:
     def __init__(self, name, symbol):
         self.name = name
-        self.symbol = symbol
\ No newline at end of file
+        self.symbol = symbol
+
+    def get_move(self, board):
+        row = int(input(f"Enter the row (0 to {board.size - 1}): "))
+        col = int(input(f"Enter the col (0 to {board.size - 1}): "))
+        return row, col
+
+    def close(self):
+        # called by Game when the game ends; players holding resources (process pools) release them
+        pass
+
+
+class RandomPlayer(Player):
+    def __init__(self, name, symbol, seed = None):
+        super().__init__(name, symbol)
+        self.rng = random.Random(seed)
+
+    def get_move(self, board):
+        return self.rng.choice(board.empty_cells())
@@ -0,0 +1,124 @@
+import asyncio
+import itertools
+import sys
+from board import Board
+from game import Game, IN_PROGRESS, WIN
+
+'''
+Asyncio game server : every TCP connection owns one Game session.
+
+Line protocol (one command per line, one reply per command) :
+    NEW <size> <player1> <player2>  ->  STARTED <session id> <symbol to move>
+    MOVE <row> <col>                ->  NEXT <symbol to move> | WIN <name> | DRAW | ERR <reason>
+    QUIT                            ->  BYE
+A session that sends nothing for move_timeout seconds gets TIMEOUT and is closed.
+
+Usage : python server.py [port] [move timeout seconds]
+'''
+
+class GameServer:
+    def __init__(self, host = "127.0.0.1", port = 8765, move_timeout = 30.0, max_size = 50, board_class = Board):
+        self.host = host
+        self.port = port
+        self.move_timeout = move_timeout
+        self.max_size = max_size
+        self.board_class = board_class
+        self.sessions = {}
+        self.session_ids = itertools.count(1)
+        self.moves_played = 0
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port, backlog = 4096)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle_client(self, reader, writer):
+        session_id = next(self.session_ids)
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.move_timeout)
+                except asyncio.TimeoutError:
+                    writer.write(b"TIMEOUT\n")
+                    break
+                except ValueError:
+                    # longer than the reader's limit (64 KiB) : the stream cannot be resynced
+                    writer.write(b"ERR line too long\n")
+                    await writer.drain()
+                    break
+                if not line: break
+
+                try:
+                    parts = line.decode().split()
+                except UnicodeDecodeError:
+                    reply = "ERR command is not valid UTF-8"
+                else:
+                    reply = self.handle_command(session_id, parts)
+                writer.write(reply.encode() + b"\n")
+                await writer.drain()
+                if reply == "BYE": break
+        except ConnectionError:
+            pass
+        finally:
+            # finished, abandoned or timed out : the session never outlives its connection
+            self.sessions.pop(session_id, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def handle_command(self, session_id, parts):
+        if not parts: return "ERR empty command"
+        command = parts[0].upper()
+
+        if command == "QUIT":
+            return "BYE"
+
+        if command == "NEW":
+            if len(parts) != 4 or not parts[1].isdigit():
+                return "ERR usage: NEW <size> <player1> <player2>"
+            size = int(parts[1])
+            if not 1 <= size <= self.max_size:
+                return f"ERR size must be between 1 and {self.max_size}"
+            game = Game(parts[2], parts[3], size, self.board_class)
+            self.sessions[session_id] = game
+            return f"STARTED {session_id} {game.players[game.current_index].symbol}"
+
+        if command == "MOVE":
+            game = self.sessions.get(session_id)
+            if game is None or game.status != IN_PROGRESS:
+                return "ERR no game in progress, send NEW first"
+            try:
+                status = game.play_move(int(parts[1]), int(parts[2]))
+            except (ValueError, IndexError):
+                return "ERR invalid move"
+            self.moves_played += 1
+
+            if status == IN_PROGRESS:
+                return f"NEXT {game.players[game.current_index].symbol}"
+            del self.sessions[session_id]
+            return f"WIN {game.winner.name}" if status == WIN else "DRAW"
+
+        return f"ERR unknown command {command}"
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    timeout = float(sys.argv[2]) if len(sys.argv) > 2 else 30.0
+    server = GameServer(port = port, move_timeout = timeout)
+    print(f"Tic Tac Toe server listening on {server.host}:{port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
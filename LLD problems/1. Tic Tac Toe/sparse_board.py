@@ -0,0 +1,76 @@
+class SparseBoard:
+    '''
+    Board for huge (Gomoku-scale) or unbounded grids : only occupied cells are
+    stored, in a dict, and the K-in-a-row check walks at most K-1 cells each way
+    from the last move. Memory grows with the number of moves, not the area.
+    size = None makes the board unbounded.
+    '''
+    DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+    def __init__(self, size = None, win_length = None):
+        self.size = size
+        self.win_length = win_length or size or 5
+        if size is not None and not 0 < self.win_length <= size:
+            raise ValueError("win_length must be between 1 and size")
+        self.cells = {}
+        self.moves_count = 0
+
+    def in_bounds(self, x, y):
+        return self.size is None or (0 <= x < self.size and 0 <= y < self.size)
+
+    def cell(self, x, y):
+        return self.cells.get((x, y), "_")
+
+    @property
+    def grid(self):
+        if self.size is None:
+            raise ValueError("An unbounded board has no grid")
+        return [[self.cell(r, c) for c in range(self.size)] for r in range(self.size)]
+
+    def display(self):
+        # bounded boards print whole, unbounded ones print the box around the stones
+        if self.size is not None:
+            rows = cols = range(self.size)
+        elif self.cells:
+            rows = range(min(x for x, _ in self.cells), max(x for x, _ in self.cells) + 1)
+            cols = range(min(y for _, y in self.cells), max(y for _, y in self.cells) + 1)
+        else:
+            return
+        for r in rows:
+            for c in cols:
+                print(self.cell(r, c), end=" ")
+            print()
+
+    def make_move(self, x, y, symbol):
+        if not self.in_bounds(x, y) or (x, y) in self.cells:
+            raise ValueError("Invalid Cell / Operation")
+        self.cells[(x, y)] = symbol
+        self.moves_count += 1
+
+    def undo_move(self, x, y):
+        if (x, y) not in self.cells:
+            raise ValueError("Invalid Cell / Operation")
+        del self.cells[(x, y)]
+        self.moves_count -= 1
+
+    def empty_cells(self):
+        if self.size is None:
+            raise ValueError("An unbounded board has no finite set of empty cells")
+        return [(r, c) for r in range(self.size) for c in range(self.size) if (r, c) not in self.cells]
+
+    def check_winner(self, r, c, symbol):
+        cells, need = self.cells, self.win_length
+        if cells.get((r, c)) != symbol: return False
+
+        for dr, dc in self.DIRECTIONS:
+            run = 1
+            for sign in (1, -1):
+                x, y = r + sign * dr, c + sign * dc
+                while run < need and cells.get((x, y)) == symbol:
+                    run += 1
+                    x, y = x + sign * dr, y + sign * dc
+            if run >= need: return True
+        return False
+
+    def is_full(self):
+        return self.size is not None and self.moves_count == self.size * self.size
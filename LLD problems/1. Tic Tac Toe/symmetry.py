@@ -0,0 +1,26 @@
+from functools import lru_cache
+
+@lru_cache(maxsize = None)
+def symmetries(size):
+    # the 8 rotations / reflections of a square board, each as a cell permutation :
+    # perm[cell] is the index that cell is moved to by the transform
+    n = size - 1
+    transforms = (
+        lambda r, c: (r, c),
+        lambda r, c: (c, n - r),
+        lambda r, c: (n - r, n - c),
+        lambda r, c: (n - c, r),
+        lambda r, c: (r, n - c),
+        lambda r, c: (c, r),
+        lambda r, c: (n - r, c),
+        lambda r, c: (n - c, n - r),
+    )
+    perms = []
+    for transform in transforms:
+        perm = []
+        for r in range(size):
+            for c in range(size):
+                tr, tc = transform(r, c)
+                perm.append(tr * size + tc)
+        perms.append(tuple(perm))
+    return tuple(perms)
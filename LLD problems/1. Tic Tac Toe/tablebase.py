@@ -0,0 +1,150 @@
+import mmap
+import sys
+from alpha_beta_player import AlphaBetaPlayer
+from bitboard import win_masks
+from symmetry import symmetries
+
+'''
+Offline solver and runtime lookup for small boards (up to 4x4).
+
+A position is the base-3 number of its cells (0 empty, 1 first player, 2 second)
+and is stored under the smallest of its 8 symmetric images. The file is a
+header followed by one byte per base-3 index, so a lookup is a single read
+from the memory-mapped table :
+    bits 0-1 : outcome for the side to move (WIN, DRAW, LOSS), 0 = not covered
+    bits 2-7 : best move as a cell index of the canonical image
+
+Usage : python tablebase.py <size> <output path>
+'''
+
+MAGIC = b"TTB1"
+HEADER_SIZE = len(MAGIC) + 2
+WIN, DRAW, LOSS = 1, 2, 3
+RANK = {WIN: 2, DRAW: 1, LOSS: 0}
+FLIP = {WIN: LOSS, DRAW: DRAW, LOSS: WIN}
+MAX_SIZE = 4
+
+
+def solve(size, win_length = None):
+    # returns {canonical index : entry byte} for every reachable position that still has a move to play
+    win_length = win_length or size
+    cells = size * size
+    lines_by_cell = [[[cell for cell in range(cells) if mask >> cell & 1] for mask in masks]
+                     for masks in win_masks(size, win_length)]
+    perms = symmetries(size)
+    powers = [3 ** i for i in range(cells)]
+    # weights[cell][t] : what one unit of that cell adds to the image under symmetry t
+    weights = [[powers[perm[cell]] for perm in perms] for cell in range(cells)]
+
+    board = [0] * cells
+    images = [0] * 8
+    table = {}
+
+    def wins(cell, player):
+        return any(all(board[i] == player for i in line) for line in lines_by_cell[cell])
+
+    def place(cell, digit, sign):
+        board[cell] = digit if sign > 0 else 0
+        for t, weight in enumerate(weights[cell]):
+            images[t] += sign * digit * weight
+
+    def search(player, empty_count):
+        key = min(images)
+        entry = table.get(key)
+        if entry is not None: return entry & 3
+
+        transform = perms[images.index(key)]
+        best_outcome, best_move = None, None
+        for cell in range(cells):
+            if board[cell]: continue
+            place(cell, player, 1)
+            if wins(cell, player): outcome = WIN
+            elif empty_count == 1: outcome = DRAW
+            else: outcome = FLIP[search(3 - player, empty_count - 1)]
+            place(cell, player, -1)
+
+            # no cutoff on a win : every reply has to be solved so the table covers every reachable position
+            if best_outcome is None or RANK[outcome] > RANK[best_outcome]:
+                best_outcome, best_move = outcome, transform[cell]
+
+        table[key] = best_outcome | best_move << 2
+        return best_outcome
+
+    search(1, cells)
+    return table
+
+
+def build(size, path, win_length = None):
+    if not 0 < size <= MAX_SIZE:
+        raise ValueError(f"tablebases are only practical up to {MAX_SIZE}x{MAX_SIZE}")
+    table = solve(size, win_length)
+    data = bytearray(3 ** (size * size))
+    for key, entry in table.items():
+        data[key] = entry
+    with open(path, "wb") as f:
+        f.write(MAGIC + bytes([size, win_length or size]) + data)
+    return len(table)
+
+
+class Tablebase:
+    def __init__(self, path, symbols = ("x", "o")):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+        if self.map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a tablebase")
+        self.size, self.win_length = self.map[len(MAGIC)], self.map[len(MAGIC) + 1]
+        self.symbols = symbols          # first mover first
+
+        cells = self.size * self.size
+        self.weights = [[3 ** perm[cell] for perm in symmetries(self.size)] for cell in range(cells)]
+        # inverse[t][canonical cell] -> cell on the real board
+        self.inverse = []
+        for perm in symmetries(self.size):
+            inverse = [0] * cells
+            for cell, image in enumerate(perm): inverse[image] = cell
+            self.inverse.append(inverse)
+
+    def covers(self, board):
+        return board.size == self.size and getattr(board, "win_length", board.size) == self.win_length
+
+    def lookup(self, board):
+        # (best move, outcome for the side to move), or None when the position is not in the table
+        if not self.covers(board): return None
+        images = [0] * 8
+        for r, row in enumerate(board.grid):
+            for c, symbol in enumerate(row):
+                if symbol == "_": continue
+                if symbol not in self.symbols: return None
+                digit = self.symbols.index(symbol) + 1
+                for t, weight in enumerate(self.weights[r * self.size + c]):
+                    images[t] += digit * weight
+
+        key = min(images)
+        entry = self.map[HEADER_SIZE + key]
+        if not entry: return None
+        cell = self.inverse[images.index(key)][entry >> 2]
+        return divmod(cell, self.size), entry & 3
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+class TablebasePlayer(AlphaBetaPlayer):
+    # answers straight from the tablebase, falls back to alpha-beta search on anything it does not cover
+    def __init__(self, name, symbol, tablebase, **search_options):
+        super().__init__(name, symbol, **search_options)
+        self.tablebase = tablebase
+        self.hits = 0
+
+    def get_move(self, board):
+        found = self.tablebase.lookup(board)
+        if found is not None:
+            self.hits += 1
+            return found[0]
+        return super().get_move(board)
+
+
+if __name__ == "__main__":
+    size, path = int(sys.argv[1]), sys.argv[2]
+    print(f"Solved {build(size, path)} canonical positions of the {size}x{size} board into {path}")
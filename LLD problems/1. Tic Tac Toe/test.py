@@ -1,5 +1,28 @@
+import asyncio
+import os
+import tempfile
+import time
 import unittest
+from types import SimpleNamespace
 from board import Board
+from bitboard import BitBoard
+from alpha_beta_player import AlphaBetaPlayer
+import alpha_beta_player
+from zobrist import ZobristHasher
+from mcts_player import MCTSPlayer
+from game import Game, IN_PROGRESS, WIN, DRAW
+from server import GameServer
+from game_record import GameLogWriter, GameLog, move_width, MAX_SIZE
+from sparse_board import SparseBoard
+import tablebase
+from tablebase import build, Tablebase, TablebasePlayer
+from player import Player, RandomPlayer
+from tournament import Entrant, Tournament
+try:
+    import numpy
+    from batch_simulator import BatchSimulator
+except ImportError:
+    numpy = None
 
 class GameTest(unittest.TestCase):
     def setUp(self):
@@ -19,5 +42,453 @@ class GameTest(unittest.TestCase):
         self.board.make_move(0, 2, "x")
         self.assertTrue(self.board.check_winner(0,2,"x"))
 
+    def test_col_win(self):
+        self.board.make_move(0, 1, "o")
+        self.board.make_move(1, 1, "o")
+        self.assertFalse(self.board.check_winner(1,1,"o"))
+        self.board.make_move(2, 1, "o")
+        self.assertTrue(self.board.check_winner(2,1,"o"))
+
+    def test_diag_win(self):
+        self.board.make_move(0, 0, "x")
+        self.board.make_move(1, 1, "x")
+        self.board.make_move(2, 2, "x")
+        self.assertTrue(self.board.check_winner(2,2,"x"))
+        self.assertFalse(self.board.check_winner(2,2,"o"))
+
+    def test_anti_diag_win(self):
+        self.board.make_move(0, 2, "o")
+        self.board.make_move(1, 1, "o")
+        self.board.make_move(2, 0, "o")
+        self.assertTrue(self.board.check_winner(2,0,"o"))
+
+    def test_draw_detection(self):
+        moves = [(0,0,"x"), (0,1,"o"), (0,2,"x"),
+                 (1,1,"o"), (1,0,"x"), (1,2,"o"),
+                 (2,1,"x"), (2,0,"o"), (2,2,"x")]
+        for r, c, symbol in moves:
+            self.assertFalse(self.board.is_full())
+            self.board.make_move(r, c, symbol)
+            self.assertFalse(self.board.check_winner(r, c, symbol))
+        self.assertTrue(self.board.is_full())
+
+    def test_undo_move(self):
+        self.board.make_move(0, 0, "x")
+        self.board.make_move(1, 1, "x")
+        self.board.make_move(2, 2, "x")
+        self.board.undo_move(2, 2)
+        self.assertFalse(self.board.check_winner(1, 1, "x"))
+        self.assertEqual(self.board.grid[2][2], "_")
+        self.assertEqual(len(self.board.empty_cells()), 7)
+        self.assertRaises(ValueError, self.board.undo_move, 2, 2)
+
+
+class BitBoardTest(GameTest):
+    # runs every GameTest case against the bitboard backend
+    def setUp(self):
+        self.board = BitBoard(size = 3)
+
+    def test_make_move_success(self):
+        self.board.make_move(0, 0, "x")
+        self.assertEqual(self.board.grid[0][0], "x")
+        self.assertRaises(ValueError, self.board.make_move, 0, 0, "o")
+
+    def test_k_in_a_row(self):
+        board = BitBoard(size = 5, win_length = 3)
+        board.make_move(1, 3, "x")
+        board.make_move(2, 2, "x")
+        self.assertFalse(board.check_winner(2, 2, "x"))
+        board.make_move(3, 1, "x")
+        self.assertTrue(board.check_winner(3, 1, "x"))
+        self.assertFalse(board.check_winner(3, 1, "o"))
+
+
+class SparseBoardTest(GameTest):
+    # runs every GameTest case against the sparse backend
+    def setUp(self):
+        self.board = SparseBoard(size = 3)
+
+    def test_make_move_success(self):
+        self.board.make_move(0, 0, "x")
+        self.assertEqual(self.board.grid[0][0], "x")
+        self.assertEqual(len(self.board.cells), 1)
+
+    def test_unbounded_five_in_a_row(self):
+        board = SparseBoard(win_length = 5)
+        for i in range(4):
+            board.make_move(-10**9 + i, 10**9 - i, "x")
+        self.assertFalse(board.check_winner(-10**9 + 3, 10**9 - 3, "x"))
+        board.make_move(-10**9 - 1, 10**9 + 1, "x")
+        self.assertTrue(board.check_winner(-10**9 - 1, 10**9 + 1, "x"))
+        self.assertFalse(board.is_full())
+        self.assertEqual(len(board.cells), 5)
+
+    def test_huge_board_stays_small(self):
+        board = SparseBoard(size = 10_000, win_length = 5)
+        board.make_move(9_999, 9_999, "o")
+        self.assertRaises(ValueError, board.make_move, 10_000, 0, "o")
+        self.assertEqual(len(board.cells), 1)
+
+
+class AlphaBetaPlayerTest(unittest.TestCase):
+    def test_takes_the_win(self):
+        board = Board(3)
+        for r, c, symbol in [(0,0,"x"), (1,0,"o"), (0,1,"x"), (1,1,"o")]:
+            board.make_move(r, c, symbol)
+        self.assertEqual(AlphaBetaPlayer("ai", "x").get_move(board), (0, 2))
+
+    def test_blocks_the_loss(self):
+        board = BitBoard(3)
+        for r, c, symbol in [(0,0,"x"), (1,1,"o"), (2,2,"x"), (0,2,"o")]:
+            board.make_move(r, c, symbol)
+        self.assertEqual(AlphaBetaPlayer("ai", "x").get_move(board), (2, 0))
+
+    def test_self_play_is_a_draw(self):
+        board = Board(3)
+        players = [AlphaBetaPlayer("a", "x"), AlphaBetaPlayer("b", "o")]
+        turn = 0
+        while not board.is_full():
+            player = players[turn % 2]
+            r, c = player.get_move(board)
+            board.make_move(r, c, player.symbol)
+            self.assertFalse(board.check_winner(r, c, player.symbol))
+            turn += 1
+
+    def test_search_leaves_board_untouched(self):
+        board = BitBoard(4)
+        board.make_move(0, 0, "o")
+        AlphaBetaPlayer("ai", "x", max_depth = 4).get_move(board)
+        self.assertEqual(board.moves_count, 1)
+        self.assertEqual(len(board.empty_cells()), 15)
+
+    def test_answers_within_time_limit(self):
+        board = BitBoard(5)
+        for r, c, symbol in [(0,0,"x"), (1,1,"o"), (2,2,"x"), (3,3,"o")]:
+            board.make_move(r, c, symbol)
+        player = AlphaBetaPlayer("ai", "x", time_limit = 0.05)
+        start = time.perf_counter()
+        move = player.get_move(board)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertIn(move, board.empty_cells())
+        self.assertGreaterEqual(player.depth_reached, 2)
+        self.assertEqual(board.moves_count, 4)
+
+    def test_depth_limited_search_takes_the_win(self):
+        board = BitBoard(5, 3)
+        for r, c, symbol in [(2,1,"x"), (0,0,"o"), (2,2,"x"), (4,4,"o")]:
+            board.make_move(r, c, symbol)
+        move = AlphaBetaPlayer("ai", "x", time_limit = None, node_limit = 2000).get_move(board)
+        self.assertIn(move, [(2, 0), (2, 3)])
+
+    def test_table_cleared_when_win_length_changes(self):
+        player = AlphaBetaPlayer("ai", "x", max_depth = 3, time_limit = None)
+        player.get_move(BitBoard(4, 4))
+        self.assertGreater(len(player.table), 0)
+        board = BitBoard(4, 3)
+        for r, c, symbol in [(1,0,"x"), (0,0,"o"), (1,1,"x"), (3,3,"o")]:
+            board.make_move(r, c, symbol)
+        self.assertIn(player.get_move(board), [(1, 2)])
+
+    def test_heuristic_stays_below_a_forced_win(self):
+        # win_length 12 : an open line of 11 is weighted 4 ** 10, more than WIN // 2
+        player = AlphaBetaPlayer("ai", "x", max_depth = 1, time_limit = None)
+        player.get_move(BitBoard(12, 12))
+        player.bits = [(1 << 11) - 1, 0]
+        self.assertLess(abs(player.evaluate(0)), alpha_beta_player.WIN // 2)
+        self.assertLess(abs(player.evaluate(1)), alpha_beta_player.WIN // 2)
+
+    def test_symmetric_positions_share_a_key(self):
+        hasher = ZobristHasher(3)
+        corner = [["x","_","_"], ["_","o","_"], ["_","_","_"]]
+        other_corner = [["_","_","_"], ["_","o","_"], ["_","_","x"]]
+        edge = [["_","x","_"], ["_","o","_"], ["_","_","_"]]
+        key = lambda grid: hasher.canonical(hasher.hashes(grid, ("x", "o")), 0)
+        self.assertEqual(key(corner), key(other_corner))
+        self.assertNotEqual(key(corner), key(edge))
+
+
+class MCTSPlayerTest(unittest.TestCase):
+    def test_takes_the_win(self):
+        board = Board(3)
+        for r, c, symbol in [(0,0,"x"), (1,0,"o"), (0,1,"x"), (1,1,"o")]:
+            board.make_move(r, c, symbol)
+        player = MCTSPlayer("mcts", "x", rollouts = 2000, workers = 0)
+        self.assertEqual(player.get_move(board), (0, 2))
+
+    def test_tree_is_reused_after_opponent_move(self):
+        board = BitBoard(4, win_length = 3)
+        player = MCTSPlayer("mcts", "x", rollouts = 3000, workers = 0)
+        r, c = player.get_move(board)
+        board.make_move(r, c, "x")
+
+        reply = next(iter(player.root.children))
+        board.make_move(reply[0], reply[1], "o")
+        subtree = player.root.children[reply]
+        self.assertIs(player.reused_root(board), subtree)
+
+    def test_process_pool_rollouts(self):
+        board = BitBoard(3)
+        player = MCTSPlayer("mcts", "o", rollouts = 640, workers = 2)
+        try:
+            board.make_move(1, 1, "x")
+            self.assertIn(player.get_move(board), board.empty_cells())
+            self.assertEqual(player.last_rollouts, 640)
+        finally:
+            player.close()
+
+    def test_tiny_time_limit_still_returns_a_move(self):
+        board = BitBoard(3)
+        player = MCTSPlayer("mcts", "x", time_limit = 1e-7, workers = 0)
+        self.assertIn(player.get_move(board), board.empty_cells())
+        self.assertEqual(player.last_rollouts, player.batch_size)
+
+    def test_rollout_count_is_exact(self):
+        player = MCTSPlayer("mcts", "x", rollouts = 10, workers = 0)
+        player.get_move(BitBoard(3))
+        self.assertEqual(player.last_rollouts, 10)
+
+    def test_game_end_shuts_the_pool_down(self):
+        player = MCTSPlayer("mcts", "x", rollouts = 64, workers = 1)
+        game = Game(player, RandomPlayer("r", "o", seed = 1), 3, BitBoard)
+        try:
+            while game.status == IN_PROGRESS:
+                game.play_move(*game.players[game.current_index].get_move(game.board))
+            self.assertIsNone(player.executor)
+        finally:
+            player.close()
+
+
+class GameServerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = GameServer(port = 0, move_timeout = 0.2)
+        await self.server.start()
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.server.stop()
+
+    async def send(self, line):
+        self.writer.write(line.encode() + b"\n")
+        await self.writer.drain()
+        return (await self.reader.readline()).decode().strip()
+
+    async def test_play_a_game(self):
+        self.assertTrue((await self.send("NEW 3 alice bob")).startswith("STARTED"))
+        self.assertEqual(await self.send("MOVE 0 0"), "NEXT o")
+        self.assertEqual(await self.send("MOVE 0 0"), "ERR invalid move")
+        await self.send("MOVE 1 0")
+        await self.send("MOVE 0 1")
+        await self.send("MOVE 1 1")
+        self.assertEqual(await self.send("MOVE 0 2"), "WIN alice")
+        self.assertEqual(self.server.sessions, {})
+        self.assertEqual(await self.send("QUIT"), "BYE")
+
+    async def test_invalid_utf8_gets_an_error(self):
+        self.writer.write(b"NEW \xff\xfe\n")
+        await self.writer.drain()
+        self.assertEqual((await self.reader.readline()).strip(), b"ERR command is not valid UTF-8")
+        self.assertEqual(await self.send("QUIT"), "BYE") # the connection is still served
+
+    async def test_overlong_line_gets_an_error_and_closes(self):
+        await self.send("NEW 3 alice bob")
+        self.writer.write(b"x" * 70_000 + b"\n")
+        await self.writer.drain()
+        self.assertEqual((await self.reader.readline()).strip(), b"ERR line too long")
+        self.assertEqual(await self.reader.read(), b"")
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.server.sessions, {})
+
+    async def test_idle_session_times_out(self):
+        await self.send("NEW 3 alice bob")
+        self.assertEqual(len(self.server.sessions), 1)
+        self.assertEqual((await self.reader.readline()).strip(), b"TIMEOUT")
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.server.sessions, {})
+
+
+class GameTurnTest(unittest.TestCase):
+    def test_play_move_tracks_status(self):
+        game = Game("alice", "bob", 3)
+        for r, c in [(0,0), (1,0), (0,1), (1,1)]:
+            game.play_move(r, c)
+        self.assertEqual(game.play_move(0, 2), WIN)
+        self.assertEqual(game.winner.name, "alice")
+        self.assertRaises(ValueError, game.play_move, 2, 2)
+
+
+class GameRecordTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix = ".log")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def play(self, recorder, names, size, moves):
+        game = Game(names[0], names[1], size, recorder = recorder)
+        for r, c in moves:
+            game.play_move(r, c)
+        return game
+
+    def test_round_trip(self):
+        with GameLogWriter(self.path) as writer:
+            self.play(writer, ("alice", "bob"), 3, [(0,0), (1,0), (0,1), (1,1), (0,2)])
+            self.play(writer, ("carol", "dave"), 4, [(0,0), (3,3), (1,1), (2,2), (0,1),
+                                                     (0,3), (0,2), (3,0), (1,0), (2,1),
+                                                     (2,0), (3,1), (1,2), (3,2)])
+            self.play(writer, ("eve", "frank"), 3, [(1,1)])      # unfinished : not written
+
+        log = GameLog(self.path)
+        records = list(log)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0].names, ("alice", "bob"))
+        self.assertEqual(list(records[0].iter_moves())[:2], [(0, 0, 0), (1, 0, 1)])
+        self.assertTrue(records[0].board_at(5).check_winner(0, 2, "x"))
+        self.assertEqual(records[1].size, 4)
+        self.assertEqual(len(records[1]), 14)
+        self.assertEqual(records[1].board_at(2).grid[3][3], "o")
+        self.assertEqual(log.count_moves(), 19)
+
+        boards = records[1].boards(BitBoard)
+        self.assertEqual(next(boards).grid[0][0], "x")
+        del records, boards
+        log.close()
+
+    def test_long_multibyte_name_is_cut_on_a_character_boundary(self):
+        long_name = "é" * 200 # 400 bytes : a plain 255 byte cut splits the last character
+        with GameLogWriter(self.path) as writer:
+            self.play(writer, (long_name, "bob"), 3, [(0,0), (1,0), (0,1), (1,1), (0,2)])
+
+        with GameLog(self.path) as log:
+            names = next(iter(log)).names
+        self.assertEqual(names, ("é" * 127, "bob"))
+
+    def test_truncated_last_record(self):
+        with GameLogWriter(self.path) as writer:
+            self.play(writer, ("alice", "bob"), 3, [(0,0), (1,0), (0,1), (1,1), (0,2)])
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 2)   # the end marker and the last move
+
+        with GameLog(self.path) as log:
+            self.assertEqual(log.count_moves(), 4)
+
+    def test_truncated_header_is_a_clear_error(self):
+        with GameLogWriter(self.path) as writer:
+            self.play(writer, ("alice", "bob"), 3, [(0,0), (1,0), (0,1), (1,1), (0,2)])
+        size = os.path.getsize(self.path)
+        with open(self.path, "ab") as f:
+            f.write(b"T2\x03")
+        with GameLog(self.path) as log:
+            with self.assertRaisesRegex(ValueError, f"truncated game log header at byte {size}"):
+                log.count_moves()
+        with open(self.path, "r+b") as f:
+            f.truncate(8)   # header complete, names cut
+        with GameLog(self.path) as log:
+            self.assertRaisesRegex(ValueError, "truncated", log.count_moves)
+
+    def test_move_width_follows_board_size(self):
+        self.assertEqual([move_width(size) for size in (3, 11, 12, 181, 182, MAX_SIZE)], [1, 1, 2, 2, 4, 4])
+        with GameLogWriter(self.path) as writer:
+            self.play(writer, ("alice", "bob"), 3, [(0,0), (1,0), (0,1), (1,1), (0,2)])
+            players = [Player("carol", "x"), Player("dave", "o")]
+            writer.write_game(SimpleNamespace(size = 12, players = players, moves = [(11, 11, 0), (0, 0, 1)]))
+        # headers, names, then 1 byte moves + marker for 3x3 and 2 byte ones for 12x12
+        self.assertEqual(os.path.getsize(self.path), 2 * 7 + 8 + 6 * 1 + 9 + 3 * 2)
+        with GameLog(self.path) as log:
+            records = list(log)
+            self.assertEqual(list(records[1].iter_moves()), [(11, 11, 0), (0, 0, 1)])
+            del records
+
+
+class TablebaseTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        handle, cls.path = tempfile.mkstemp(suffix = ".tb")
+        os.close(handle)
+        cls.positions = build(3, cls.path)
+        cls.tablebase = Tablebase(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tablebase.close()
+        os.remove(cls.path)
+
+    def test_every_non_terminal_position_is_solved(self):
+        # 765 positions up to symmetry, 138 of them are already won or drawn
+        self.assertEqual(self.positions, 627)
+        self.assertEqual(self.tablebase.lookup(Board(3))[1], tablebase.DRAW)
+
+    def test_lookup_maps_move_back_through_symmetry(self):
+        for corner, win in [((0, 0), (2, 2)), ((2, 2), (0, 0)), ((0, 2), (2, 0))]:
+            board = Board(3)
+            board.make_move(corner[0], corner[1], "x")
+            board.make_move(1, 1, "o")
+            board.make_move(win[0], win[1], "x")
+            board.make_move(1, 0, "o")
+            # o threatens (1, 2), x has to block it
+            self.assertEqual(self.tablebase.lookup(board)[0], (1, 2))
+
+    def test_player_uses_table_and_falls_back_to_search(self):
+        player = TablebasePlayer("tb", "x", self.tablebase)
+        board = Board(3)
+        for r, c, symbol in [(0,0,"x"), (1,0,"o"), (0,1,"x"), (1,1,"o")]:
+            board.make_move(r, c, symbol)
+        self.assertEqual(player.get_move(board), (0, 2))
+        self.assertEqual(self.tablebase.lookup(board)[1], tablebase.WIN)
+        self.assertEqual(player.hits, 1)
+
+        player.get_move(BitBoard(4, win_length = 3))
+        self.assertEqual(player.hits, 1)
+        self.assertGreater(player.nodes, 0)
+
+
+class TournamentTest(unittest.TestCase):
+    def entrants(self):
+        return [Entrant("a", RandomPlayer), Entrant("b", RandomPlayer),
+                Entrant("perfect", AlphaBetaPlayer), Entrant("c", RandomPlayer)]
+
+    def test_round_robin_is_reproducible_across_worker_counts(self):
+        standings = []
+        for workers in (0, 2):
+            tournament = Tournament(self.entrants(), workers = workers, seed = 7, chunk_size = 5)
+            try:
+                tournament.round_robin(games_per_pair = 6)
+            finally:
+                tournament.close()
+            self.assertEqual(tournament.games_played, 36)
+            standings.append(tournament.elo.standings())
+        self.assertEqual(standings[0], standings[1])
+
+    def test_perfect_player_never_loses(self):
+        tournament = Tournament(self.entrants(), workers = 0)
+        tournament.swiss(rounds = 3)
+        name, rating, wins, draws, losses = tournament.elo.standings()[0]
+        self.assertEqual(name, "perfect")
+        self.assertEqual(losses, 0)
+        self.assertEqual(tournament.games_played, 12)
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class BatchSimulatorTest(unittest.TestCase):
+    def test_random_play_statistics(self):
+        stats = BatchSimulator(3, seed = 1).simulate(20000, batch_size = 5000)
+        self.assertEqual(stats.games, 20000)
+        self.assertEqual(stats.x_wins + stats.o_wins + stats.draws, 20000)
+        self.assertEqual(stats.length_histogram.sum(), 20000)
+        self.assertEqual(stats.length_histogram[:5].sum(), 0)   # nobody wins before move 5
+        # known values for uniformly random 3x3 play : x 58.5%, o 28.8%, draw 12.7%
+        rates = stats.win_rates()
+        self.assertAlmostEqual(rates["x"], 0.585, delta = 0.02)
+        self.assertAlmostEqual(rates["draw"], 0.127, delta = 0.02)
+
+    def test_policy_is_pluggable(self):
+        first_free = lambda boards, legal, player, rng: legal.argmax(axis = 1)
+        stats = BatchSimulator(3, policy = first_free).simulate(10)
+        # x takes 0, 2, 4, 6 in turn and completes the anti-diagonal on move 7
+        self.assertEqual(stats.x_wins, 10)
+        self.assertEqual(stats.length_histogram[7], 10)
+        self.assertEqual(stats.first_move_games[0], 10)
+
 
 unittest.main()
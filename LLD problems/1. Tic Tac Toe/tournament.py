@@ -0,0 +1,139 @@
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from board import Board
+from game import Game, IN_PROGRESS, WIN
+
+'''
+Tournament runner : round-robin or Swiss schedules between pluggable players.
+Games run in a process pool, each one seeded from (tournament seed, match
+number), and results are fed to an Elo table in schedule order, so a run is
+reproducible whatever the worker count.
+'''
+
+class Entrant:
+    # a named player implementation; a fresh player is built for every game inside the worker
+    def __init__(self, name, player_class, **options):
+        self.name = name
+        self.player_class = player_class
+        self.options = options
+
+    def create(self, symbol, seed):
+        return self.player_class(self.name, symbol, seed = seed, **self.options)
+
+
+def play_game(first, second, size, board_class, seed):
+    # returns the score of `first` (1 win, 0.5 draw, 0 loss) and the number of moves played
+    game = Game(first.create("x", seed), second.create("o", seed + 1), size, board_class)
+    while game.status == IN_PROGRESS:
+        player = game.players[game.current_index]
+        game.play_move(*player.get_move(game.board))
+
+    if game.status != WIN: return 0.5, len(game.moves)
+    return (1.0 if game.winner.symbol == "x" else 0.0), len(game.moves)
+
+
+def play_chunk(chunk):
+    # module level so it can run in a worker process; one call plays a whole chunk of games
+    return [play_game(*match) for match in chunk]
+
+
+class EloTable:
+    def __init__(self, names, k_factor = 16, initial = 1500.0):
+        self.k_factor = k_factor
+        self.ratings = {name: initial for name in names}
+        self.records = {name: [0, 0, 0] for name in names}     # wins, draws, losses
+
+    def record(self, first, second, score):
+        expected = 1 / (1 + 10 ** ((self.ratings[second] - self.ratings[first]) / 400))
+        delta = self.k_factor * (score - expected)
+        self.ratings[first] += delta
+        self.ratings[second] -= delta
+
+        outcome = 0 if score == 1 else 1 if score == 0.5 else 2
+        self.records[first][outcome] += 1
+        self.records[second][2 - outcome] += 1
+
+    def standings(self):
+        return sorted(((name, rating, *self.records[name]) for name, rating in self.ratings.items()),
+                      key = lambda row: -row[1])
+
+    def display(self):
+        print(f"{'player':<16} {'elo':>7} {'W':>7} {'D':>7} {'L':>7}")
+        for name, rating, wins, draws, losses in self.standings():
+            print(f"{name:<16} {rating:>7.1f} {wins:>7} {draws:>7} {losses:>7}")
+
+
+class Tournament:
+    def __init__(self, entrants, size = 3, board_class = Board, workers = None, seed = 0, chunk_size = 256):
+        if len({entrant.name for entrant in entrants}) != len(entrants):
+            raise ValueError("Entrant names must be unique")
+        self.entrants = entrants
+        self.size = size
+        self.board_class = board_class
+        self.workers = os.cpu_count() if workers is None else workers
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.elo = EloTable([entrant.name for entrant in entrants])
+        self.played = set()
+        self.match_count = 0
+        self.games_played = 0
+        self.elapsed = 0.0
+        self.executor = None
+
+    def round_robin(self, games_per_pair = 2):
+        # every pair meets games_per_pair times, alternating who moves first
+        matches = []
+        for a, b in itertools.combinations(range(len(self.entrants)), 2):
+            for game in range(games_per_pair):
+                matches.append((a, b) if game % 2 == 0 else (b, a))
+        self.run_matches(matches)
+
+    def swiss(self, rounds, games_per_pairing = 2):
+        # each round pairs neighbours in the current ranking, avoiding rematches when possible
+        for _ in range(rounds):
+            ranking = [name for name, *_ in self.elo.standings()]
+            index = {entrant.name: i for i, entrant in enumerate(self.entrants)}
+            unpaired = [index[name] for name in ranking]
+            matches = []
+            while len(unpaired) > 1:
+                a = unpaired.pop(0)
+                b = next((x for x in unpaired if frozenset((a, x)) not in self.played), unpaired[0])
+                unpaired.remove(b)
+                self.played.add(frozenset((a, b)))
+                for game in range(games_per_pairing):
+                    matches.append((a, b) if game % 2 == 0 else (b, a))
+            self.run_matches(matches)
+
+    def run_matches(self, matches):
+        jobs = []
+        for first, second in matches:
+            seed = random.Random(f"{self.seed}:{self.match_count}").getrandbits(32)
+            self.match_count += 1
+            jobs.append((self.entrants[first], self.entrants[second], self.size, self.board_class, seed))
+        chunks = [jobs[i:i + self.chunk_size] for i in range(0, len(jobs), self.chunk_size)]
+
+        start = time.perf_counter()
+        if self.workers:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers = self.workers)
+            results = self.executor.map(play_chunk, chunks)
+        else:
+            results = map(play_chunk, chunks)
+
+        # map yields chunks in schedule order, so the ratings do not depend on which worker finished first
+        for chunk, chunk_results in zip(chunks, results):
+            for (first, second, *_), (score, _) in zip(chunk, chunk_results):
+                self.elo.record(first.name, second.name, score)
+        self.games_played += len(jobs)
+        self.elapsed += time.perf_counter() - start
+
+    def games_per_sec(self):
+        return self.games_played / self.elapsed if self.elapsed else 0.0
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait = True)
+            self.executor = None
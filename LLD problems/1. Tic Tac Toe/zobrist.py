@@ -0,0 +1,37 @@
+import random
+from symmetry import symmetries
+
+class ZobristHasher:
+    '''
+    Keeps one Zobrist hash per board symmetry. The smallest of the 8 is the same
+    for every rotation / reflection of a position, so they all share one key.
+    '''
+    def __init__(self, size, seed = 0):
+        rng = random.Random(seed)
+        self.size = size
+        cells = size * size
+        keys = [[rng.getrandbits(64) for _ in range(cells)] for _ in range(2)]
+        self.side_key = rng.getrandbits(64)
+
+        # sym_keys[player][cell] -> the key of that cell under each of the 8 symmetries
+        perms = symmetries(size)
+        self.sym_keys = [[tuple(keys[player][perm[cell]] for perm in perms) for cell in range(cells)]
+                         for player in range(2)]
+
+    def hashes(self, grid, symbols):
+        hashes = [0] * 8
+        for r, row in enumerate(grid):
+            for c, cell in enumerate(row):
+                if cell in symbols:
+                    self.toggle(hashes, symbols.index(cell), r * self.size + c)
+        return hashes
+
+    def toggle(self, hashes, player, cell):
+        # XOR is its own inverse, so the same call adds or removes a piece
+        keys = self.sym_keys[player][cell]
+        for i in range(8):
+            hashes[i] ^= keys[i]
+
+    def canonical(self, hashes, player_to_move):
+        key = min(hashes)
+        return key ^ self.side_key if player_to_move else key
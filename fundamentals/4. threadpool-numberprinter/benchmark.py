@@ -0,0 +1,58 @@
+import resource
+import subprocess
+import sys
+import time
+from customThreadPool import CustomThreadPool
+from task import Task
+
+'''
+Per-task overhead and peak memory of the pool's submission modes with a no-op task
+(NumberPrinter minus the print). Each mode runs in its own process so peak RSS is per mode. Plain submit keeps a
+future per task (~1.7KB each), so it is capped at 1M tasks to stay within memory.
+Usage : python benchmark.py [number of tasks]
+'''
+
+class NoopTask(Task):
+    def __init__(self, number: int):
+        self.number = number
+
+    def execute(self):
+        return self.number
+
+
+def run(mode: str, n: int):
+    tasks = (NoopTask(i) for i in range(n))
+    start = time.perf_counter()
+
+    if mode == "submit":
+        threadPool = CustomThreadPool(5)
+        futures = [threadPool.submit(task) for task in tasks]
+        threadPool.shutdown()
+    elif mode == "bounded-submit":
+        threadPool = CustomThreadPool(5, queue_size = 1000)
+        for task in tasks: threadPool.submit(task)
+        threadPool.shutdown()
+    elif mode == "submit-many":
+        threadPool = CustomThreadPool(5, queue_size = 64)
+        futures = threadPool.submit_many(tasks, chunk_size = 1024)
+        threadPool.shutdown()
+    elif mode == "map":
+        threadPool = CustomThreadPool(5)
+        for _ in threadPool.map(tasks, chunk_size = 1024): pass
+        threadPool.shutdown()
+
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:>15} {n:>10} {elapsed:>9.2f} {elapsed / n * 1e6:>10.2f} {peak_mb:>12.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        run(sys.argv[1], int(sys.argv[2]))
+        sys.exit()
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    print(f"{'mode':>15} {'tasks':>10} {'seconds':>9} {'us/task':>10} {'peak RSS MB':>12}")
+    for mode in ("submit", "bounded-submit", "submit-many", "map"):
+        tasks = min(n, 1_000_000) if mode == "submit" else n
+        subprocess.run([sys.executable, __file__, mode, str(tasks)])
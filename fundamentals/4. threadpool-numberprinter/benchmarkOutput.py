@@ -0,0 +1,33 @@
+import contextlib
+import sys
+import time
+from customThreadPool import CustomThreadPool
+from numberPrinter import NumberPrinter
+from outputSink import OutputSink
+
+'''
+NumberPrinter runs with print() against an OutputSink (unordered and ordered). Output
+goes to a line-buffered /dev/null, which like a terminal costs one write per line.
+Usage : python benchmarkOutput.py [task counts ...]
+'''
+
+def run(n: int, mode: str) -> float:
+    with open("/dev/null", "w", buffering = 1) as target, contextlib.redirect_stdout(target):
+        sink = OutputSink(target, ordered = mode == "ordered") if mode != "print" else None
+        threadPool = CustomThreadPool(5)
+        start = time.perf_counter()
+        threadPool.submit_many((NumberPrinter(i, sink) for i in range(n)), chunk_size = 1024)
+        threadPool.shutdown()
+        if sink is not None: sink.close()
+        return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [100, 1_000_000]
+    print(f"{'tasks':>10} {'mode':>10} {'seconds':>9} {'lines/sec':>12} {'speedup':>8}")
+    for n in counts:
+        baseline = None
+        for mode in ("print", "unordered", "ordered"):
+            elapsed = run(n, mode)
+            baseline = baseline or elapsed
+            print(f"{n:>10} {mode:>10} {elapsed:>9.4f} {n / elapsed:>12.0f} {baseline / elapsed:>7.1f}x")
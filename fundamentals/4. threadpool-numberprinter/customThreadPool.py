@@ -1,11 +1,60 @@
 from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from itertools import islice
+import queue
+import threading
 
 class CustomThreadPool:
-    def __init__(self, max_workers: int):
+    def __init__(self, max_workers: int = None, queue_size: int = None):
         self.executor = ThreadPoolExecutor(max_workers = max_workers)
-    
-    def submit(self, task):
-        self.executor.submit(task.execute)
-    
+        # max_workers = None lets ThreadPoolExecutor pick its default; use the count it resolved
+        self.max_workers = self.executor._max_workers
+        # bounded mode : at most queue_size tasks may wait on top of the running ones,
+        # a producer going faster than that blocks in submit (backpressure)
+        self.slots = threading.BoundedSemaphore(queue_size + self.max_workers) if queue_size else None
+
+    def submit(self, task, timeout: float = None):
+        return self._submit(timeout, task.execute)
+
+    def submit_many(self, tasks, chunk_size: int = 1024, timeout: float = None):
+        # one future per chunk of tasks instead of one per task; each resolves to the chunk's results
+        return [self._submit(timeout, runChunk, chunk) for chunk in chunked(tasks, chunk_size)]
+
+    def map(self, tasks, chunk_size: int = 1024):
+        # lazy, ordered results; only a few chunks are in flight so huge inputs never pile up in memory
+        pending = deque()
+        for chunk in chunked(tasks, chunk_size):
+            pending.append(self._submit(None, runChunk, chunk))
+            if len(pending) > 2 * self.max_workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def _submit(self, timeout, fn, *args):
+        if self.slots is None:
+            return self.executor.submit(fn, *args)
+
+        if not self.slots.acquire(timeout = timeout):
+            raise queue.Full("Task queue is full")
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
     def shutdown(self):
-        self.executor.shutdown(wait = True)
\ No newline at end of file
+        self.executor.shutdown(wait = True)
+
+
+def chunked(tasks, chunk_size: int):
+    iterator = iter(tasks)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk: return
+        yield chunk
+
+
+def runChunk(chunk):
+    return [task.execute() for task in chunk]
@@ -2,8 +2,13 @@ from task import Task
 import threading
 
 class NumberPrinter(Task):
-    def __init__(self, number: int):
+    def __init__(self, number: int, sink = None):
         self.number = number
+        # an OutputSink to hand the line to instead of printing it
+        self.sink = sink
     
     def execute(self):
-        print("Printing ",self.number , " from thread ", threading.current_thread().name)
\ No newline at end of file
+        if self.sink is None:
+            print("Printing ",self.number , " from thread ", threading.current_thread().name)
+        else:
+            self.sink.write(f"Printing  {self.number}  from thread  {threading.current_thread().name}\n", self.number)
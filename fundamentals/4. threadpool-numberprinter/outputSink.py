@@ -0,0 +1,81 @@
+# source of truth : fundamentals/5. threadpool-computesquare/outputSink.py is a copy of this file,
+# change this one and copy it over (each folder runs on its own, so they do not share a module)
+from collections import deque
+import sys
+import threading
+
+class OutputSink:
+    '''
+    Non-blocking stand-in for print() in tasks : write() only appends the text to a queue,
+    and a background flusher joins the queued lines into one large write every
+    flush_interval seconds, or as soon as buffer_size lines are waiting.
+    ordered = True : lines come out in the order of their seq numbers (first_seq, first_seq + 1 ...)
+    instead of the order they arrive in; a line is held back until every earlier one is written.
+    '''
+    def __init__(self, stream = None, buffer_size: int = 4096, flush_interval: float = 0.05,
+                 ordered: bool = False, first_seq: int = 0):
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1")
+        self.stream = stream if stream is not None else sys.stdout
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.ordered = ordered
+        self.lines = deque()
+        self.wake = threading.Event()
+        self.closed = False
+        # ordered mode : lines that arrived before their turn
+        self.held = {}
+        self.nextSeq = first_seq
+        self.writes = 0
+        self.flusher = threading.Thread(target = self.flushLoop, daemon = True, name = "OutputSink")
+        self.flusher.start()
+
+    def write(self, text: str, seq: int = None):
+        if self.closed:
+            raise ValueError("write to a closed OutputSink")
+        if self.ordered:
+            if seq is None:
+                raise ValueError("an ordered OutputSink needs a seq for every line")
+            self.lines.append((seq, text))
+        else:
+            self.lines.append(text)
+        if len(self.lines) >= self.buffer_size and not self.wake.is_set():
+            self.wake.set()
+
+    def flushLoop(self):
+        while not self.closed:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+        self.flush(final = True)
+
+    def flush(self, final: bool = False):
+        lines = self.lines
+        # only the flusher pops, so len() is a safe lower bound of what can be taken
+        batch = [lines.popleft() for _ in range(len(lines))]
+        if self.ordered:
+            held = self.held
+            held.update(batch)
+            batch = []
+            while self.nextSeq in held:
+                batch.append(held.pop(self.nextSeq))
+                self.nextSeq += 1
+            if final:
+                # seq numbers that never arrived : write what is left in order
+                batch.extend(held.pop(seq) for seq in sorted(held))
+        if batch:
+            self.stream.write("".join(batch))
+            self.stream.flush()
+            self.writes += 1
+
+    def close(self):
+        if self.closed: return
+        self.closed = True
+        self.wake.set()
+        self.flusher.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,115 @@
+import io
+import queue
+import threading
+import unittest
+from customThreadPool import CustomThreadPool
+from outputSink import OutputSink
+from task import Task
+
+class ValueTask(Task):
+    def __init__(self, value, gate = None):
+        self.value = value
+        self.gate = gate
+
+    def execute(self):
+        if self.gate is not None: self.gate.wait(5)
+        return self.value
+
+
+class CustomThreadPoolTest(unittest.TestCase):
+    def test_submit_returns_future(self):
+        threadPool = CustomThreadPool(2)
+        futures = [threadPool.submit(ValueTask(i)) for i in range(50)]
+        threadPool.shutdown()
+        self.assertEqual([fut.result() for fut in futures], list(range(50)))
+
+    def test_default_worker_count(self):
+        threadPool = CustomThreadPool(None, queue_size = 2)
+        try:
+            self.assertGreater(threadPool.max_workers, 0)
+            self.assertEqual(threadPool.submit(ValueTask(1)).result(1), 1)
+            self.assertEqual(list(threadPool.map((ValueTask(i) for i in range(100)), chunk_size = 3)), list(range(100)))
+        finally:
+            threadPool.shutdown()
+
+    def test_bounded_queue_applies_backpressure(self):
+        gate = threading.Event()
+        threadPool = CustomThreadPool(1, queue_size = 2)
+        try:
+            futures = [threadPool.submit(ValueTask(i, gate)) for i in range(3)] # 1 running + 2 queued
+            self.assertRaises(queue.Full, threadPool.submit, ValueTask(3), timeout = 0.05)
+            gate.set()
+            for fut in futures: fut.result()
+            # slots are given back once tasks finish
+            self.assertEqual(threadPool.submit(ValueTask(4), timeout = 1).result(), 4)
+        finally:
+            gate.set()
+            threadPool.shutdown()
+
+    def test_submit_many_returns_one_future_per_chunk(self):
+        threadPool = CustomThreadPool(2, queue_size = 4)
+        futures = threadPool.submit_many((ValueTask(i) for i in range(10)), chunk_size = 4)
+        threadPool.shutdown()
+        self.assertEqual([fut.result() for fut in futures], [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+
+    def test_map_is_lazy_and_ordered(self):
+        threadPool = CustomThreadPool(3)
+        results = threadPool.map((ValueTask(i) for i in range(10_000)), chunk_size = 64)
+        self.assertEqual(list(results), list(range(10_000)))
+        threadPool.shutdown()
+
+    def test_concurrent_submitters(self):
+        threadPool = CustomThreadPool(4, queue_size = 8)
+        results = []
+        def produce(base):
+            results.extend(threadPool.submit(ValueTask(base + i)).result() for i in range(200))
+        producers = [threading.Thread(target = produce, args = (1000 * p,)) for p in range(8)]
+        for t in producers: t.start()
+        for t in producers: t.join()
+        threadPool.shutdown()
+        self.assertEqual(sorted(results), sorted(1000 * p + i for p in range(8) for i in range(200)))
+
+
+class OutputSinkTest(unittest.TestCase):
+    def test_lines_are_joined_into_few_writes(self):
+        stream = io.StringIO()
+        with OutputSink(stream, flush_interval = 10) as sink:
+            for i in range(100): sink.write(f"{i}\n")
+        self.assertEqual(stream.getvalue(), "".join(f"{i}\n" for i in range(100)))
+        self.assertEqual(sink.writes, 1)
+
+    def test_full_buffer_wakes_the_flusher(self):
+        stream = io.StringIO()
+        sink = OutputSink(stream, buffer_size = 4, flush_interval = 10)
+        for i in range(4): sink.write(f"{i}\n")
+        for _ in range(100):
+            if stream.getvalue(): break
+            threading.Event().wait(0.01)
+        self.assertEqual(stream.getvalue(), "0\n1\n2\n3\n")
+        sink.close()
+
+    def test_ordered_sink_writes_by_seq(self):
+        stream = io.StringIO()
+        with OutputSink(stream, ordered = True, first_seq = 1, flush_interval = 0.001) as sink:
+            threads = [threading.Thread(target = sink.write, args = (f"{seq}\n", seq)) for seq in range(50, 0, -1)]
+            for t in threads: t.start()
+            for t in threads: t.join()
+        self.assertEqual(stream.getvalue(), "".join(f"{seq}\n" for seq in range(1, 51)))
+
+    def test_missing_seq_is_skipped_on_close(self):
+        stream = io.StringIO()
+        with OutputSink(stream, ordered = True, flush_interval = 10) as sink:
+            for seq in (0, 2, 3): sink.write(f"{seq}\n", seq)
+        self.assertEqual(stream.getvalue(), "0\n2\n3\n")
+
+    def test_rejects_bad_use(self):
+        self.assertRaises(ValueError, OutputSink, io.StringIO(), buffer_size = 0)
+        sink = OutputSink(io.StringIO(), ordered = True)
+        self.assertRaises(ValueError, sink.write, "no seq\n")
+        sink.close()
+        sink.close()
+        self.assertRaises(ValueError, sink.write, "late\n", 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import time
+from customThreadPool import CustomThreadPool
+from task import Task
+
+'''
+CPU-heavy batch on each backend and worker count. With threads the GIL keeps
+the batch serial; with processes it should scale close to the number of cores.
+Usage : python benchmark.py [tasks] [loop iterations per task]
+'''
+
+class SumOfSquaresTask(Task):
+    cpu_bound = True
+
+    def __init__(self, number: int, iterations: int):
+        self.number = number
+        self.iterations = iterations
+
+    def execute(self):
+        total = 0
+        for i in range(self.iterations):
+            total += (self.number + i) * (self.number + i)
+        return total
+
+
+class SleepTask(Task):
+    # IO-bound stand-in, sent to threads by the hybrid backend
+    def execute(self):
+        time.sleep(0.001)
+        return 0
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    cores = os.cpu_count()
+    counts = sorted({1, 2, 4, 8, 16, 32, cores} & set(range(1, cores + 1)))
+
+    print(f"{n} CPU tasks x {iterations} iterations (+{n} sleep tasks for hybrid), {cores} cores")
+    print(f"{'backend':>8} {'workers':>8} {'seconds':>9} {'speedup':>8}")
+    baseline = None
+    for backend in ("thread", "process", "hybrid"):
+        for workers in counts:
+            tasks = [SumOfSquaresTask(i, iterations) for i in range(n)]
+            if backend == "hybrid": tasks += [SleepTask() for _ in range(n)]
+            threadPool = CustomThreadPool(backend, max_workers = workers)
+            threadPool.map_tasks(tasks[:workers])       # start the workers before timing
+
+            start = time.perf_counter()
+            threadPool.map_tasks(tasks, chunk_size = max(1, n // (4 * workers)))
+            elapsed = time.perf_counter() - start
+            threadPool.shutdown()
+
+            baseline = baseline or elapsed
+            print(f"{backend:>8} {workers:>8} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x")
@@ -0,0 +1,46 @@
+import contextlib
+import os
+import sys
+import time
+from concurrent.futures import Future
+from customThreadPool import CustomThreadPool
+from computeSquare import ComputeSquareTask
+
+'''
+Submits n ComputeSquareTask one by one and waits for every future, with and without
+micro-batching. Task output goes to /dev/null so printing does not drown the pool cost.
+The "floor" row only builds the tasks and one bare Future each : no pool can beat it.
+Usage : python benchmarkBatching.py [tasks] [batch size] [backend]
+'''
+
+def run(n: int, backend: str, batch_size: int = None):
+    threadPool = CustomThreadPool(backend, max_workers = 4, batch_size = batch_size)
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+        futures = [threadPool.submit_task(ComputeSquareTask(i)) for i in range(n)]
+        total = sum(fut.result() for fut in futures)
+        elapsed = time.perf_counter() - start
+        threadPool.shutdown()
+    assert total == sum(i * i for i in range(n))
+    batches = threadPool.batcher.batches if threadPool.batcher else n
+    return elapsed, batches
+
+
+def floor(n: int):
+    start = time.perf_counter()
+    pending = [(ComputeSquareTask(i), Future()) for i in range(n)]
+    return time.perf_counter() - start, 0
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    batchSize = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    backend = sys.argv[3] if len(sys.argv) > 3 else "thread"
+
+    print(f"{n} ComputeSquareTask on the {backend} backend")
+    print(f"{'mode':>10} {'seconds':>9} {'tasks/sec':>12} {'kernel calls':>13}")
+    for name, measure in (("floor", floor),
+                          ("unbatched", lambda n: run(n, backend)),
+                          (f"batch {batchSize}", lambda n: run(n, backend, batchSize))):
+        elapsed, calls = measure(n)
+        print(f"{name:>10} {elapsed:>9.2f} {n / elapsed:>12.0f} {calls:>13}")
@@ -0,0 +1,42 @@
+import sys
+import time
+from customThreadPool import CustomThreadPool
+from computeSquare import ComputeSquareTask
+from outputSink import OutputSink
+from resultCache import ResultCache
+
+'''
+Repeated expensive tasks : n submissions drawn from a small set of distinct numbers,
+each task burning ~0.2ms of CPU, with and without a ResultCache.
+Usage : python benchmarkCache.py [tasks] [distinct numbers]
+'''
+
+class SlowSquareTask(ComputeSquareTask):
+    def execute(self):
+        total = 0
+        for i in range(10_000): total += i
+        return super().execute()
+
+
+def run(n: int, distinct: int, cache: ResultCache = None) -> float:
+    with open("/dev/null", "w") as target, OutputSink(target) as sink:
+        threadPool = CustomThreadPool(max_workers = 4, cache = cache)
+        start = time.perf_counter()
+        futures = [threadPool.submit_task(SlowSquareTask(i % distinct, sink)) for i in range(n)]
+        results = [fut.result() for fut in futures]
+        elapsed = time.perf_counter() - start
+        threadPool.shutdown()
+    assert results == [(i % distinct) ** 2 for i in range(n)]
+    return elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    distinct = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    print(f"{n} tasks over {distinct} distinct numbers")
+    uncached = run(n, distinct)
+    print(f"{'no cache':>10} {uncached:>8.2f}s {n / uncached:>10.0f} tasks/sec")
+    cache = ResultCache(max_entries = 1024)
+    cached = run(n, distinct, cache)
+    print(f"{'cache':>10} {cached:>8.2f}s {n / cached:>10.0f} tasks/sec  {uncached / cached:.1f}x  {cache.stats()}")
@@ -0,0 +1,45 @@
+import sys
+import threading
+import time
+from customThreadPool import CustomThreadPool
+from task import Task
+
+'''
+Bursty IO workload (bursts of 10ms sleeps with idle gaps) on a small fixed pool, a
+large fixed pool and the elastic pool. Reports throughput, the time the bursts
+took, peak threads and threads still alive after an idle period.
+Usage : python benchmarkElastic.py [bursts] [tasks per burst]
+'''
+
+class IOTask(Task):
+    def execute(self):
+        time.sleep(0.01)
+
+
+def run(name: str, threadPool: CustomThreadPool, bursts: int, burstSize: int, gap: float):
+    baseline = threading.active_count()
+    peak, busy = 0, 0.0
+    for _ in range(bursts):
+        start = time.perf_counter()
+        futures = [threadPool.submit_task(IOTask()) for _ in range(burstSize)]
+        peak = max(peak, threading.active_count() - baseline)
+        for fut in futures: fut.result()
+        peak = max(peak, threading.active_count() - baseline)
+        busy += time.perf_counter() - start
+        time.sleep(gap)
+    time.sleep(1.0)
+    alive = threading.active_count() - baseline
+    threadPool.shutdown()
+    print(f"{name:>12} {bursts * burstSize / busy:>12.0f} {busy:>9.2f} {peak:>6} {alive:>11}")
+
+
+if __name__ == "__main__":
+    bursts = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    burstSize = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+
+    print(f"{bursts} bursts of {burstSize} x 10ms IO tasks")
+    print(f"{'pool':>12} {'tasks/sec':>12} {'busy s':>9} {'peak':>6} {'idle after':>11}")
+    run("fixed-5", CustomThreadPool(max_workers = 5), bursts, burstSize, 0.5)
+    run("fixed-64", CustomThreadPool(max_workers = 64), bursts, burstSize, 0.5)
+    run("elastic", CustomThreadPool(max_workers = 64, scheduler = "elastic",
+                                    scheduler_options = {"min_workers": 1, "keep_alive": 0.3}), bursts, burstSize, 0.5)
@@ -0,0 +1,46 @@
+import json
+import sys
+import time
+from customThreadPool import CustomThreadPool
+from poolMetrics import PoolMetrics
+from task import Task
+
+'''
+Fixed per-task cost of PoolMetrics : first the wrapper alone (no pool), then a pool
+running no-op tasks with and without metrics. Ends with one snapshot.
+Usage : python benchmarkMetrics.py [tasks]
+'''
+
+class NoopTask(Task):
+    def execute(self):
+        return None
+
+
+def runPool(n: int, metrics: PoolMetrics = None):
+    threadPool = CustomThreadPool(max_workers = 4, metrics = metrics)
+    start = time.perf_counter()
+    futures = [threadPool.submit_task(NoopTask()) for _ in range(n)]
+    for fut in futures: fut.result()
+    elapsed = time.perf_counter() - start
+    threadPool.shutdown()
+    return elapsed / n * 1e6
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    task = NoopTask()
+    metrics = PoolMetrics()
+
+    start = time.perf_counter()
+    for _ in range(n): task.execute()
+    bare = (time.perf_counter() - start) / n * 1e6
+    start = time.perf_counter()
+    for _ in range(n): metrics.wrap(task.execute)()
+    wrapped = (time.perf_counter() - start) / n * 1e6
+    print(f"wrapper alone   : {bare:.2f} -> {wrapped:.2f} us/task (+{wrapped - bare:.2f})")
+
+    plain = runPool(n)
+    metrics = PoolMetrics()
+    instrumented = runPool(n, metrics)
+    print(f"pool, {n} tasks : {plain:.2f} -> {instrumented:.2f} us/task (+{instrumented - plain:.2f})")
+    print(json.dumps(metrics.snapshot(), indent = 2))
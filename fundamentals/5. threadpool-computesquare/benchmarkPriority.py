@@ -0,0 +1,59 @@
+import sys
+import threading
+import time
+from customThreadPool import CustomThreadPool
+from task import Task
+
+'''
+Latency of urgent tasks during a flood of bulk tasks, FIFO against the priority scheduler.
+The flood is queued up front; urgent tasks then arrive every few milliseconds.
+Usage : python benchmarkPriority.py [bulk tasks] [urgent tasks]
+'''
+
+class SleepTask(Task):
+    def __init__(self, priority: int, seconds: float):
+        self.priority = priority
+        self.seconds = seconds
+
+    def execute(self):
+        time.sleep(self.seconds)
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))] * 1e3
+
+
+def run(scheduler: str, bulk: int, urgent: int):
+    threadPool = CustomThreadPool(max_workers = 8, scheduler = scheduler)
+    latencies = {0: [], 10: []}
+    lock = threading.Lock()
+
+    def submit(priority: int):
+        start = time.monotonic()
+        future = threadPool.submit_task(SleepTask(priority, 0.001))
+        def record(_):
+            with lock: latencies[priority].append(time.monotonic() - start)
+        future.add_done_callback(record)
+        return future
+
+    futures = [submit(10) for _ in range(bulk)]
+    for _ in range(urgent):
+        futures.append(submit(0))
+        time.sleep(0.002)
+    for fut in futures: fut.result()
+    threadPool.shutdown()
+    return latencies
+
+
+if __name__ == "__main__":
+    bulk = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    urgent = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    print(f"{bulk} bulk tasks (priority 10) + {urgent} urgent tasks (priority 0), 1ms each, 8 workers")
+    print(f"{'scheduler':>10} {'class':>7} {'p50 ms':>9} {'p99 ms':>9}")
+    for scheduler in ("fifo", "priority"):
+        latencies = run(scheduler, bulk, urgent)
+        for priority, name in ((0, "urgent"), (10, "bulk")):
+            samples = latencies[priority]
+            print(f"{scheduler:>10} {name:>7} {percentile(samples, 50):>9.1f} {percentile(samples, 99):>9.1f}")
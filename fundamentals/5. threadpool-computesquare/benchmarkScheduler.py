@@ -0,0 +1,70 @@
+import sys
+import threading
+import time
+from customThreadPool import CustomThreadPool
+from task import Task
+
+'''
+Stock FIFO executor against the work-stealing one on two workloads :
+  tiny     : many no-op tasks submitted from the main thread
+  fan-out  : a binary tree of tasks, each node submits its two children from inside execute()
+Usage : python benchmarkScheduler.py [tiny tasks] [fan-out depth]
+'''
+
+class NoopTask(Task):
+    def execute(self):
+        return None
+
+
+class FanOutTask(Task):
+    def __init__(self, threadPool, depth: int, done):
+        self.threadPool = threadPool
+        self.depth = depth
+        self.done = done
+
+    def execute(self):
+        if self.depth == 0:
+            self.done()
+            return
+        for _ in range(2):
+            self.threadPool.submit_task(FanOutTask(self.threadPool, self.depth - 1, self.done))
+
+
+def tiny(scheduler: str, workers: int, n: int):
+    threadPool = CustomThreadPool(max_workers = workers, scheduler = scheduler)
+    start = time.perf_counter()
+    futures = [threadPool.submit_task(NoopTask()) for _ in range(n)]
+    for fut in futures: fut.result()
+    elapsed = time.perf_counter() - start
+    threadPool.shutdown()
+    return elapsed
+
+
+def fanOut(scheduler: str, workers: int, depth: int):
+    threadPool = CustomThreadPool(max_workers = workers, scheduler = scheduler)
+    leaves, finished = [0], threading.Event()
+    lock = threading.Lock()
+
+    def done():
+        with lock:
+            leaves[0] += 1
+            if leaves[0] == 2 ** depth: finished.set()
+
+    start = time.perf_counter()
+    threadPool.submit_task(FanOutTask(threadPool, depth, done))
+    finished.wait()
+    elapsed = time.perf_counter() - start
+    threadPool.shutdown()
+    return elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    print(f"tiny : {n} no-op tasks, fan-out : {2 ** (depth + 1) - 1} tasks")
+    print(f"{'workload':>9} {'workers':>8} {'fifo s':>8} {'stealing s':>11}")
+    for workers in (1, 2, 4, 8, 16):
+        print(f"{'tiny':>9} {workers:>8} {tiny('fifo', workers, n):>8.2f} {tiny('work-stealing', workers, n):>11.2f}")
+    for workers in (1, 2, 4, 8, 16):
+        print(f"{'fan-out':>9} {workers:>8} {fanOut('fifo', workers, depth):>8.2f} {fanOut('work-stealing', workers, depth):>11.2f}")
@@ -1,12 +1,51 @@
 from task import Task
 import threading
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# largest |n| whose square still fits an int64 : isqrt(2**63 - 1)
+INT64_SQUARE_LIMIT = 3_037_000_499
+
 class ComputeSquareTask(Task):
-    def __init__(self, number : int):
+    cpu_bound = True
+
+    def __init__(self, number : int, sink = None):
         self.number = number
+        # an OutputSink to hand the line to instead of printing it; it does not pickle,
+        # so tasks with a sink must run on the thread backend
+        self.sink = sink
     
+    def cache_key(self):
+        return self.number
+
     def execute(self):
         threadName = threading.current_thread().name
         result = self.number * self.number
-        print((f"Thread-{threadName} computed square: {self.number}^2 = {result}"))
-        return result
\ No newline at end of file
+        if self.sink is None:
+            print((f"Thread-{threadName} computed square: {self.number}^2 = {result}"))
+        else:
+            self.sink.write(f"Thread-{threadName} computed square: {self.number}^2 = {result}\n", self.number)
+        return result
+
+    @staticmethod
+    def batch_kernel(tasks):
+        threadName = threading.current_thread().name
+        numbers = [task.number for task in tasks]
+        # int64 squares overflow silently, so numpy only gets batches that fit; the rest stay
+        # exact Python ints, like execute()
+        if np is not None and -INT64_SQUARE_LIMIT <= min(numbers) and max(numbers) <= INT64_SQUARE_LIMIT:
+            array = np.fromiter(numbers, dtype = np.int64, count = len(numbers))
+            results = (array * array).tolist()
+        else:
+            results = [number * number for number in numbers]
+        sink = tasks[0].sink
+        if sink is None:
+            print(f"Thread-{threadName} computed {len(tasks)} squares: {tasks[0].number}^2 .. {tasks[-1].number}^2")
+        else:
+            # sink writes are cheap, so every task still gets its own line
+            for task, result in zip(tasks, results):
+                sink.write(f"Thread-{threadName} computed square: {task.number}^2 = {result}\n", task.number)
+        return results
@@ -1,12 +1,118 @@
-from concurrent.futures import ThreadPoolExecutor 
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from itertools import chain
 from task import Task
+from workStealingExecutor import WorkStealingExecutor
+from priorityExecutor import PriorityExecutor
+from poolMetrics import PoolMetrics
+from elasticExecutor import ElasticExecutor
+from microBatcher import MicroBatcher
+from resultCache import ResultCache
+
+BACKENDS = ("thread", "process", "hybrid")
+# executor used for the thread side of the pool
+SCHEDULERS = {
+    "fifo": ThreadPoolExecutor,
+    "work-stealing": WorkStealingExecutor,
+    "priority": PriorityExecutor,
+    "elastic": ElasticExecutor,
+}
 
 class CustomThreadPool:
-    def __init__(self):
-        self.executor = ThreadPoolExecutor(max_workers = None)
+    '''
+    backend = "thread"  : every task runs on a thread (fine for IO-bound work)
+    backend = "process" : every task runs in a worker process, so CPU-bound work escapes the GIL
+    backend = "hybrid"  : tasks with cpu_bound = True go to processes, the rest to threads
+    scheduler picks the thread executor : "fifo" (one shared queue), "work-stealing",
+    or "priority" (Task.priority / Task.deadline aware), or "elastic" (grows and shrinks
+    with the queue); scheduler_options are passed on to it, e.g. {"min_workers": 2}
+    metrics, a PoolMetrics, instruments the work run on threads
+    batch_size turns on micro-batching : tasks declaring a batch_kernel are buffered for up to
+    batch_size tasks or batch_delay seconds and run as one kernel call
+    cache, a ResultCache, memoizes submit_task results by (task class, task.cache_key())
+    '''
+    def __init__(self, backend: str = "thread", max_workers: int = None, scheduler: str = "fifo",
+                 metrics: PoolMetrics = None, scheduler_options: dict = None,
+                 batch_size: int = None, batch_delay: float = 0.0005, cache: ResultCache = None):
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}")
+        if scheduler not in SCHEDULERS:
+            raise ValueError(f"scheduler must be one of {tuple(SCHEDULERS)}")
+        self.backend = backend
+        self.threadExecutor = (SCHEDULERS[scheduler](max_workers = max_workers, **(scheduler_options or {}))
+                               if backend != "process" else None)
+        self.processExecutor = ProcessPoolExecutor(max_workers = max_workers) if backend != "thread" else None
+        self.metrics = metrics
+        self.batcher = MicroBatcher(self.submitBatch, batch_size, batch_delay) if batch_size else None
+        self.cache = cache
+
+    def executorFor(self, task: Task):
+        if self.backend == "hybrid":
+            return self.processExecutor if task.cpu_bound else self.threadExecutor
+        return self.processExecutor or self.threadExecutor
+
+    def submitInstrumented(self, executor, priority: int, deadline: float, fn, *args):
+        # closures do not pickle, so work sent to processes is not instrumented
+        if self.metrics is None or executor is self.processExecutor:
+            return submitTo(executor, priority, deadline, fn, *args)
+        run = self.metrics.wrap(fn)
+        try:
+            future = submitTo(executor, priority, deadline, run, *args)
+        except BaseException:
+            self.metrics.drop()
+            raise
+        return self.metrics.track(future, run)
 
     def submit_task(self, task : Task):
-        return self.executor.submit(task.execute)
-    
+        if self.cache is not None:
+            key = task.cache_key()
+            if key is not None:
+                return self.cache.get_or_submit((type(task), key), lambda: self.submitUncached(task))
+        return self.submitUncached(task)
+
+    def submitUncached(self, task: Task):
+        if self.batcher is not None and task.batch_kernel is not None:
+            return self.batcher.submit(task)
+        executor = self.executorFor(task)
+        return self.submitInstrumented(executor, task.priority, task.deadline, task.execute)
+
+    def map_tasks(self, tasks, chunk_size: int = 256):
+        # ordered results; tasks are shipped in chunks so a process worker gets one pickle
+        # per chunk and sends one list of results back. A chunk holds one priority and
+        # expires with its earliest deadline.
+        futures, chunk, route = [], [], None
+        for task in tasks:
+            target = (self.executorFor(task), task.priority)
+            if chunk and (target != route or len(chunk) == chunk_size):
+                futures.append(self.submitChunk(route, chunk))
+                chunk = []
+            chunk.append(task)
+            route = target
+        if chunk:
+            futures.append(self.submitChunk(route, chunk))
+        return list(chain.from_iterable(fut.result() for fut in futures))
+
+    def submitChunk(self, route, chunk):
+        executor, priority = route
+        deadlines = [task.deadline for task in chunk if task.deadline is not None]
+        return self.submitInstrumented(executor, priority, min(deadlines, default = None), runChunk, chunk)
+
+    def submitBatch(self, kernel, tasks):
+        executor = self.executorFor(tasks[0])
+        deadlines = [task.deadline for task in tasks if task.deadline is not None]
+        return self.submitInstrumented(executor, min(task.priority for task in tasks), min(deadlines, default = None),
+                                       kernel, tasks)
+
     def shutdown(self):
-        self.executor.shutdown(wait = True)
+        if self.batcher is not None: self.batcher.close()
+        for executor in (self.threadExecutor, self.processExecutor):
+            if executor is not None: executor.shutdown(wait = True)
+
+
+def submitTo(executor, priority: int, deadline: float, fn, *args):
+    if isinstance(executor, PriorityExecutor):
+        return executor.submit_prioritized(priority, deadline, fn, *args)
+    return executor.submit(fn, *args)
+
+
+def runChunk(tasks):
+    return [task.execute() for task in tasks]
@@ -0,0 +1,127 @@
+from concurrent.futures import Executor, Future
+import os
+import queue
+import threading
+import time
+
+class ElasticExecutor(Executor):
+    '''
+    Thread pool that sizes itself from what the queue looks like :
+    - scale up when a task waited longer than scale_up_wait seconds or more than
+      scale_up_depth tasks are queued, at most once per cooldown; each step doubles the
+      pool (capped by the backlog and max_workers) so a burst is absorbed in a few steps
+    - a task submitted while no worker is idle starts one right away, cooldown or not
+    - a worker idle for keep_alive seconds retires, down to min_workers
+    '''
+    def __init__(self, max_workers: int = None, min_workers: int = 1, keep_alive: float = 5.0,
+                 scale_up_wait: float = 0.01, scale_up_depth: int = 8, cooldown: float = 0.01,
+                 thread_name_prefix: str = "Elastic"):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        if not 0 <= min_workers <= self.max_workers:
+            raise ValueError("min_workers must be between 0 and max_workers")
+        self.min_workers = min_workers
+        self.keep_alive = keep_alive
+        self.scale_up_wait = scale_up_wait
+        self.scale_up_depth = scale_up_depth
+        self.cooldown = cooldown
+        self.thread_name_prefix = thread_name_prefix
+
+        self.queue = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.threads = set()
+        # workers waiting on the queue, or started and not there yet; guarded by self.lock
+        self.idle = 0
+        self.isShutdown = False
+        self.lastScaleUp = 0.0
+        self.peakWorkers = 0
+        self.spawned = 0
+        self.retired = 0
+
+        with self.lock:
+            for _ in range(min_workers): self.spawn()
+
+    @property
+    def workers(self) -> int:
+        return len(self.threads)
+
+    def spawn(self):
+        # caller holds self.lock
+        thread = threading.Thread(target = self.workerLoop, daemon = True,
+                                  name = f"{self.thread_name_prefix}-{self.spawned}")
+        self.threads.add(thread)
+        self.idle += 1
+        self.spawned += 1
+        self.peakWorkers = max(self.peakWorkers, len(self.threads))
+        thread.start()
+
+    def maybeScaleUp(self, waited: float):
+        if waited < self.scale_up_wait and self.queue.qsize() <= self.scale_up_depth and self.threads:
+            return
+        now = time.monotonic()
+        with self.lock:
+            if self.isShutdown or len(self.threads) >= self.max_workers: return
+            # an empty pool always gets its first worker, cooldown or not
+            if self.threads and now - self.lastScaleUp < self.cooldown: return
+            self.lastScaleUp = now
+            grow = min(max(1, len(self.threads)), max(1, self.queue.qsize()), self.max_workers - len(self.threads))
+            for _ in range(grow): self.spawn()
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        with self.lock:
+            if self.isShutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self.queue.put((future, fn, args, kwargs, time.monotonic()))
+            # also covers an empty pool, e.g. min_workers = 0 after every worker retired
+            if not self.idle and len(self.threads) < self.max_workers: self.spawn()
+        self.maybeScaleUp(0.0)
+        return future
+
+    def workerLoop(self):
+        me = threading.current_thread()
+        while True:
+            try:
+                item = self.queue.get(timeout = self.keep_alive)
+            except queue.Empty:
+                with self.lock:
+                    # submit puts under the lock, so an empty queue here stays empty until we are gone
+                    if len(self.threads) > self.min_workers and self.queue.empty():
+                        self.threads.discard(me)
+                        self.idle -= 1
+                        self.retired += 1
+                        return
+                continue
+            with self.lock:
+                self.idle -= 1
+                if item is None:
+                    self.threads.discard(me)
+                    return
+
+            future, fn, args, kwargs, queued = item
+            self.maybeScaleUp(time.monotonic() - queued)
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+            with self.lock: self.idle += 1
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        with self.lock:
+            self.isShutdown = True
+            # leftover tasks need someone to run them even if every worker has retired
+            if not self.threads and not self.queue.empty() and not cancel_futures: self.spawn()
+            threads = list(self.threads)
+        if cancel_futures:
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None: item[0].cancel()
+        # queued tasks run first, then each worker takes one sentinel and exits
+        for _ in threads: self.queue.put(None)
+        if wait:
+            for thread in threads: thread.join()
@@ -2,6 +2,7 @@ from customThreadPool import CustomThreadPool
 from computeSquare import ComputeSquareTask
 
 if __name__ == "__main__":
+    # CustomThreadPool("process") or CustomThreadPool("hybrid") moves CPU-bound tasks off the GIL
     threadPool = CustomThreadPool()
     futures = list()
 
@@ -0,0 +1,92 @@
+from concurrent.futures import Future, InvalidStateError
+import threading
+import time
+
+class MicroBatcher:
+    '''
+    Buffers tasks whose class declares a batch_kernel and runs each buffer as one kernel
+    call : a buffer is flushed when it holds max_batch tasks or its oldest task has waited
+    max_delay seconds. The kernel's list of results is fanned back out, one per future.
+    dispatch(kernel, tasks) schedules the kernel and returns a Future of that list.
+    '''
+    def __init__(self, dispatch, max_batch: int = 1024, max_delay: float = 0.0005):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.dispatch = dispatch
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        # kernel -> (time the first task was buffered, tasks, futures)
+        self.buffers = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)
+        self.closed = False
+        self.batches = 0
+        self.flusher = threading.Thread(target = self.flushLoop, daemon = True, name = "MicroBatcher")
+        self.flusher.start()
+
+    def submit(self, task) -> Future:
+        kernel = type(task).batch_kernel
+        future = Future()
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            buffer = self.buffers.get(kernel)
+            if buffer is None:
+                buffer = self.buffers[kernel] = (time.monotonic(), [], [])
+                self.wakeup.notify()
+            buffer[1].append(task)
+            buffer[2].append(future)
+            full = len(buffer[1]) >= self.max_batch
+            if full: del self.buffers[kernel]
+        if full: self.dispatchBatch(kernel, buffer[1], buffer[2])
+        return future
+
+    def flushLoop(self):
+        while True:
+            with self.lock:
+                while True:
+                    if self.closed and not self.buffers: return
+                    now = time.monotonic()
+                    oldest = min((buffer[0] for buffer in self.buffers.values()), default = None)
+                    if oldest is not None and (self.closed or now - oldest >= self.max_delay): break
+                    self.wakeup.wait(None if oldest is None else oldest + self.max_delay - now)
+                due = [(kernel, buffer) for kernel, buffer in self.buffers.items()
+                       if self.closed or now - buffer[0] >= self.max_delay]
+                for kernel, _ in due: del self.buffers[kernel]
+            for kernel, (_, tasks, futures) in due:
+                self.dispatchBatch(kernel, tasks, futures)
+
+    def dispatchBatch(self, kernel, tasks, futures):
+        with self.lock: self.batches += 1
+        try:
+            batch = self.dispatch(kernel, tasks)
+        except BaseException as exc:
+            batch = Future()
+            batch.set_exception(exc)
+        batch.add_done_callback(lambda done: fanOut(done, futures))
+
+    def close(self):
+        # flushes whatever is still buffered, then stops the flusher
+        with self.lock:
+            self.closed = True
+            self.wakeup.notify()
+        self.flusher.join()
+
+
+def fanOut(batch: Future, futures):
+    if batch.cancelled():
+        for future in futures: future.cancel()
+        return
+    exc = batch.exception()
+    results = [exc] * len(futures) if exc is not None else list(batch.result())
+    if len(results) != len(futures):
+        # no telling which task a result belongs to, so none of them get one
+        exc = ValueError(f"batch kernel returned {len(results)} results for {len(futures)} tasks")
+        results = [exc] * len(futures)
+    # futures go straight from pending to finished; one cancelled meanwhile is skipped
+    for future, result in zip(futures, results):
+        try:
+            if exc is not None: future.set_exception(exc)
+            else: future.set_result(result)
+        except InvalidStateError:
+            pass
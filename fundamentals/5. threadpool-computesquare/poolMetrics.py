@@ -0,0 +1,188 @@
+from time import perf_counter_ns
+import json
+import threading
+import time
+
+SUB_BUCKET_BITS = 4     # 16 sub-buckets per power of two : values are kept to within ~6%
+
+
+class Histogram:
+    '''
+    HDR-style log-linear histogram of nanosecond values : fixed memory, O(1) record,
+    percentiles accurate to a few percent whatever the range.
+    '''
+    __slots__ = ("counts", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * 1024
+        self.total = 0
+        self.max = 0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    @staticmethod
+    def bucketIndex(value: int) -> int:
+        if value < (1 << SUB_BUCKET_BITS): return value
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        return ((shift + 1) << SUB_BUCKET_BITS) + (value >> shift) - (1 << SUB_BUCKET_BITS)
+
+    @staticmethod
+    def bucketValue(index: int) -> int:
+        if index < (1 << SUB_BUCKET_BITS): return index
+        shift = (index >> SUB_BUCKET_BITS) - 1
+        return ((index & ((1 << SUB_BUCKET_BITS) - 1)) + (1 << SUB_BUCKET_BITS)) << shift
+
+    def record(self, value: int):
+        # bucketIndex inlined : this runs twice per task
+        if value < (1 << SUB_BUCKET_BITS):
+            self.counts[value] += 1
+        else:
+            shift = value.bit_length() - SUB_BUCKET_BITS - 1
+            self.counts[((shift + 1) << SUB_BUCKET_BITS) + (value >> shift) - (1 << SUB_BUCKET_BITS)] += 1
+        self.total += value
+        if value > self.max: self.max = value
+
+    def merge(self, other: "Histogram"):
+        for i, n in enumerate(other.counts):
+            if n: self.counts[i] += n
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> int:
+        count = self.count
+        if not count: return 0
+        rank = max(1, round(count * pct / 100))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            # highest value that falls in the bucket, like HDR histograms report
+            if seen >= rank: return min(self.bucketValue(i + 1) - 1, self.max)
+        return self.max
+
+    def summary(self):
+        # microseconds
+        count = self.count
+        return {"count": count,
+                "mean": self.total / count / 1e3 if count else 0.0,
+                "p50": self.percentile(50) / 1e3, "p90": self.percentile(90) / 1e3,
+                "p99": self.percentile(99) / 1e3, "max": self.max / 1e3}
+
+
+class Shard:
+    # one per thread, so the hot path never takes a lock
+    __slots__ = ("name", "submitted", "started", "completed", "failed", "dropped", "busy", "wait", "execution")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.busy = 0
+        self.wait = Histogram()
+        self.execution = Histogram()
+
+
+class PoolMetrics:
+    '''
+    Counters, gauges and latency histograms for a pool. wrap() is called at submit
+    time and returns the callable the executor runs; every thread records into its
+    own Shard and snapshot() merges them. A unit of work is whatever was submitted :
+    one task, or one chunk for map_tasks. track() counts work whose future finished
+    without it ever running (cancelled, expired) as dropped.
+    '''
+    def __init__(self):
+        self.local = threading.local()
+        self.shards = []
+        self.shardsLock = threading.Lock()
+        self.created = perf_counter_ns()
+        self.dumpThread = None
+        self.dumpStop = threading.Event()
+
+    def shard(self) -> Shard:
+        shard = getattr(self.local, "shard", None)
+        if shard is None:
+            shard = self.local.shard = Shard(threading.current_thread().name)
+            with self.shardsLock: self.shards.append(shard)
+        return shard
+
+    def wrap(self, fn):
+        submitted = perf_counter_ns()
+        self.shard().submitted += 1
+
+        def run(*args, **kwargs):
+            run.started = True
+            shard = self.shard()
+            started = perf_counter_ns()
+            shard.started += 1
+            shard.wait.record(started - submitted)
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                shard.failed += 1
+                raise
+            else:
+                shard.completed += 1
+                return result
+            finally:
+                elapsed = perf_counter_ns() - started
+                shard.execution.record(elapsed)
+                shard.busy += elapsed
+        run.started = False
+        return run
+
+    def track(self, future, run):
+        # the callback runs on whichever thread finished the future, or right away if it is done
+        def finished(future):
+            if not run.started: self.shard().dropped += 1
+        future.add_done_callback(finished)
+        return future
+
+    def drop(self):
+        # wrapped work the executor refused
+        self.shard().dropped += 1
+
+    def snapshot(self):
+        with self.shardsLock: shards = list(self.shards)
+        wait, execution = Histogram(), Histogram()
+        submitted = started = completed = failed = dropped = 0
+        for shard in shards:
+            submitted += shard.submitted
+            started += shard.started
+            completed += shard.completed
+            failed += shard.failed
+            dropped += shard.dropped
+            wait.merge(shard.wait)
+            execution.merge(shard.execution)
+
+        uptime = perf_counter_ns() - self.created
+        return {
+            "time": time.time(),
+            "counters": {"submitted": submitted, "completed": completed, "failed": failed, "dropped": dropped},
+            "gauges": {"queue_depth": submitted - started - dropped, "running": started - completed - failed},
+            "wait_us": wait.summary(),
+            "execution_us": execution.summary(),
+            "worker_utilization": {shard.name: shard.busy / uptime for shard in shards if shard.started},
+        }
+
+    def start_dump(self, path: str, interval: float = 1.0):
+        # appends one JSON snapshot per line every `interval` seconds
+        def loop():
+            with open(path, "a") as f:
+                while not self.dumpStop.wait(interval):
+                    f.write(json.dumps(self.snapshot()) + "\n")
+                    f.flush()
+                f.write(json.dumps(self.snapshot()) + "\n")
+
+        self.dumpStop.clear()
+        self.dumpThread = threading.Thread(target = loop, daemon = True, name = "PoolMetricsDump")
+        self.dumpThread.start()
+
+    def stop_dump(self):
+        if self.dumpThread is not None:
+            self.dumpStop.set()
+            self.dumpThread.join()
+            self.dumpThread = None
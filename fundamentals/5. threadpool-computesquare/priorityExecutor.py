@@ -0,0 +1,100 @@
+from concurrent.futures import Executor, Future
+from collections import defaultdict, deque
+import heapq
+import itertools
+import os
+import threading
+import time
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class PriorityExecutor(Executor):
+    '''
+    Thread pool that runs the most urgent task first instead of FIFO.
+
+    - lower priority values run first (0 beats 10)
+    - aging : every aging_interval seconds a task waits counts as one priority level,
+      so bulk work still gets through a steady stream of urgent work
+    - a task whose deadline (a time.monotonic() value) has passed when it reaches a worker
+      is not run : its future fails with DeadlineExceeded, or is cancelled with drop_expired
+    '''
+    def __init__(self, max_workers: int = None, aging_interval: float = 0.1, drop_expired: bool = False,
+                 thread_name_prefix: str = "Priority"):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.aging_interval = aging_interval
+        self.drop_expired = drop_expired
+        self.heap = []
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.isShutdown = False
+
+        # priority -> recent submit-to-finish latencies (seconds) and expired count
+        self.latencies = defaultdict(lambda: deque(maxlen = 100_000))
+        self.expired = defaultdict(int)
+
+        self.threads = [threading.Thread(target = self.workerLoop, daemon = True, name = f"{thread_name_prefix}-{i}")
+                        for i in range(self.max_workers)]
+        for thread in self.threads: thread.start()
+
+    def submit(self, fn, /, *args, **kwargs):
+        return self.submit_prioritized(0, None, fn, *args, **kwargs)
+
+    def submit_prioritized(self, priority: int, deadline: float, fn, /, *args, **kwargs):
+        future = Future()
+        now = time.monotonic()
+        # aging folded into a static key : a task of priority p queued at t ranks like a
+        # priority 0 task queued at t + p * aging_interval, so the heap never needs re-sorting
+        key = now + priority * self.aging_interval
+        with self.condition:
+            if self.isShutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            heapq.heappush(self.heap, (key, next(self.sequence), now, priority, deadline, future, fn, args, kwargs))
+            self.condition.notify()
+        return future
+
+    def workerLoop(self):
+        while True:
+            with self.condition:
+                while not self.heap and not self.isShutdown:
+                    self.condition.wait()
+                if not self.heap: return
+                _, _, submitted, priority, deadline, future, fn, args, kwargs = heapq.heappop(self.heap)
+
+            if deadline is not None and time.monotonic() > deadline:
+                self.expired[priority] += 1
+                if self.drop_expired:
+                    future.cancel()
+                elif future.set_running_or_notify_cancel():
+                    future.set_exception(DeadlineExceeded("deadline passed before the task could start"))
+                continue
+
+            if not future.set_running_or_notify_cancel(): continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+            self.latencies[priority].append(time.monotonic() - submitted)
+
+    def latency_stats(self):
+        # priority -> count, p50 / p99 / max latency in ms, expired tasks
+        stats = {}
+        for priority in sorted(set(self.latencies) | set(self.expired)):
+            samples = sorted(self.latencies[priority])
+            pick = lambda pct: samples[min(len(samples) - 1, int(len(samples) * pct / 100))] * 1e3 if samples else 0.0
+            stats[priority] = {"count": len(samples), "p50": pick(50), "p99": pick(99),
+                               "max": samples[-1] * 1e3 if samples else 0.0, "expired": self.expired[priority]}
+        return stats
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        with self.condition:
+            self.isShutdown = True
+            if cancel_futures:
+                for entry in self.heap: entry[5].cancel()
+                self.heap.clear()
+            self.condition.notify_all()
+        if wait:
+            for thread in self.threads: thread.join()
@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+import threading
+import time
+
+class ResultCache:
+    '''
+    Memoizes task results by cache key for CustomThreadPool :
+    - single-flight : a task whose key is already running gets that task's future
+    - completed results live in a bounded LRU, optionally expiring ttl seconds after
+      they were computed; failed or cancelled tasks are not cached
+    A shared future is shared : cancelling it cancels it for every caller.
+    '''
+    def __init__(self, max_entries: int = 1024, ttl: float = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (result, expiry time or None)
+        self.entries = OrderedDict()
+        self.inflight = {}
+        # reentrant : submit() runs under the lock and may complete other cached futures
+        # inline (micro-batch fan-out), whose callbacks store into this cache
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.inflight_hits = 0
+        self.misses = 0
+
+    def get_or_submit(self, key, submit) -> Future:
+        # submit() schedules the task and returns its future; it is only called on a miss
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                result, expiry = entry
+                if expiry is None or time.monotonic() < expiry:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    future = Future()
+                    future.set_result(result)
+                    return future
+                del self.entries[key]
+            future = self.inflight.get(key)
+            if future is not None:
+                self.inflight_hits += 1
+                return future
+            self.misses += 1
+            future = submit()
+            self.inflight[key] = future
+        # outside the lock : a future that is already done runs the callback right here
+        future.add_done_callback(lambda done: self.store(key, done))
+        return future
+
+    def store(self, key, future: Future):
+        with self.lock:
+            if self.inflight.get(key) is future: del self.inflight[key]
+            if future.cancelled() or future.exception() is not None: return
+            expiry = time.monotonic() + self.ttl if self.ttl is not None else None
+            self.entries[key] = (future.result(), expiry)
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last = False)
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "inflight_hits": self.inflight_hits, "misses": self.misses,
+                    "entries": len(self.entries), "inflight": len(self.inflight)}
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
@@ -1,6 +1,22 @@
 from abc import ABC, abstractmethod
 
 class Task(ABC):
+    # hint for the hybrid pool : CPU-bound tasks go to processes (no GIL), the rest to threads
+    cpu_bound = False
+    # hints for the priority scheduler : lower priority runs first, and a task still queued
+    # after its deadline (a time.monotonic() value) is failed instead of run
+    priority = 0
+    deadline = None
+    # optional batch form of execute : a staticmethod taking a list of tasks of this class
+    # and returning their results in order. The pool's micro-batcher runs it instead of
+    # execute() on each task.
+    batch_kernel = None
+
+    def cache_key(self):
+        # hashable key for the pool's ResultCache : tasks of the same class with equal keys
+        # return equal results, so one execution can serve them all. None = never cached.
+        return None
+
     @abstractmethod
     def execute(self): 
-        pass
\ No newline at end of file
+        pass
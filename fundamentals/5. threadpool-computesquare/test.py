@@ -0,0 +1,489 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+import time
+import unittest
+from customThreadPool import CustomThreadPool
+from task import Task
+from workStealingExecutor import WorkStealingExecutor
+from priorityExecutor import PriorityExecutor, DeadlineExceeded
+from poolMetrics import Histogram, PoolMetrics
+from elasticExecutor import ElasticExecutor
+from microBatcher import MicroBatcher
+from resultCache import ResultCache
+from computeSquare import ComputeSquareTask, INT64_SQUARE_LIMIT
+
+class SquareTask(Task):
+    cpu_bound = True
+
+    def __init__(self, number: int):
+        self.number = number
+
+    def execute(self):
+        return self.number * self.number
+
+
+class EchoTask(Task):
+    def __init__(self, value):
+        self.value = value
+
+    def execute(self):
+        return self.value
+
+
+class BackendTest(unittest.TestCase):
+    def test_every_backend_computes_squares(self):
+        for backend in ("thread", "process", "hybrid"):
+            with self.subTest(backend = backend):
+                threadPool = CustomThreadPool(backend, max_workers = 2)
+                try:
+                    futures = [threadPool.submit_task(SquareTask(i)) for i in range(20)]
+                    self.assertEqual([fut.result(5) for fut in futures], [i * i for i in range(20)])
+                finally:
+                    threadPool.shutdown()
+
+    def test_hybrid_routes_by_cpu_bound(self):
+        threadPool = CustomThreadPool("hybrid", max_workers = 2)
+        try:
+            self.assertIs(threadPool.executorFor(SquareTask(1)), threadPool.processExecutor)
+            self.assertIs(threadPool.executorFor(EchoTask(1)), threadPool.threadExecutor)
+        finally:
+            threadPool.shutdown()
+
+    def test_map_tasks_keeps_order_across_chunks_and_routes(self):
+        tasks = [SquareTask(i) if i % 3 else EchoTask(i) for i in range(30)]
+        for backend in ("thread", "process", "hybrid"):
+            with self.subTest(backend = backend):
+                threadPool = CustomThreadPool(backend, max_workers = 2)
+                try:
+                    expected = [task.number ** 2 if isinstance(task, SquareTask) else task.value for task in tasks]
+                    self.assertEqual(threadPool.map_tasks(tasks, chunk_size = 4), expected)
+                finally:
+                    threadPool.shutdown()
+
+    def test_rejects_unknown_backend_and_scheduler(self):
+        self.assertRaises(ValueError, CustomThreadPool, "gpu")
+        self.assertRaises(ValueError, CustomThreadPool, "thread", scheduler = "lottery")
+
+
+class WorkStealingExecutorTest(unittest.TestCase):
+    def test_idle_workers_sleep_once_without_polling(self):
+        executor = WorkStealingExecutor(max_workers = 4)
+        try:
+            time.sleep(0.2)
+            self.assertEqual(executor.sleepers, 4)
+            self.assertEqual(executor.submit(pow, 3, 2).result(1), 9)
+            time.sleep(0.2)
+            self.assertEqual(executor.sleepers, 4)
+        finally:
+            executor.shutdown()
+
+    def test_submit_racing_a_worker_going_to_sleep_is_not_lost(self):
+        # force the race : a task lands right after the worker's last look at the deques
+        executor = WorkStealingExecutor(max_workers = 1)
+        time.sleep(0.05)
+        original, raced, futures = executor.take, [], []
+        def take(index):
+            item = original(index)
+            if item is None and executor.wakeup._is_owned() and not raced:
+                raced.append(True)
+                submitter = threading.Thread(target = lambda: futures.append(executor.submit(pow, 2, 3)))
+                submitter.start()
+                submitter.join(0.1)   # blocks on the lock while a sleeper is counted, returns otherwise
+            return item
+        executor.take = take
+        try:
+            # wake the sleeping worker so it goes round again through the patched take
+            executor.submit(pow, 1, 1).result(1)
+            for _ in range(100):
+                if futures: break
+                time.sleep(0.01)
+            self.assertEqual(futures[0].result(timeout = 2), 8)
+        finally:
+            executor.shutdown()
+
+    def test_fan_out_from_inside_a_task(self):
+        executor = WorkStealingExecutor(max_workers = 4)
+        def parent(n):
+            return sum(fut.result() for fut in [executor.submit(pow, i, 2) for i in range(n)])
+        try:
+            futures = [executor.submit(parent, 50) for _ in range(2)]
+            self.assertEqual([fut.result(5) for fut in futures], [sum(i * i for i in range(50))] * 2)
+        finally:
+            executor.shutdown()
+
+    def test_many_submits_from_outside_all_complete(self):
+        executor = WorkStealingExecutor(max_workers = 3)
+        futures = [executor.submit(pow, i, 2) for i in range(2000)]
+        executor.shutdown(wait = True)
+        self.assertEqual([fut.result() for fut in futures], [i * i for i in range(2000)])
+
+    def test_cancel_futures_on_shutdown(self):
+        executor = WorkStealingExecutor(max_workers = 1)
+        gate = threading.Event()
+        first = executor.submit(gate.wait, 5)
+        time.sleep(0.05)
+        queued = [executor.submit(pow, i, 2) for i in range(5)]
+        executor.shutdown(wait = False, cancel_futures = True)
+        gate.set()
+        self.assertTrue(first.result(1))
+        self.assertTrue(all(fut.cancelled() for fut in queued))
+
+
+class PriorityExecutorTest(unittest.TestCase):
+    def setUp(self):
+        # one worker held on a gate, so everything submitted meanwhile queues up
+        self.gate = threading.Event()
+        self.order = []
+
+    def blocked(self, **options):
+        executor = PriorityExecutor(max_workers = 1, **options)
+        executor.submit(self.gate.wait, 5)
+        time.sleep(0.05)
+        return executor
+
+    def test_lower_priority_value_runs_first(self):
+        executor = self.blocked(aging_interval = 10)
+        for priority in (5, 0, 9, 1):
+            executor.submit_prioritized(priority, None, self.order.append, priority)
+        self.gate.set()
+        executor.shutdown()
+        self.assertEqual(self.order, [0, 1, 5, 9])
+
+    def test_aging_lets_old_bulk_work_through(self):
+        executor = self.blocked(aging_interval = 0.01)
+        executor.submit_prioritized(3, None, self.order.append, "bulk")
+        time.sleep(0.1)
+        executor.submit_prioritized(0, None, self.order.append, "urgent")
+        self.gate.set()
+        executor.shutdown()
+        self.assertEqual(self.order, ["bulk", "urgent"])
+
+    def test_expired_task_fails_with_deadline_exceeded(self):
+        executor = self.blocked()
+        future = executor.submit_prioritized(0, time.monotonic() + 0.01, self.order.append, 1)
+        time.sleep(0.05)
+        self.gate.set()
+        executor.shutdown()
+        self.assertRaises(DeadlineExceeded, future.result)
+        self.assertEqual(self.order, [])
+        self.assertEqual(executor.latency_stats()[0]["expired"], 1)
+
+    def test_drop_expired_cancels_the_future(self):
+        executor = self.blocked(drop_expired = True)
+        future = executor.submit_prioritized(0, time.monotonic() + 0.01, self.order.append, 1)
+        time.sleep(0.05)
+        self.gate.set()
+        executor.shutdown()
+        self.assertTrue(future.cancelled())
+
+    def test_pool_passes_task_priority_on(self):
+        class RecordTask(Task):
+            def __init__(self, order, value, priority):
+                self.order, self.value, self.priority = order, value, priority
+            def execute(self):
+                self.order.append(self.value)
+        threadPool = CustomThreadPool("thread", max_workers = 1, scheduler = "priority",
+                                      scheduler_options = {"aging_interval": 10})
+        threadPool.threadExecutor.submit(self.gate.wait, 5)
+        time.sleep(0.05)
+        for value, priority in (("low", 2), ("high", 0)):
+            threadPool.submit_task(RecordTask(self.order, value, priority))
+        self.gate.set()
+        threadPool.shutdown()
+        self.assertEqual(self.order, ["high", "low"])
+
+
+class PoolMetricsTest(unittest.TestCase):
+    def test_histogram_percentiles_within_bucket_error(self):
+        histogram = Histogram()
+        for value in range(1, 10_001): histogram.record(value * 1000)
+        self.assertEqual(histogram.count, 10_000)
+        self.assertAlmostEqual(histogram.percentile(50), 5_000_000, delta = 5_000_000 * 0.07)
+        self.assertAlmostEqual(histogram.percentile(99), 9_900_000, delta = 9_900_000 * 0.07)
+        self.assertEqual(histogram.percentile(100), 10_000_000)
+
+    def test_counters_after_a_run(self):
+        metrics = PoolMetrics()
+        threadPool = CustomThreadPool("thread", max_workers = 2, metrics = metrics)
+        futures = [threadPool.submit_task(SquareTask(i)) for i in range(20)]
+        futures.append(threadPool.submit_task(EchoTask(None)))
+        threadPool.threadExecutor.submit(lambda: None)   # bypasses the metrics
+        failing = threadPool.submitInstrumented(threadPool.threadExecutor, 0, None, divmod, 1, 0)
+        threadPool.shutdown()
+        self.assertRaises(ZeroDivisionError, failing.result)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["counters"], {"submitted": 22, "completed": 21, "failed": 1, "dropped": 0})
+        self.assertEqual(snapshot["gauges"], {"queue_depth": 0, "running": 0})
+        self.assertEqual(snapshot["execution_us"]["count"], 22)
+
+    def test_expired_and_cancelled_work_leaves_the_queue_gauge(self):
+        class LateTask(EchoTask):
+            deadline = 0.0
+        for drop_expired in (False, True):
+            with self.subTest(drop_expired = drop_expired):
+                metrics = PoolMetrics()
+                gate = threading.Event()
+                threadPool = CustomThreadPool("thread", max_workers = 1, scheduler = "priority", metrics = metrics,
+                                              scheduler_options = {"drop_expired": drop_expired})
+                blocker = threadPool.submitInstrumented(threadPool.threadExecutor, 0, None, gate.wait, 5)
+                time.sleep(0.05)
+                late = [threadPool.submit_task(LateTask(i)) for i in range(3)]
+                queued = [threadPool.submit_task(EchoTask(i)) for i in range(3)]
+                self.assertEqual(metrics.snapshot()["gauges"]["queue_depth"], 6)
+                for fut in queued: fut.cancel()
+                gate.set()
+                threadPool.shutdown()
+                self.assertTrue(blocker.result())
+                self.assertTrue(all(fut.done() for fut in late))
+                snapshot = metrics.snapshot()
+                self.assertEqual(snapshot["counters"]["dropped"], 6)
+                self.assertEqual(snapshot["gauges"], {"queue_depth": 0, "running": 0})
+
+    def test_cancel_futures_on_shutdown_leaves_the_queue_gauge(self):
+        metrics = PoolMetrics()
+        gate = threading.Event()
+        threadPool = CustomThreadPool("thread", max_workers = 1, metrics = metrics)
+        threadPool.submitInstrumented(threadPool.threadExecutor, 0, None, gate.wait, 5)
+        time.sleep(0.05)
+        for i in range(4): threadPool.submit_task(EchoTask(i))
+        threadPool.threadExecutor.shutdown(wait = False, cancel_futures = True)
+        gate.set()
+        threadPool.threadExecutor.shutdown()
+        self.assertEqual(metrics.snapshot()["gauges"]["queue_depth"], 0)
+
+
+class ElasticExecutorTest(unittest.TestCase):
+    def test_scales_up_under_load_and_back_down(self):
+        executor = ElasticExecutor(max_workers = 8, min_workers = 1, keep_alive = 0.05)
+        futures = [executor.submit(time.sleep, 0.01) for _ in range(64)]
+        for fut in futures: fut.result(5)
+        self.assertGreater(executor.peakWorkers, 1)
+        self.assertLessEqual(executor.peakWorkers, 8)
+        time.sleep(0.3)
+        self.assertEqual(executor.workers, 1)
+        executor.shutdown()
+
+    def test_no_task_stranded_while_workers_retire(self):
+        # keep_alive is tiny, so submits keep landing while the last worker retires
+        executor = ElasticExecutor(max_workers = 4, min_workers = 0, keep_alive = 0.0005)
+        futures = []
+        for i in range(300):
+            futures.append(executor.submit(pow, i, 2))
+            if i % 3 == 0: time.sleep(0.0005)
+        self.assertEqual([fut.result(5) for fut in futures], [i * i for i in range(300)])
+        executor.shutdown()
+        self.assertEqual(executor.workers, 0)
+
+    def test_submit_starts_a_worker_when_none_is_idle(self):
+        executor = ElasticExecutor(max_workers = 4, min_workers = 0, cooldown = 60, scale_up_wait = 60)
+        gate = threading.Event()
+        self.assertEqual(executor.workers, 0)
+        blocker = executor.submit(gate.wait, 5)
+        time.sleep(0.05)
+        # the only worker is busy, so this one gets its own despite the cooldown
+        self.assertEqual(executor.submit(pow, 2, 5).result(1), 32)
+        gate.set()
+        self.assertTrue(blocker.result(1))
+        executor.shutdown()
+
+    def test_shutdown_runs_leftover_tasks(self):
+        executor = ElasticExecutor(max_workers = 2, min_workers = 0, keep_alive = 0.01)
+        gate = threading.Event()
+        futures = [executor.submit(gate.wait, 5) for _ in range(2)]
+        futures += [executor.submit(pow, i, 2) for i in range(10)]
+        gate.set()
+        executor.shutdown(wait = True)
+        self.assertTrue(all(fut.done() and not fut.cancelled() for fut in futures))
+        self.assertEqual([fut.result() for fut in futures[2:]], [i * i for i in range(10)])
+
+
+class BatchTask(Task):
+    def __init__(self, number: int):
+        self.number = number
+
+    def execute(self):
+        return self.number * self.number
+
+    @staticmethod
+    def batch_kernel(tasks):
+        return [task.number * task.number for task in tasks]
+
+
+class ShortBatchTask(BatchTask):
+    @staticmethod
+    def batch_kernel(tasks):
+        return [task.number * task.number for task in tasks[:-1]]
+
+
+class MicroBatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(2)
+        self.kernelCalls = []
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def dispatch(self, kernel, tasks):
+        self.kernelCalls.append(len(tasks))
+        return self.executor.submit(kernel, tasks)
+
+    def test_full_buffer_runs_as_one_kernel_call(self):
+        batcher = MicroBatcher(self.dispatch, max_batch = 8, max_delay = 10)
+        futures = [batcher.submit(BatchTask(i)) for i in range(16)]
+        self.assertEqual([fut.result(1) for fut in futures], [i * i for i in range(16)])
+        batcher.close()
+        self.assertEqual(self.kernelCalls, [8, 8])
+        self.assertEqual(batcher.batches, 2)
+
+    def test_partial_buffer_flushed_after_max_delay(self):
+        batcher = MicroBatcher(self.dispatch, max_batch = 100, max_delay = 0.01)
+        futures = [batcher.submit(BatchTask(i)) for i in range(3)]
+        self.assertEqual([fut.result(1) for fut in futures], [0, 1, 4])
+        batcher.close()
+        self.assertEqual(self.kernelCalls, [3])
+
+    def test_close_flushes_and_rejects_new_tasks(self):
+        batcher = MicroBatcher(self.dispatch, max_batch = 100, max_delay = 10)
+        future = batcher.submit(BatchTask(7))
+        batcher.close()
+        self.assertEqual(future.result(1), 49)
+        self.assertRaises(RuntimeError, batcher.submit, BatchTask(1))
+
+    def test_short_result_list_fails_every_future(self):
+        batcher = MicroBatcher(self.dispatch, max_batch = 4, max_delay = 10)
+        futures = [batcher.submit(ShortBatchTask(i)) for i in range(4)]
+        for fut in futures:
+            self.assertRaises(ValueError, fut.result, 1)
+        batcher.close()
+
+    def test_kernel_exception_reaches_every_future(self):
+        def dispatch(kernel, tasks):
+            raise RuntimeError("executor is gone")
+        batcher = MicroBatcher(dispatch, max_batch = 2, max_delay = 10)
+        futures = [batcher.submit(BatchTask(i)) for i in range(2)]
+        for fut in futures:
+            self.assertRaisesRegex(RuntimeError, "gone", fut.result, 1)
+        batcher.close()
+
+    def test_batch_counter_under_concurrent_submitters(self):
+        batcher = MicroBatcher(self.dispatch, max_batch = 1, max_delay = 10)
+        def submitMany():
+            for i in range(500): batcher.submit(BatchTask(i))
+        threads = [threading.Thread(target = submitMany) for _ in range(4)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        batcher.close()
+        self.assertEqual(batcher.batches, 2000)
+
+    def test_pool_batches_tasks_with_a_kernel(self):
+        threadPool = CustomThreadPool("thread", max_workers = 2, batch_size = 16, batch_delay = 0.01)
+        futures = [threadPool.submit_task(BatchTask(i)) for i in range(40)]
+        self.assertEqual([fut.result(1) for fut in futures], [i * i for i in range(40)])
+        threadPool.shutdown()
+        self.assertLessEqual(threadPool.batcher.batches, 3)
+
+
+class ListSink:
+    def __init__(self):
+        self.lines = []
+
+    def write(self, text, seq = None):
+        self.lines.append(text)
+
+
+class ComputeSquareTaskTest(unittest.TestCase):
+    def check_batch(self, numbers):
+        sink = ListSink()
+        tasks = [ComputeSquareTask(n, sink) for n in numbers]
+        self.assertEqual(ComputeSquareTask.batch_kernel(tasks), [task.execute() for task in tasks])
+        self.assertEqual(ComputeSquareTask.batch_kernel(tasks), [n * n for n in numbers])
+
+    def test_batch_matches_execute_in_int64_range(self):
+        self.check_batch([-INT64_SQUARE_LIMIT, -3, 0, 7, INT64_SQUARE_LIMIT])
+
+    def test_large_numbers_stay_exact(self):
+        self.check_batch([2, 2 ** 32, 2 ** 40, INT64_SQUARE_LIMIT + 1])
+        self.check_batch([1, 2 ** 63, -(2 ** 70)])
+
+    def test_pool_batches_large_numbers(self):
+        sink = ListSink()
+        threadPool = CustomThreadPool("thread", max_workers = 2, batch_size = 8, batch_delay = 0.01)
+        numbers = [i * 2 ** 31 for i in range(20)]
+        futures = [threadPool.submit_task(ComputeSquareTask(n, sink)) for n in numbers]
+        self.assertEqual([fut.result(2) for fut in futures], [n * n for n in numbers])
+        threadPool.shutdown()
+
+
+class KeyedTask(EchoTask):
+    def __init__(self, value, calls):
+        super().__init__(value)
+        self.calls = calls
+
+    def cache_key(self):
+        return self.value
+
+    def execute(self):
+        self.calls.append(self.value)
+        return self.value
+
+
+class ResultCacheTest(unittest.TestCase):
+    def done(self, result = None, exc = None):
+        future = Future()
+        if exc is None: future.set_result(result)
+        else: future.set_exception(exc)
+        return future
+
+    def test_second_lookup_is_a_hit(self):
+        cache = ResultCache()
+        self.assertEqual(cache.get_or_submit("k", lambda: self.done(1)).result(), 1)
+        self.assertEqual(cache.get_or_submit("k", lambda: self.fail("submitted twice")).result(), 1)
+        self.assertEqual(cache.stats(), {"hits": 1, "inflight_hits": 0, "misses": 1, "entries": 1, "inflight": 0})
+
+    def test_running_key_shares_one_future(self):
+        cache = ResultCache()
+        pending = Future()
+        first = cache.get_or_submit("k", lambda: pending)
+        second = cache.get_or_submit("k", lambda: self.fail("submitted twice"))
+        self.assertIs(first, second)
+        pending.set_result(5)
+        self.assertEqual(cache.stats()["inflight"], 0)
+        self.assertEqual(cache.get_or_submit("k", lambda: self.fail("submitted twice")).result(), 5)
+
+    def test_failed_and_cancelled_results_are_not_cached(self):
+        cache = ResultCache()
+        cache.get_or_submit("err", lambda: self.done(exc = ValueError()))
+        cancelled = Future()
+        cancelled.cancel()
+        cache.get_or_submit("cancel", lambda: cancelled)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.get_or_submit("err", lambda: self.done(2)).result(), 2)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResultCache(max_entries = 2)
+        for key in ("a", "b"): cache.get_or_submit(key, lambda: self.done(key))
+        cache.get_or_submit("a", lambda: self.fail("a was evicted"))
+        cache.get_or_submit("c", lambda: self.done("c"))
+        self.assertEqual(list(cache.entries), ["a", "c"])
+
+    def test_entries_expire_after_ttl(self):
+        cache = ResultCache(ttl = 0.02)
+        cache.get_or_submit("k", lambda: self.done(1))
+        time.sleep(0.05)
+        self.assertEqual(cache.get_or_submit("k", lambda: self.done(2)).result(), 2)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_pool_runs_each_key_once(self):
+        calls = []
+        threadPool = CustomThreadPool("thread", max_workers = 4, cache = ResultCache())
+        futures = [threadPool.submit_task(KeyedTask(i % 5, calls)) for i in range(50)]
+        self.assertEqual([fut.result(1) for fut in futures], [i % 5 for i in range(50)])
+        threadPool.shutdown()
+        self.assertEqual(sorted(calls), list(range(5)))
+
+    def test_rejects_empty_cache(self):
+        self.assertRaises(ValueError, ResultCache, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
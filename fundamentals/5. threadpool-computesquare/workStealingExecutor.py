@@ -0,0 +1,106 @@
+from concurrent.futures import Executor, Future
+from collections import deque
+import itertools
+import os
+import threading
+
+class WorkStealingExecutor(Executor):
+    '''
+    Drop-in replacement for ThreadPoolExecutor where every worker owns a deque
+    instead of all of them sharing one queue (and its lock).
+
+    - a task submitted from inside a worker (fan-out) goes to that worker's own deque
+    - a task submitted from outside goes to the workers' deques round-robin
+    - a worker pops its own deque newest-first; when it is empty it steals the
+      oldest task from another worker's deque
+    deque.append / pop / popleft are atomic in CPython, so the deques need no locks.
+    Workers with nothing to take or steal sleep on one Condition until a submit wakes them.
+    '''
+    def __init__(self, max_workers: int = None, thread_name_prefix: str = "WorkStealing"):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.queues = [deque() for _ in range(self.max_workers)]
+        self.wakeup = threading.Condition()
+        self.sleepers = 0
+        self.local = threading.local()
+        self.roundRobin = itertools.count()
+        self.isShutdown = False
+        self.steals = 0
+
+        self.threads = [threading.Thread(target = self.workerLoop, args = (i,), daemon = True,
+                                         name = f"{thread_name_prefix}-{i}")
+                        for i in range(self.max_workers)]
+        for thread in self.threads: thread.start()
+
+    def submit(self, fn, /, *args, **kwargs):
+        if self.isShutdown:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        future = Future()
+        index = getattr(self.local, "index", None)
+        if index is None:
+            index = next(self.roundRobin) % self.max_workers
+        self.queues[index].append((future, fn, args, kwargs))
+        self.wakeOne()
+        return future
+
+    def wakeOne(self):
+        # submit queues the task before it reads sleepers, and a worker counts itself as a
+        # sleeper before its last look at the deques : either the worker sees the task, or
+        # submit sees the sleeper and notifies (under the lock, so only once it is waiting)
+        if self.sleepers:
+            with self.wakeup:
+                self.wakeup.notify()
+
+    def take(self, index: int):
+        try:
+            return self.queues[index].pop()
+        except IndexError:
+            pass
+        for offset in range(1, self.max_workers):
+            try:
+                item = self.queues[(index + offset) % self.max_workers].popleft()
+            except IndexError:
+                continue
+            self.steals += 1
+            return item
+        return None
+
+    def workerLoop(self, index: int):
+        self.local.index = index
+        while True:
+            item = self.take(index)
+            if item is None:
+                with self.wakeup:
+                    self.sleepers += 1
+                    item = self.take(index)
+                    if item is None:
+                        if self.isShutdown:
+                            self.sleepers -= 1
+                            return
+                        self.wakeup.wait()
+                    self.sleepers -= 1
+                # woken up : look at the deques again before deciding anything
+                if item is None: continue
+
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel(): continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        # queued tasks still run unless cancel_futures is set
+        if cancel_futures:
+            for queue in self.queues:
+                while queue:
+                    try:
+                        queue.popleft()[0].cancel()
+                    except IndexError:
+                        break
+        with self.wakeup:
+            self.isShutdown = True
+            self.wakeup.notify_all()
+        if wait:
+            for thread in self.threads: thread.join()
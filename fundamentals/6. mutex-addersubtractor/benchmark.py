@@ -0,0 +1,57 @@
+import sys
+import threading
+import time
+from count import Count
+from stripedCount import StripedCount
+
+'''
+Contention sweep : T threads share one counter and together make a fixed number of
+add / subtract calls, released at once by a barrier. Compares Count (one mutex) with
+StripedCount per-thread cells and hashed stripes, then times the two read modes.
+Usage : python benchmark.py [operations] [max threads]
+'''
+
+def hammer(count, operations: int, threads: int) -> float:
+    perThread = operations // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def work():
+        barrier.wait()
+        for _ in range(perThread // 2):
+            count.add(1)
+            count.subtract(1)
+
+    workers = [threading.Thread(target = work) for _ in range(threads)]
+    for t in workers: t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in workers: t.join()
+    elapsed = time.perf_counter() - start
+    assert count.getValue() == 0
+    return elapsed
+
+
+def timeRead(read, calls: int = 10_000) -> float:
+    start = time.perf_counter()
+    for _ in range(calls): read()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+if __name__ == "__main__":
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 400_000
+    maxThreads = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+    counters = (("Count", Count), ("per-thread", StripedCount), ("16 stripes", lambda: StripedCount(16)))
+
+    print(f"{operations} add/subtract calls, millions of ops/sec")
+    print(f"{'threads':>8}" + "".join(f"{name:>12}" for name, _ in counters))
+    threads = 1
+    while threads <= maxThreads:
+        rates = [operations / hammer(make(), operations, threads) / 1e6 for _, make in counters]
+        print(f"{threads:>8}" + "".join(f"{rate:>12.2f}" for rate in rates))
+        threads *= 4
+
+    print("\nread cost with 256 threads' cells, µs per call")
+    for name, make in counters[1:]:
+        count = make()
+        hammer(count, 256 * 2, 256)
+        print(f"{name:>12} getValue {timeRead(count.getValue):>7.2f}   snapshot {timeRead(count.snapshot):>7.2f}")
@@ -0,0 +1,84 @@
+import threading
+
+class Cell:
+    __slots__ = ("value", "lock")
+
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+
+class StripedCount:
+    '''
+    LongAdder-style drop-in for Count : updates go to a cell instead of one shared value,
+    so threads do not queue on a single mutex. The total is the sum of the cells.
+    - stripes = None : one cell per thread, only ever locked by its owner (and snapshot)
+    - stripes = N    : N shared cells, a thread picks one by hashing its id
+    getValue() sums without locking (fast, may miss updates in flight);
+    snapshot() locks every cell and returns the exact value at one instant.
+    '''
+    def __init__(self, stripes: int = None):
+        if stripes is not None and stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self.stripes = stripes
+        self.local = threading.local()
+        self.registry = threading.Lock()
+        # (value folded in from finished threads, cells) : replaced as a whole so a
+        # lock-free reader always sees a consistent pair
+        self.state = (0, tuple(Cell() for _ in range(stripes)) if stripes else ())
+        self.owners = ()
+        self.foldAt = 64
+
+    def cell(self) -> Cell:
+        if self.stripes:
+            cell = self.state[1][(threading.get_ident() * 0x9E3779B1 >> 16) % self.stripes]
+        else:
+            cell = Cell()
+            with self.registry:
+                base, cells = self.state
+                owners = self.owners
+                if len(cells) >= self.foldAt:
+                    base, cells, owners = self.fold(base, cells, owners)
+                self.state = (base, cells + (cell,))
+                self.owners = owners + (threading.current_thread(),)
+        self.local.cell = cell
+        return cell
+
+    def fold(self, base, cells, owners):
+        # a finished thread's cell never changes again : move it into the base value.
+        # is_alive() is read once per owner, so a thread finishing mid-fold lands on one side only
+        live = []
+        for cell, owner in zip(cells, owners):
+            if owner.is_alive(): live.append((cell, owner))
+            else: base += cell.value
+        self.foldAt = max(64, 2 * len(live))
+        return base, tuple(cell for cell, _ in live), tuple(owner for _, owner in live)
+
+    def add(self, amount):
+        try:
+            cell = self.local.cell
+        except AttributeError:
+            cell = self.cell()
+        with cell.lock:
+            cell.value += amount
+
+    def subtract(self, amount):
+        try:
+            cell = self.local.cell
+        except AttributeError:
+            cell = self.cell()
+        with cell.lock:
+            cell.value -= amount
+
+    def getValue(self):
+        base, cells = self.state
+        return base + sum(cell.value for cell in cells)
+
+    def snapshot(self):
+        with self.registry:
+            base, cells = self.state
+            for cell in cells: cell.lock.acquire()
+            try:
+                return base + sum(cell.value for cell in cells)
+            finally:
+                for cell in cells: cell.lock.release()
@@ -0,0 +1,69 @@
+import threading
+import unittest
+from adder import Adder
+from subtractor import Subtractor
+from count import Count
+from stripedCount import StripedCount, Cell
+
+class FinishingOwner:
+    # alive on the first is_alive() call, finished on every call after it
+    def __init__(self):
+        self.calls = 0
+
+    def is_alive(self):
+        self.calls += 1
+        return self.calls == 1
+
+
+class CountTest(unittest.TestCase):
+    def run_tasks(self, count, threads: int, amount: int = 1):
+        workers = []
+        for _ in range(threads):
+            workers.append(threading.Thread(target = Adder(count, amount).execute))
+            workers.append(threading.Thread(target = Subtractor(count, amount).execute))
+        for t in workers: t.start()
+        for t in workers: t.join()
+
+    def test_balanced_adds_and_subtracts_end_at_zero(self):
+        for count in (Count(), StripedCount(), StripedCount(stripes = 4)):
+            with self.subTest(count = type(count).__name__, stripes = getattr(count, "stripes", None)):
+                self.run_tasks(count, 100)
+                self.assertEqual(count.getValue(), 0)
+
+    def test_striped_count_sums_every_thread(self):
+        for stripes in (None, 1, 8):
+            with self.subTest(stripes = stripes):
+                count = StripedCount(stripes)
+                def addMany():
+                    for _ in range(1000): count.add(1)
+                threads = [threading.Thread(target = addMany) for _ in range(8)]
+                for t in threads: t.start()
+                for t in threads: t.join()
+                self.assertEqual(count.getValue(), 8000)
+                self.assertEqual(count.snapshot(), 8000)
+
+    def test_finished_threads_are_folded_without_losing_updates(self):
+        count = StripedCount()
+        for _ in range(300):
+            t = threading.Thread(target = count.add, args = (2,))
+            t.start()
+            t.join()
+        self.assertEqual(count.getValue(), 600)
+        self.assertLess(len(count.state[1]), 300)
+
+    def test_fold_reads_liveness_once(self):
+        count = StripedCount()
+        cells = (Cell(), Cell())
+        cells[0].value, cells[1].value = 5, 7
+        owners = (FinishingOwner(), FinishingOwner())
+        base, live, liveOwners = count.fold(0, cells, owners)
+        # each cell is either still live or folded into base, never both or neither
+        self.assertEqual(base + sum(cell.value for cell in live), 12)
+        self.assertEqual(len(live), len(liveOwners))
+
+    def test_rejects_zero_stripes(self):
+        self.assertRaises(ValueError, StripedCount, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()